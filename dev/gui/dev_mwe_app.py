@@ -67,7 +67,7 @@ def reload_tables():
     )
 
     src = ctrl.sources["main"]
-    src.tables["test_data"] = df
+    src.add_table("test_data", df)
     src.param.trigger("updated")
 
 
@@ -1,16 +1,76 @@
-from pyhdx.models import (
-    HDXTimepoint,
-    HDXMeasurement,
-    Coverage,
-    HDXMeasurementSet,
-)
-from pyhdx.datasets import read_dynamx
-from pyhdx.fitting_torch import TorchFitResult, TorchFitResultSet
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from pyhdx.__version__ import __version__
 
+if TYPE_CHECKING:
+    from pyhdx.datasets import read_dynamx
+    from pyhdx.fitting_torch import TorchFitResult, TorchFitResultSet
+    from pyhdx.models import HDXTimepoint, HDXMeasurement, Coverage, HDXMeasurementSet
+    from pyhdx.output import FitReport
+
 VERSION_STRING = f"PyHDX {__version__}"
 
-try:
-    from pyhdx.output import FitReport
-except ModuleNotFoundError:
-    pass
+# Top-level objects are imported from their submodule on first access, such that importing
+# pyhdx (or one of its submodules, eg in the CLI) does not import torch, scipy, plotting, etc.
+_LAZY_OBJECTS = {
+    "HDXTimepoint": "pyhdx.models",
+    "HDXMeasurement": "pyhdx.models",
+    "Coverage": "pyhdx.models",
+    "HDXMeasurementSet": "pyhdx.models",
+    "read_dynamx": "pyhdx.datasets",
+    "TorchFitResult": "pyhdx.fitting_torch",
+    "TorchFitResultSet": "pyhdx.fitting_torch",
+    "FitReport": "pyhdx.output",
+}
+
+# Objects which are only available when their optional dependencies are installed
+_OPTIONAL_OBJECTS = {"FitReport"}
+
+_SUBMODULES = {
+    "alignment",
+    "batch_processing",
+    "config",
+    "convert_data",
+    "datasets",
+    "fileIO",
+    "fit_models",
+    "fitting",
+    "fitting_torch",
+    "local_cluster",
+    "models",
+    "output",
+    "plot",
+    "process",
+    "support",
+    "synthetic",
+}
+
+__all__ = ["VERSION_STRING", "__version__"]
+__all__ += [name for name in _LAZY_OBJECTS if name not in _OPTIONAL_OBJECTS]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+
+    if name not in _LAZY_OBJECTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    try:
+        module = importlib.import_module(_LAZY_OBJECTS[name])
+    except ModuleNotFoundError as e:
+        if name in _OPTIONAL_OBJECTS:
+            raise AttributeError(f"{name!r} requires the optional dependency {e.name!r}") from e
+        raise
+
+    obj = getattr(module, name)
+    globals()[name] = obj
+
+    return obj
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_OBJECTS) | _SUBMODULES)
@@ -1,33 +1,81 @@
 from __future__ import annotations
 
 import os
+import re
+import time
+from concurrent.futures import (
+    Executor,
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    wait as futures_wait,
+)
 from dataclasses import dataclass
-from functools import cached_property
+from functools import cached_property, reduce
 from io import StringIO
 from pathlib import Path
-from typing import Union, Literal, Optional
+from typing import Any, Callable, Union, Literal, Optional, Iterable
 import warnings
 
+import numpy as np
 import pandas as pd
+import torch
+import yaml
+from dask.distributed import Client, wait as dask_wait
+from hdxms_datasets import HDXDataSet
 
+from pyhdx.__version__ import __version__
 from pyhdx.config import cfg
-from pyhdx.fileIO import read_dynamx
+from pyhdx.fileIO import (
+    DYNAMX_COLUMNS,
+    read_dynamx,
+    iter_dynamx,
+    save_fitresult,
+    dataframe_to_file,
+)
+from pyhdx.fitting import (
+    FitResultCache,
+    RatesFitResult,
+    fit_gibbs_global_batch,
+    fit_rates_weighted_average,
+)
+from pyhdx.fitting_torch import TorchFitResult
 from pyhdx.models import HDXMeasurement, HDXMeasurementSet
 from pyhdx.process import correct_d_uptake, apply_control
+from pyhdx.support import hash_object
 
 
+# Columns of peptide data files used for loading and correcting HDX measurements
+PEPTIDE_COLUMNS = ["start", "end", "sequence", "state", "exposure", "uptake", "uptake_sd"]
+
 time_factors = {"s": 1, "m": 60.0, "min": 60.0, "h": 3600, "d": 86400}
 temperature_offsets = {"c": 273.15, "celsius": 273.15, "k": 0, "kelvin": 0}
 
 
 @dataclass(frozen=True)
 class DataFile(object):
+    """
+    Peptide data file, read lazily on first access of `data`.
+
+    Args:
+        name: Name of the data file.
+        format: File format of the data file.
+        filepath_or_buffer: File path or :class:`~io.StringIO` with file contents.
+        columns: Optional columns to read. Columns required for selecting peptides ('state',
+            'exposure', 'start', 'end') are always read. If `None`, all columns are read.
+        states: Optional set of protein states to read. Rows of other states are discarded while
+            reading the file. If `None`, all states are read.
+    """
+
     name: str
 
     format: Literal["DynamX"]
 
     filepath_or_buffer: Union[Path, StringIO]
 
+    columns: Optional[Iterable[str]] = None
+
+    states: Optional[Iterable[str]] = None
+
     def __post_init__(self):
         warnings.warn(
             "Will be removed in favour of the `hdxms-datasets` package ", DeprecationWarning
@@ -35,20 +83,72 @@ class DataFile(object):
 
     @cached_property
     def data(self) -> pd.DataFrame:
-        if self.format == "DynamX":
-            data = read_dynamx(self.filepath_or_buffer)
-        else:
+        if self.format != "DynamX":
             raise ValueError(f"Invalid format {self.format!r}")
 
+        if self.columns is None:
+            usecols = None
+        else:
+            required = ["state", "exposure", "start", "end"]
+            usecols = list(dict.fromkeys([c for c in self.columns if c != "stop"] + required))
+
+        if self.states is None:
+            data = read_dynamx(self.filepath_or_buffer, usecols=usecols)
+        else:
+            # chunks retain their row index of the full file
+            states = list(self.states)
+            chunks = [
+                chunk[chunk["state"].isin(states)]
+                for chunk in iter_dynamx(self.filepath_or_buffer, usecols=usecols)
+            ]
+            data = pd.concat(chunks)
+
         if isinstance(self.filepath_or_buffer, StringIO):
             self.filepath_or_buffer.seek(0)
 
         return data
 
+    @cached_property
+    def index(self) -> dict[tuple[str, float], np.ndarray]:
+        """Positional row indices of `data` per (state, exposure)."""
+        grouped = self.data.groupby(["state", "exposure"], sort=False, observed=True)
+        return grouped.indices
+
+    def select(
+        self,
+        state: Optional[str] = None,
+        exposure: Union[float, list[float], None] = None,
+    ) -> pd.DataFrame:
+        """Select peptides by state and exposure through index lookups.
+
+        Args:
+            state: Name of protein state to select.
+            exposure: Exposure value(s) in seconds to select.
+
+        Returns:
+            Selected peptides, in the order of the data file.
+        """
+        if state is None and exposure is None:
+            return self.data
+
+        exposures = None if exposure is None else set(np.atleast_1d(exposure))
+        indices = [
+            idx
+            for (s, e), idx in self.index.items()
+            if (state is None or s == state) and (exposures is None or e in exposures)
+        ]
+        positions = np.sort(np.concatenate(indices)) if indices else np.array([], dtype=int)
+
+        return self.data.iloc[positions]
+
 
 class StateParser(object):
     """
 
+    Data files are read with only the protein states and columns used by the HDX spec: the
+    columns in `PEPTIDE_COLUMNS` and columns referenced in `query` filters. Specify `columns` in a
+    data file entry of the spec to read other columns, or `columns: null` to read all columns.
+
     Args:
         hdx_spec: Dictionary with HDX-MS state specification.
         data_src: Optional data source with input data files. If not specified, current
@@ -72,11 +172,13 @@ class StateParser(object):
 
         if isinstance(data_src, (os.PathLike, str)):
             data_src = Path(data_src) or Path(".")
+            spec_states = self._spec_states()
+            spec_columns = self._spec_columns()
             for name, spec in self.hdx_spec["data_files"].items():
+                kwargs = {"states": spec_states.get(name), "columns": spec_columns.get(name)}
+                kwargs.update({k: v for k, v in spec.items() if k != "filename"})
                 datafile = DataFile(
-                    name=name,
-                    filepath_or_buffer=data_src / spec["filename"],
-                    **{k: v for k, v in spec.items() if k != "filename"},
+                    name=name, filepath_or_buffer=data_src / spec["filename"], **kwargs
                 )
                 self.data_files[name] = datafile
 
@@ -85,28 +187,75 @@ class StateParser(object):
         else:
             raise TypeError(f"Invalid data type {type(data_src)!r}, must be path or dict")
 
-    def load_hdxmset(self) -> HDXMeasurementSet:
-        hdxm_list = [self.load_hdxm(state) for state in self.hdx_spec["states"].keys()]
+    def load_hdxmset(self, executor: Optional[Executor] = None) -> HDXMeasurementSet:
+        """Load all states as an HDXMeasurementSet.
+
+        Args:
+            executor: Optional [concurrent.futures.Executor][] (threads or processes) used to
+                load states concurrently. The order of states is retained.
+
+        Returns:
+            HDXMeasurementSet object.
+        """
+
+        if executor is None:
+            hdxm_list = [self.load_hdxm(state) for state in self.states]
+        else:
+            # read data files once up front, instead of concurrently from each state
+            for data_file in self.data_files.values():
+                data_file.data
+            hdxm_list = list(executor.map(self.load_hdxm, self.states))
+
         return HDXMeasurementSet(hdxm_list)
 
     def load_peptides(self, state: Union[str, int], peptides: str) -> pd.DataFrame:
         state = self.states[state] if isinstance(state, int) else state
         peptide_spec = self.hdx_spec["states"][state]["peptides"][peptides]
 
-        df = self.data_files[peptide_spec["data_file"]].data
+        data_file = self.data_files[peptide_spec["data_file"]]
 
-        # filter_fields = {"state", "exposure", "query", "dropna"}
-        # peptide_df = filter_peptides(
-        #     df, **{k: v for k, v in peptide_spec.items() if k in filter_fields}
-        # )
+        # state and exposure selection are index lookups, remaining filters are applied after
+        exposure = peptide_spec.get("exposure")
+        t_val = batch_convert_time(exposure, target_unit="s") if exposure is not None else None
+        df = data_file.select(state=peptide_spec.get("state"), exposure=t_val)
 
-        filter_fields = {"state", "exposure", "query", "dropna"}
+        filter_fields = {"query", "dropna"}
         peptide_df = batch_filter_peptides(
             df, **{k: v for k, v in peptide_spec.items() if k in filter_fields}
         )
 
         return peptide_df
 
+    def _spec_states(self) -> dict[str, Optional[frozenset[str]]]:
+        """Returns per data file the protein states selected in the HDX spec, or `None` if any
+        selection from the data file does not specify a state."""
+
+        spec_states: dict[str, Optional[frozenset[str]]] = {}
+        for state_spec in self.hdx_spec["states"].values():
+            for peptide_spec in state_spec["peptides"].values():
+                name = peptide_spec["data_file"]
+                if name in spec_states and spec_states[name] is None:
+                    continue
+                elif "state" not in peptide_spec:
+                    spec_states[name] = None
+                else:
+                    spec_states[name] = spec_states.get(name, frozenset()) | {peptide_spec["state"]}
+
+        return spec_states
+
+    def _spec_columns(self) -> dict[str, list[str]]:
+        """Returns per data file the columns used by the HDX spec."""
+
+        spec_columns: dict[str, list[str]] = {}
+        for state_spec in self.hdx_spec["states"].values():
+            for peptide_spec in state_spec["peptides"].values():
+                columns = spec_columns.setdefault(peptide_spec["data_file"], list(PEPTIDE_COLUMNS))
+                for q in peptide_spec.get("query", []):
+                    names = re.findall(r"[A-Za-z_]\w*", re.sub(r"(['\"]).*?\1", "", q))
+                    columns += [n for n in names if n in DYNAMX_COLUMNS and n not in columns]
+
+        return spec_columns
+
     # -> function as monkey patch dataset parser; OR perhaps add them to internal dict of loaders ?
     def load_hdxm(self, state: Union[str, int]) -> HDXMeasurement:
         state = self.states[state] if isinstance(state, int) else state
@@ -134,8 +283,7 @@ class StateParser(object):
                 d_percentage=metadata.get("d_percentage", 100.0),
             )
 
-        global_metadata = self.hdx_spec.get("metadata", {})
-        global_metadata.update(metadata)
+        global_metadata = {**self.hdx_spec.get("metadata", {}), **metadata}
         hdxm = HDXMeasurement(peptides, name=state, **global_metadata)
 
         return hdxm
@@ -232,3 +380,443 @@ def batch_convert_time(
         return value * time_factor
     else:
         raise ValueError("Invalid time dictionary")
+
+
+# ------------------------------------- #
+# Job files
+# ------------------------------------- #
+
+
+def load_hdxm_set(state_file: os.PathLike) -> HDXMeasurementSet:
+    """Load a HDXMeasurementSet from a HDX-MS state specification .yaml file. Data files are
+    read relative to the directory of the state file."""
+    state_file = Path(state_file)
+    hdx_spec = yaml.safe_load(state_file.read_text())
+    dataset = HDXDataSet.from_spec(hdx_spec, data_dir=state_file.parent)
+
+    return HDXMeasurementSet.from_dataset(dataset)
+
+
+def estimate_rates(
+    hdxm_set: HDXMeasurementSet,
+    bounds: Optional[tuple[float, float]] = None,
+    chisq_thd: float = 0.20,
+    model_type: str = "association",
+) -> RatesFitResult:
+    """Estimate exchange rates of all measurements in `hdxm_set` by weighted averaging, see
+    :func:`~pyhdx.fitting.fit_rates_weighted_average`."""
+    results = [
+        fit_rates_weighted_average(hdxm, bounds=bounds, chisq_thd=chisq_thd, model_type=model_type)
+        for hdxm in hdxm_set
+    ]
+
+    return RatesFitResult(results)
+
+
+def create_guess(
+    hdxm_set: HDXMeasurementSet, rates_df: pd.DataFrame, correct_c_term: bool = True
+) -> pd.DataFrame:
+    """Create ΔG initial guesses from exchange rates. `rates_df` has one rates column per
+    measurement, or is the output of :func:`estimate_rates` with a 'rate' quantity per state."""
+    if rates_df.columns.nlevels > 1:
+        rates_df = rates_df.xs("rate", axis=1, level=-1)
+
+    return hdxm_set.guess_deltaG(rates_df, correct_c_term=correct_c_term)
+
+
+def fit_global_batch(
+    hdxm_set: HDXMeasurementSet, initial_guess: pd.DataFrame, kwargs: Optional[dict] = None
+) -> TorchFitResult:
+    """Global batch fit of ΔG, see :func:`~pyhdx.fitting.fit_gibbs_global_batch`."""
+    return fit_gibbs_global_batch(hdxm_set, initial_guess, **(kwargs or {}))
+
+
+def save_fit_result(
+    fit_result: TorchFitResult, output_dir: os.PathLike, fmt: Literal["csv", "npz"] = "csv"
+) -> Path:
+    """Save a fit result to `output_dir`, see :func:`~pyhdx.fileIO.save_fitresult`."""
+    save_fitresult(output_dir, fit_result, fmt=fmt)
+
+    return Path(output_dir)
+
+
+@dataclass(frozen=True)
+class JobTask(object):
+    """
+    Task which can be used as step in a job file.
+
+    Args:
+        func: Function executing the task. Step entries are passed as keyword arguments.
+        paths: Names of arguments which are file paths, these are resolved relative to the
+            working directory of the job.
+        cache: If `False`, the output of the task is never cached. Used for tasks that have side
+            effects (writing files) or are cheap (loading data).
+    """
+
+    func: Callable
+
+    paths: tuple[str, ...] = ()
+
+    cache: bool = True
+
+
+job_tasks: dict[str, JobTask] = {
+    "load_hdxm_set": JobTask(load_hdxm_set, paths=("state_file",), cache=False),
+    "estimate_rates": JobTask(estimate_rates),
+    "create_guess": JobTask(create_guess),
+    "fit_global_batch": JobTask(fit_global_batch),
+    "save_fit_result": JobTask(save_fit_result, paths=("output_dir",), cache=False),
+}
+
+REFERENCE_PATTERN = re.compile(r"^\$\((\w+)\.out((?:\.\w+)*)\)$")
+
+
+@dataclass(frozen=True)
+class JobStep(object):
+    name: str
+
+    task: str
+
+    arguments: dict
+
+    dependencies: frozenset[str]
+
+
+class JobParser(object):
+    """
+    Runs the steps of a job specification.
+
+    Steps reference outputs of other steps as `$(<step name>.out)`, optionally followed by
+    attribute access, ie `$(rates.out.output)`. Steps are run as soon as the steps they depend on
+    are done, such that independent steps run concurrently when an executor is given.
+
+    When a `cache_dir` is given, outputs of steps are cached by a hash of the task, its arguments
+    and the content of the outputs it depends on, such that rerunning a job skips steps whose
+    inputs did not change.
+
+    Args:
+        job_spec: Dictionary with job specification, with a list of steps under 'steps'.
+        cwd: Working directory to resolve relative paths in. Defaults to current directory.
+        cache_dir: Optional directory to cache step outputs in.
+
+    Example:
+        >>> job_spec = yaml.safe_load(Path("jobfile.yaml").read_text())
+        >>> parser = JobParser(job_spec, cwd=Path("jobs"), cache_dir="~/.pyhdx/job_cache")
+        >>> outputs = parser.execute(executor=ThreadPoolExecutor())
+    """
+
+    def __init__(
+        self,
+        job_spec: dict,
+        cwd: Optional[os.PathLike] = None,
+        cache_dir: Optional[os.PathLike] = None,
+    ) -> None:
+        self.job_spec = job_spec
+        self.cwd = Path(cwd) if cwd is not None else Path.cwd()
+        self.cache = FitResultCache(cache_dir) if cache_dir is not None else None
+        self.steps = self._parse_steps(job_spec["steps"])
+        self.outputs: dict[str, Any] = {}
+        self.keys: dict[str, str] = {}
+        self.cached: set[str] = set()
+        self.timings: dict[str, float] = {}
+        self._start_times: dict[str, float] = {}
+
+    def _parse_steps(self, step_specs: list[dict]) -> dict[str, JobStep]:
+        steps: dict[str, JobStep] = {}
+        for i, step_spec in enumerate(step_specs):
+            step_spec = dict(step_spec)
+            task = step_spec.pop("task")
+            if task not in job_tasks:
+                raise ValueError(f"Invalid task {task!r}, options are {', '.join(job_tasks)}")
+            name = step_spec.pop("name", None) or f"{task}_{i}"
+            if name in steps:
+                raise ValueError(f"Duplicate step name {name!r}")
+
+            arguments = {
+                k: self.cwd / v if k in job_tasks[task].paths else v for k, v in step_spec.items()
+            }
+            dependencies = frozenset(ref[0] for ref in _find_references(arguments))
+            steps[name] = JobStep(name, task, arguments, dependencies)
+
+        for step in steps.values():
+            if missing := step.dependencies - set(steps):
+                raise ValueError(f"Step {step.name!r} references unknown step(s) {missing}")
+
+        # verify the steps form a DAG
+        done: set[str] = set()
+        while len(done) < len(steps):
+            ready = {name for name, step in steps.items() if step.dependencies <= done} - done
+            if not ready:
+                raise ValueError(f"Circular step references between {set(steps) - done}")
+            done |= ready
+
+        return steps
+
+    def resolve(self, value: Any) -> Any:
+        """Replaces step output references in `value` by the corresponding outputs."""
+        if isinstance(value, str) and (match := REFERENCE_PATTERN.match(value)):
+            name, attrs = match.groups()
+            return reduce(getattr, attrs.split(".")[1:], self.outputs[name])
+        elif isinstance(value, dict):
+            return {k: self.resolve(v) for k, v in value.items()}
+        elif isinstance(value, list):
+            return [self.resolve(v) for v in value]
+        else:
+            return value
+
+    def step_key(self, step: JobStep) -> str:
+        """Returns the cache key of a step, from its arguments and the keys of its dependencies."""
+
+        def replace(value: Any) -> Any:
+            if isinstance(value, str) and (match := REFERENCE_PATTERN.match(value)):
+                name, attrs = match.groups()
+                return self.keys[name], attrs
+            elif isinstance(value, dict):
+                return {k: replace(v) for k, v in value.items()}
+            elif isinstance(value, list):
+                return [replace(v) for v in value]
+            else:
+                return value
+
+        return hash_object((step.task, replace(step.arguments), __version__))
+
+    def execute(self, executor: Union[Executor, Client, None] = None) -> dict[str, Any]:
+        """
+        Execute all steps.
+
+        Args:
+            executor: Optional [concurrent.futures.Executor][] or Dask client to run steps on.
+                If `None`, steps are run sequentially in the current thread.
+
+        Returns:
+            Dictionary of step outputs by step name. Wall times of the steps are stored in
+            `timings`.
+        """
+
+        running = {}  # future: step name
+        todo = dict(self.steps)
+        while todo or running:
+            ready = [step for step in todo.values() if step.dependencies <= set(self.outputs)]
+            for step in ready:
+                del todo[step.name]
+                self._start_times[step.name] = time.perf_counter()
+                task = job_tasks[step.task]
+                if self.cache is not None and task.cache:
+                    self.keys[step.name] = self.step_key(step)
+                    output = self.cache.get(self.keys[step.name])
+                    if output is not None:
+                        self.cached.add(step.name)
+                        self._set_output(step, output)
+                        continue
+
+                kwargs = self.resolve(step.arguments)
+                if executor is None:
+                    self._set_output(step, task.func(**kwargs))
+                else:
+                    running[executor.submit(task.func, **kwargs)] = step.name
+
+            if running and not any(
+                step.dependencies <= set(self.outputs) for step in todo.values()
+            ):
+                if isinstance(executor, Client):
+                    done, _ = dask_wait(list(running), return_when="FIRST_COMPLETED")
+                else:
+                    done, _ = futures_wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = self.steps[running.pop(future)]
+                    self._set_output(step, future.result())
+
+        return self.outputs
+
+    def _set_output(self, step: JobStep, output: Any) -> None:
+        self.outputs[step.name] = output
+        self.timings[step.name] = time.perf_counter() - self._start_times[step.name]
+        if self.cache is None:
+            return
+
+        task = job_tasks[step.task]
+        if not task.cache:
+            # outputs of uncached steps are identified by their content
+            self.keys[step.name] = hash_object(output) if self._has_cached_dependents(step) else ""
+        elif step.name not in self.cached:
+            self.cache.put(self.keys[step.name], output)
+
+    def _has_cached_dependents(self, step: JobStep) -> bool:
+        return any(
+            step.name in s.dependencies and job_tasks[s.task].cache for s in self.steps.values()
+        )
+
+
+def _find_references(value: Any) -> list[tuple[str, str]]:
+    """Returns (step name, attributes) of all step output references in a (nested) value."""
+    if isinstance(value, str) and (match := REFERENCE_PATTERN.match(value)):
+        return [match.groups()]
+    elif isinstance(value, dict):
+        return [ref for v in value.values() for ref in _find_references(v)]
+    elif isinstance(value, list):
+        return [ref for v in value for ref in _find_references(v)]
+    else:
+        return []
+
+
+def fit_job_spec(state_file: os.PathLike, fit_kwargs: dict, output_dir: os.PathLike) -> dict:
+    """Returns a job specification which loads the states in `state_file`, estimates exchange
+    rates, creates ΔG guesses and fits ΔG globally with `fit_kwargs`, saving the result to
+    `output_dir`."""
+    return {
+        "steps": [
+            {"task": "load_hdxm_set", "name": "load_data", "state_file": str(state_file)},
+            {"task": "estimate_rates", "name": "rates", "hdxm_set": "$(load_data.out)"},
+            {
+                "task": "create_guess",
+                "name": "guess",
+                "rates_df": "$(rates.out.output)",
+                "hdxm_set": "$(load_data.out)",
+            },
+            {
+                "task": "fit_global_batch",
+                "name": "global_fit",
+                "hdxm_set": "$(load_data.out)",
+                "initial_guess": "$(guess.out)",
+                "kwargs": dict(fit_kwargs),
+            },
+            {
+                "task": "save_fit_result",
+                "name": "save",
+                "fit_result": "$(global_fit.out)",
+                "output_dir": str(output_dir),
+            },
+        ]
+    }
+
+
+def fit_project(
+    state_file: os.PathLike,
+    settings_file: os.PathLike,
+    output_dir: os.PathLike,
+    cache_dir: Optional[os.PathLike] = None,
+) -> dict[str, Any]:
+    """
+    Fit ΔG of all states in a state specification file with the settings in a fit settings file.
+
+    Args:
+        state_file: HDX-MS state specification .yaml file.
+        settings_file: .yaml file with keyword arguments for
+            :func:`~pyhdx.fitting.fit_gibbs_global_batch`.
+        output_dir: Directory to save the fit result to.
+        cache_dir: Optional directory to cache step outputs in, see :class:`JobParser`.
+
+    Returns:
+        Summary of the job, with wall times of each step in seconds. Errors are not raised but
+        reported in the 'status' entry.
+    """
+    summary: dict[str, Any] = {
+        "state_file": str(state_file),
+        "settings_file": str(settings_file),
+        "output_dir": str(output_dir),
+    }
+    t0 = time.perf_counter()
+    parser = None
+    try:
+        fit_kwargs = yaml.safe_load(Path(settings_file).read_text()) or {}
+        job_spec = fit_job_spec(Path(state_file).resolve(), fit_kwargs, output_dir)
+        parser = JobParser(job_spec, cache_dir=cache_dir)
+        parser.execute()
+        summary["n_states"] = parser.outputs["load_data"].Ns
+        summary["status"] = "ok"
+    except Exception as e:
+        summary["status"] = f"{type(e).__name__}: {e}"
+
+    # timings of the steps completed before any error
+    if parser is not None:
+        summary |= parser.timings
+    summary["total"] = time.perf_counter() - t0
+
+    return summary
+
+
+def _init_fit_worker(num_threads: int) -> None:
+    torch.set_num_threads(num_threads)
+
+
+def _output_names(paths: list[Path]) -> list[Path]:
+    """Returns an output directory name for each file: the file stem, or if the stems are not
+    unique, the path relative to the common parent directory of the files without suffix."""
+    stems = [Path(path.stem) for path in paths]
+    if len(set(stems)) == len(stems):
+        return stems
+
+    resolved = [path.resolve() for path in paths]
+    common = Path(os.path.commonpath([path.parent for path in resolved]))
+
+    return [path.relative_to(common).with_suffix("") for path in resolved]
+
+
+def batch_fit(
+    state_files: Iterable[os.PathLike],
+    settings_files: Iterable[os.PathLike],
+    output_dir: os.PathLike,
+    workers: Optional[int] = None,
+    cache_dir: Optional[os.PathLike] = None,
+) -> pd.DataFrame:
+    """
+    Fit each state specification file with each fit settings file in parallel processes.
+
+    Results are written to `<output_dir>/<state file stem>/<settings file stem>` together with a
+    `timings.csv` summary in `output_dir`. State or settings files with the same stem are written to
+    subdirectories named by their path relative to the common parent directory of the files
+    instead, eg `<output_dir>/project_a/states/<settings file stem>`.
+
+    Args:
+        state_files: HDX-MS state specification .yaml files.
+        settings_files: Fit settings .yaml files.
+        output_dir: Root output directory.
+        workers: Number of worker processes. Defaults to the number of CPUs. Torch threads are
+            divided between the workers.
+        cache_dir: Optional directory to cache step outputs in, see :class:`JobParser`.
+
+    Returns:
+        Summary dataframe with one row per job.
+
+    Raises:
+        ValueError: If jobs would write to the same output directory, eg when a file is given
+            twice.
+    """
+    output_dir = Path(output_dir)
+    state_files = [Path(state_file) for state_file in state_files]
+    settings_files = [Path(settings_file) for settings_file in settings_files]
+    jobs = [
+        (state_file, settings_file, output_dir / state_name / settings_name)
+        for state_file, state_name in zip(state_files, _output_names(state_files))
+        for settings_file, settings_name in zip(settings_files, _output_names(settings_files))
+    ]
+
+    job_dirs = [job_dir.resolve() for *_, job_dir in jobs]
+    if len(set(job_dirs)) != len(job_dirs):
+        duplicates = sorted({str(d) for d in job_dirs if job_dirs.count(d) > 1})
+        raise ValueError(
+            f"Multiple fit jobs would write to the same output directory: {duplicates}"
+        )
+
+    workers = workers or os.cpu_count() or 1
+    num_threads = max((os.cpu_count() or 1) // workers, 1)
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_fit_worker, initargs=(num_threads,)
+    ) as executor:
+        futures = [
+            executor.submit(
+                fit_project,
+                state_file,
+                settings_file,
+                job_dir,
+                cache_dir=cache_dir,
+            )
+            for state_file, settings_file, job_dir in jobs
+        ]
+        summaries = [f.result() for f in futures]
+
+    summary = pd.DataFrame(summaries)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    dataframe_to_file(output_dir / "timings.csv", summary, include_metadata=False)
+
+    return summary
@@ -4,11 +4,11 @@ from pathlib import Path
 from typing import Optional
 
 import typer
-from omegaconf import OmegaConf
-from tqdm.auto import tqdm
 
 from pyhdx.config import cfg
-from pyhdx.datasets import DataVault
+
+# Heavy imports are deferred to the commands, such that `pyhdx --help` and argument parsing
+# are fast.
 
 app = typer.Typer()
 
@@ -22,6 +22,8 @@ def serve(
 ):
     """Launch the PyHDX web application"""
 
+    from omegaconf import OmegaConf
+
     from pyhdx.config import cfg
     from pyhdx.local_cluster import default_cluster, verify_cluster
 
@@ -62,12 +64,141 @@ def serve(
             loop = False
 
 
+@app.command()
+def convert(
+    inputs: list[Path] = typer.Argument(
+        ..., exists=True, help="HDExaminer .csv files or directories of .csv files"
+    ),
+    output_dir: Path = typer.Option(Path("."), help="Directory to write converted files to"),
+    fmt: str = typer.Option("csv", "--format", help="Output format, 'csv' or 'npz'"),
+    workers: Optional[int] = typer.Option(None, min=1, help="Number of conversion processes"),
+    d_percentage: float = typer.Option(0.85, help="Deuterium percentage of labelling solution"),
+    protein: str = typer.Option("protein", help="Protein name for tables without one"),
+):
+    """Convert HDExaminer exports to PyHDX peptide tables"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    from pyhdx.convert_data import convert_hdexaminer_files
+
+    files = []
+    for path in inputs:
+        files += sorted(path.glob("*.csv")) if path.is_dir() else [path]
+    if not files:
+        print("No .csv files found")
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        written = convert_hdexaminer_files(
+            files,
+            output_dir,
+            fmt=fmt,
+            executor=executor,
+            d_percentage=d_percentage,
+            protein=protein,
+        )
+    print(f"Converted {len(written)} file(s) to {output_dir}")
+
+
+@app.command()
+def run(
+    jobfile: Path = typer.Argument(..., exists=True, help="Path to .yaml job file"),
+    cwd: Optional[Path] = typer.Option(
+        None, help="Working directory for relative paths, defaults to the job file directory"
+    ),
+    cache_dir: Optional[Path] = typer.Option(
+        None, help="Directory to cache step outputs in, defaults to <assets_dir>/job_cache"
+    ),
+    no_cache: bool = typer.Option(False, help="Run all steps without caching"),
+    workers: int = typer.Option(4, min=1, help="Number of threads to run steps on"),
+    scheduler_address: Optional[str] = typer.Option(
+        None, help="Address of a dask scheduler to run steps on instead of local threads"
+    ),
+):
+    """Run the steps in a job file"""
+    import yaml
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pyhdx.batch_processing import JobParser
+
+    job_spec = yaml.safe_load(jobfile.read_text())
+    cwd = cwd or jobfile.parent
+    cache_dir = None if no_cache else (cache_dir or cfg.assets_dir / "job_cache")
+    parser = JobParser(job_spec, cwd=cwd, cache_dir=cache_dir)
+
+    if scheduler_address is not None:
+        from dask.distributed import Client
+
+        with Client(scheduler_address) as client:
+            parser.execute(executor=client)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            parser.execute(executor=executor)
+
+    for name in parser.steps:
+        status = "cached" if name in parser.cached else "done"
+        print(f"{name}: {status}")
+
+
+def _expand_paths(patterns: list[str]) -> list[Path]:
+    """Expands glob patterns, keeping the order in which patterns are given."""
+    from glob import glob
+
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob(pattern)) if any(c in pattern for c in "*?[") else [pattern]
+        paths += [Path(p) for p in matches]
+
+    return paths
+
+
+@app.command()
+def fit(
+    state_files: list[str] = typer.Argument(
+        ..., help="HDX-MS state specification .yaml files or glob patterns"
+    ),
+    settings: list[str] = typer.Option(
+        ..., "--settings", "-s", help="Fit settings .yaml file(s) or glob patterns"
+    ),
+    output_dir: Path = typer.Option(Path("fit_results"), help="Root output directory"),
+    workers: Optional[int] = typer.Option(
+        None, min=1, help="Number of worker processes, defaults to the number of CPUs"
+    ),
+    cache_dir: Optional[Path] = typer.Option(None, help="Optional directory to cache steps in"),
+):
+    """Fit ΔG for each state specification file with each fit settings file"""
+    from pyhdx.batch_processing import batch_fit
+
+    state_paths = _expand_paths(state_files)
+    settings_paths = _expand_paths(settings)
+    for path in state_paths + settings_paths:
+        if not path.is_file():
+            print(f"File not found: {path}")
+            raise typer.Exit(code=1)
+
+    print(f"Running {len(state_paths) * len(settings_paths)} fit job(s)")
+    try:
+        summary = batch_fit(
+            state_paths, settings_paths, output_dir, workers=workers, cache_dir=cache_dir
+        )
+    except ValueError as e:
+        print(e)
+        raise typer.Exit(code=1)
+
+    print(summary[["state_file", "settings_file", "status", "total"]].to_string(index=False))
+    if (summary["status"] != "ok").any():
+        raise typer.Exit(code=1)
+
+
 datasets_app = typer.Typer(help="Manage HDX datasets")
 
 
 @datasets_app.command()
 def fetch(num: int = typer.Option(10, min=1, help="Maximum number of datasets to download")):
     """Update the datasets from the PyHDX repository"""
+    from tqdm.auto import tqdm
+
+    from pyhdx.datasets import DataVault
+
     vault = DataVault(cache_dir=cfg.database_dir)
     missing_datasets = list(set(vault.remote_index) - set(vault.datasets))
     missing_datasets = [data_id for data_id in missing_datasets if data_id]
@@ -94,6 +225,8 @@ def fetch(num: int = typer.Option(10, min=1, help="Maximum number of datasets to
 @datasets_app.command()
 def clear():
     """Clear the local dataset cache"""
+    from pyhdx.datasets import DataVault
+
     vault = DataVault(cache_dir=cfg.database_dir)
     vault.clear_cache()
 
@@ -3,13 +3,15 @@ from __future__ import annotations
 from contextlib import contextmanager
 from os import PathLike
 from pathlib import Path
-from typing import Union, Dict, Any, Optional, Generator
+from typing import TYPE_CHECKING, Union, Dict, Any, Optional, Generator
 
-import torch
 from omegaconf import OmegaConf, DictConfig, DictKeyType
 from packaging import version
 
 
+if TYPE_CHECKING:
+    import torch
+
 PACKAGE_NAME = "pyhdx"
 
 
@@ -116,9 +118,20 @@ class PyHDXConfig(metaclass=Singleton):
 
         return database_dir
 
+    @property
+    def k_int_cache_dir(self) -> Optional[Path]:
+        """Directory for the on-disk cache of intrinsic exchange rates, if set"""
+        spec_path = self.conf.analysis.get("k_int_cache_dir")
+        if not spec_path:
+            return None
+
+        return Path(spec_path.replace("~", str(Path().home())))
+
     @property
     def TORCH_DTYPE(self) -> Union[torch.float64, torch.float32]:
         """PyTorch dtype used for ΔG calculations"""
+        import torch
+
         dtype = self.conf.fitting.dtype
         if dtype in ["float64", "double"]:
             return torch.float64
@@ -130,6 +143,8 @@ class PyHDXConfig(metaclass=Singleton):
     @property
     def TORCH_DEVICE(self) -> torch.device:
         """PyTorch device used for ΔG calculations"""
+        import torch
+
         device = self.conf.fitting.device
         return torch.device(device)
 
@@ -168,7 +183,6 @@ def valid_config() -> bool:
 
 home_dir = Path.home()
 config_dir = home_dir / f".{PACKAGE_NAME}"
-config_dir.mkdir(parents=False, exist_ok=True)
 config_file_path = config_dir / "config.yaml"
 
 current_dir = Path(__file__).parent
@@ -178,10 +192,12 @@ conf_src_pth = current_dir / "config.yaml"
 # Current config version is outdated
 if not valid_config():
     try:
+        config_dir.mkdir(parents=False, exist_ok=True)
         reset_config()
         conf = OmegaConf.load(config_file_path)
-    except FileNotFoundError:
-        # This will happen on conda-forge docker build.
+    except OSError:
+        # This will happen on conda-forge docker build or with a read-only home directory
+        # (eg dask workers in containers).
         # When no config.yaml file is in home_dir / '.{PACKAGE_NAME}>',
         # ConfigurationSettings will use the hardcoded version (pyhdx/config.yaml)
         conf = OmegaConf.load(conf_src_pth)
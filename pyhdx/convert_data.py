@@ -28,149 +28,282 @@ for mutant in pepdata['state'].unique():
 
 """
 
+from __future__ import annotations
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
 
 import numpy as np
 import pandas as pd
 
+TIME_UNITS = {"s": 1.0, "m": 60.0, "h": 3600.0}
+FD_TIME = 1e6
 
-def hdexa_to_pyhdx(data, d_percentage=0.85, protein="protein"):
-    drop_first = 2
+PYHDX_COLUMNS = [
+    "start",
+    "end",
+    "stop",
+    "sequence",
+    "state",
+    "exposure",
+    "uptake",
+    "maxuptake",
+    "fd_uptake",
+    "fd_uptake_sd",
+    "nd_uptake",
+    "nd_uptake_sd",
+    "rfu",
+    "protein",
+    "modification",
+    "fragment",
+    "mhp",
+    "center",
+    "center_sd",
+    "uptake_sd",
+    "rt",
+    "rt_sd",
+    "rfu_sd",
+    "_sequence",
+    "_start",
+    "_stop",
+    "ex_residues",
+    "uptake_corrected",
+]
+
+HDEXAMINER_RENAME = {
+    "Protein State": "state",
+    "Protein": "protein",
+    "Start": "start",
+    "End": "end",
+    "Sequence": "_sequence",
+    "Peptide Mass": "mhp",
+    "RT (min)": "rt",
+    "Deut Time (sec)": "exposure",
+    "maxD": "maxuptake",
+    "Theor Uptake #D": "uptake_corrected",
+    "#D": "uptake",
+    "%D": "rfu",
+    "Conf Interval (#D)": "rfu_sd",
+    "#Rep": "rep",
+    "Confidence": "quality",
+    "Stddev": "center_sd",
+}
+
+
+def _time_to_sec(deut_time: pd.Series) -> np.ndarray:
+    """Convert HDExaminer 'Deut Time' entries (ie '30s', '10m', '1h') to seconds."""
+    values = deut_time.str[:-1].astype(float).to_numpy()
+    units = deut_time.str[-1]
+    factors = units.map(TIME_UNITS)
+    if factors.isna().any():
+        unknown = units[factors.isna()].unique()
+        raise ValueError(f"Unknown time unit(s) in 'Deut Time': {', '.join(map(str, unknown))}")
+
+    return values * factors.to_numpy(dtype=float)
+
+
+def _sequence_properties(
+    sequences: pd.Series, drop_first: int, d_percentage: float
+) -> pd.DataFrame:
+    """Processed sequence, terminal offsets and exchanging residues per unique peptide sequence."""
+    unique = pd.Series(sequences.unique())
+    sequence = unique.str.replace("P", "p")
+    length = sequence.str.len()
+
+    # Find the total number of n terminal / c_terminal residues to remove from pyhdx/process.py
+    n_term = length - sequence.str[drop_first:].str.lstrip("p").str.len()
+    c_term = length - sequence.str.rstrip("p").str.len()
+    sequence = pd.Series(["x" * nt + s[nt:] for nt, s in zip(n_term, sequence)])
+    ex_residues = (length - sequence.str.count("x") - sequence.str.count("p")) * d_percentage
+
+    properties = pd.DataFrame(
+        {
+            "sequence": sequence.to_numpy(),
+            "n_term": n_term.to_numpy(),
+            "c_term": c_term.to_numpy(),
+            "ex_residues": ex_residues.to_numpy(dtype=float),
+        },
+        index=unique.to_numpy(),
+    )
 
-    def _time_to_sec(tp, tpunit):
-        return tp * np.power(60.0, "smh".find(tpunit[0]))
+    return properties
+
+
+def hdexa_to_pyhdx(
+    data: pd.DataFrame, d_percentage: float = 0.85, protein: str = "protein"
+) -> pd.DataFrame:
+    """
+    Convert a HDExaminer uptake summary table to the processed DynamX format PyHDX expects.
+
+    Timepoints are converted to seconds and the full deuteration ('FD') timepoint is used to
+    assign `fd_uptake` and `fd_uptake_sd` to all timepoints of the same peptide and state, after
+    which the FD rows are removed.
+
+    Args:
+        data: HDExaminer table, as read by [pd.read_csv][pandas.read_csv].
+        d_percentage: Percentage of deuterium in the labelling solution, used to scale the number
+            of exchanging residues.
+        protein: Protein name to use if the table has no 'Protein' column.
+
+    Returns:
+        Converted peptide table.
+
+    """
+    drop_first = 2
+    data = data.copy()
 
     if "# Deut" in data.columns:
         data = data.rename(columns={"# Deut": "#D"})
-        data["#D"] = data["#D"].fillna(0.0)
-        data["#D"] = data["#D"].astype(float)
+        data["#D"] = data["#D"].fillna(0.0).astype(float)
     if "Deut %" in data.columns:
         data = data.rename(columns={"Deut %": "%D"})
-        data["%D"] = data["%D"].fillna(0.0)
-        data["%D"] = data["%D"].astype(float)
+        data["%D"] = data["%D"].fillna(0.0).astype(float)
+
+    is_fd = np.zeros(len(data), dtype=bool)
     if "Deut Time" in data.columns:
-        data.loc[data["Deut Time"] == "FD", "Deut Time"] = "1e6s"
-        data["time unit"] = data["Deut Time"].str[-1]
-        data["Deut Time (sec)"] = data["Deut Time"].str[:-1].astype(float)
-        data["Deut Time (sec)"] = data.apply(
-            lambda x: _time_to_sec(tp=x["Deut Time (sec)"], tpunit=x["time unit"]), axis=1
-        )
-        data.loc[data["Deut Time (sec)"] == 1e6, "Deut Time (sec)"] = "MAX"
+        deut_time = data["Deut Time"].astype(str).str.strip()
+        is_fd = (deut_time == "FD").to_numpy()
+        deut_time = deut_time.where(~is_fd, f"{FD_TIME}s")
+        data["time unit"] = deut_time.str[-1]
+        data["Deut Time (sec)"] = _time_to_sec(deut_time)
+        is_fd |= data["Deut Time (sec)"].to_numpy() == FD_TIME
     if "Protein" not in data.columns:
         data["Protein"] = protein
 
-    pyhdx_cols = [
-        "start",
-        "end",
-        "stop",
-        "sequence",
-        "state",
-        "exposure",
-        "uptake",
-        "maxuptake",
-        "fd_uptake",
-        "fd_uptake_sd",
-        "nd_uptake",
-        "nd_uptake_sd",
-        "rfu",
-        "protein",
-        "modification",
-        "fragment",
-        "mhp",
-        "center",
-        "center_sd",
-        "uptake_sd",
-        "rt",
-        "rt_sd",
-        "rfu_sd",
-        "_sequence",
-        "_start",
-        "_stop",
-        "ex_residues",
-        "uptake_corrected",
-    ]
-    data = data.rename(
-        columns={
-            "Protein State": "state",
-            "Protein": "protein",
-            "Start": "start",
-            "End": "end",
-            "Sequence": "_sequence",
-            "Peptide Mass": "mhp",
-            "RT (min)": "rt",
-            "Deut Time (sec)": "exposure",
-            "maxD": "maxuptake",
-            "Theor Uptake #D": "uptake_corrected",
-            "#D": "uptake",
-            "%D": "rfu",
-            "Conf Interval (#D)": "rfu_sd",
-            "#Rep": "rep",
-            "Confidence": "quality",
-            "Stddev": "center_sd",
-            # "p"
-        }
-    )
+    data = data.rename(columns=HDEXAMINER_RENAME)
+    if "Deut Time" not in data.columns:
+        is_fd = (data["exposure"] == "MAX").to_numpy()
 
-    missing = list(set(pyhdx_cols) - set(data.columns))
+    missing = [col for col in PYHDX_COLUMNS if col not in data.columns]
     for mcol in missing:
-        data[mcol] = np.nan
-        if mcol == "rfu_sd":
-            data[mcol] = 0.05  # set 5% error as dummy value
+        data[mcol] = 0.05 if mcol == "rfu_sd" else np.nan  # set 5% error as dummy value
 
     data["rfu"] = data["rfu"] / 100.0
     data.loc[data["exposure"] == "0", "rfu_sd"] = 0.0
     data["stop"] = data["end"] + 1
-    data["sequence"] = data["_sequence"].copy()
-    data["sequence"] = [s.replace("P", "p") for s in data["sequence"]]
-    # Find the total number of n terminal / c_terminal residues to remove from pyhdx/process.py
-    n_term = np.array([len(seq) - len(seq[drop_first:].lstrip("p")) for seq in data["sequence"]])
-    c_term = np.array([len(seq) - len(seq.rstrip("p")) for seq in data["sequence"]])
-    data["sequence"] = ["x" * nt + s[nt:] for nt, s in zip(n_term, data["sequence"])]
-    data["_start"] = data["start"] + n_term
-    data["_stop"] = data["stop"] - c_term
-    ex_residues = (
-        np.array([len(s) - s.count("x") - s.count("p") for s in data["sequence"]]) * d_percentage
-    )
-    data["ex_residues"] = ex_residues
+
+    properties = _sequence_properties(data["_sequence"], drop_first, d_percentage)
+    codes = properties.index.get_indexer(data["_sequence"])
+    data["sequence"] = properties["sequence"].to_numpy()[codes]
+    data["_start"] = data["start"] + properties["n_term"].to_numpy()[codes]
+    data["_stop"] = data["stop"] - properties["c_term"].to_numpy()[codes]
+    data["ex_residues"] = properties["ex_residues"].to_numpy()[codes]
+
     data["uptake_sd"] = data["center_sd"]
     data["nd_uptake"] = 0.0
     data["nd_uptake_sd"] = 0.0
     data["modification"] = float("nan")
     data["fragment"] = float("nan")
-    # upeps = data[data["exposure"]=="0"]["_sequence"].unique()
-    # fpeps = data[data["exposure"]=="MAX"]["_sequence"].unique()
-    # good_peps = np.array(list(set(upeps) & set(fpeps)))
-    # peps = data["_sequence"].unique()
-    states = data["state"].unique()
-    data["fd_uptake"] = "novalue"
-    data["fd_uptake_sd"] = "novalue"
-
-    for state in states:
-        peps = data[data["state"] == state]["_sequence"].unique()
-        for pep in peps:
-            fd_up = data[
-                (data["_sequence"] == pep) & (data["exposure"] == "MAX") & (data["state"] == state)
-            ]["uptake"].iat[0]
-            fd_up_sd = data[
-                (data["_sequence"] == pep) & (data["exposure"] == "MAX") & (data["state"] == state)
-            ]["center_sd"].iat[0]
-            data.loc[data["_sequence"] == pep, "fd_uptake"] = fd_up
-            data.loc[data["_sequence"] == pep, "fd_uptake_sd"] = fd_up_sd
+
+    # Take uptake of the first FD entry of each peptide as its fully deuterated uptake
+    fd = (
+        data.loc[is_fd, ["state", "_sequence", "uptake", "center_sd"]]
+        .drop_duplicates(subset=["state", "_sequence"])
+        .rename(columns={"uptake": "fd_uptake", "center_sd": "fd_uptake_sd"})
+    )
+    merged = data[["state", "_sequence"]].merge(
+        fd, on=["state", "_sequence"], how="left", indicator=True
+    )
+    no_fd = (merged["_merge"] == "left_only").to_numpy()
+    if no_fd.any():
+        peptides = data.loc[no_fd, "_sequence"].unique()
+        raise ValueError(
+            f"No full deuteration ('FD') timepoint found for peptide(s): {', '.join(peptides)}"
+        )
+    data["fd_uptake"] = merged["fd_uptake"].to_numpy()
+    data["fd_uptake_sd"] = merged["fd_uptake_sd"].to_numpy()
+
     data["center"] = data["mhp"] + data["uptake"]
     data["rt_sd"] = 0.05  # dummy value
 
-    data["uptake_corrected_orig"] = data[
-        "uptake_corrected"
-    ]  # sometimes the HDExaminer output value is incorrect
-    data["uptake_corrected"] = (
-        data["rfu"] * data["maxuptake"]
-    )  #       so revert to conversion from the rfu
+    # sometimes the HDExaminer output value is incorrect, so revert to conversion from the rfu
+    data["uptake_corrected_orig"] = data["uptake_corrected"]
+    data["uptake_corrected"] = data["rfu"] * data["maxuptake"]
 
-    data = data[data["exposure"] != "MAX"]
-    data = data[data["fd_uptake"] != 0]
-    data = data[~data["uptake"].isna()]
+    keep = ~is_fd & (data["fd_uptake"] != 0).to_numpy() & data["uptake"].notna().to_numpy()
+    data = data[keep]
     data["exposure"] = data["exposure"].astype(float)
 
-    new_columns = [col for col in pyhdx_cols if col in data.columns] + [
-        col for col in data.columns if col not in pyhdx_cols
+    new_columns = [col for col in PYHDX_COLUMNS if col in data.columns] + [
+        col for col in data.columns if col not in PYHDX_COLUMNS
     ]
     return data[new_columns]
+
+
+def convert_hdexaminer_file(
+    src: os.PathLike,
+    dst: os.PathLike,
+    fmt: str = "csv",
+    d_percentage: float = 0.85,
+    protein: str = "protein",
+) -> Path:
+    """
+    Convert a single HDExaminer export file and write the result to `dst`.
+
+    Args:
+        src: Path to the HDExaminer .csv file.
+        dst: Output file path.
+        fmt: Output format, `csv` or `npz`. See [dataframe_to_file][fileIO.dataframe_to_file].
+        d_percentage: Percentage of deuterium in the labelling solution.
+        protein: Protein name to use if the table has no 'Protein' column.
+
+    Returns:
+        Path of the written file.
+
+    """
+    from pyhdx.fileIO import dataframe_to_file
+
+    data = pd.read_csv(src)
+    converted = hdexa_to_pyhdx(data, d_percentage=d_percentage, protein=protein)
+    converted = converted.reset_index(drop=True)
+    dataframe_to_file(dst, converted, fmt=fmt, include_metadata=False)
+
+    return Path(dst)
+
+
+def convert_hdexaminer_files(
+    files: Iterable[os.PathLike],
+    output_dir: os.PathLike,
+    fmt: str = "csv",
+    executor: Optional[Executor] = None,
+    **kwargs,
+) -> list[Path]:
+    """
+    Convert HDExaminer export files in parallel.
+
+    Output files are named after the input files, with a `_pyhdx` suffix added to the stem.
+
+    Args:
+        files: Paths of the HDExaminer .csv files.
+        output_dir: Directory to write converted files to.
+        fmt: Output format, `csv` or `npz`.
+        executor: Optional [concurrent.futures.Executor][] to run conversions on. By default a
+            [concurrent.futures.ProcessPoolExecutor][] is used.
+        **kwargs: Additional keyword arguments passed to [hdexa_to_pyhdx][convert_data.hdexa_to_pyhdx].
+
+    Returns:
+        List of paths of the written files, in the order of `files`.
+
+    """
+    if fmt not in ["csv", "npz"]:
+        raise ValueError(f"Invalid value for 'fmt': {fmt!r}, options are 'csv' or 'npz'")
+
+    files = [Path(f) for f in files]
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    targets = [output_dir / f"{f.stem}_pyhdx.{fmt}" for f in files]
+
+    def submit(ex: Executor) -> list[Path]:
+        futures = [
+            ex.submit(convert_hdexaminer_file, src, dst, fmt=fmt, **kwargs)
+            for src, dst in zip(files, targets)
+        ]
+        return [f.result() for f in futures]
+
+    if executor is None:
+        with ProcessPoolExecutor() as ex:
+            return submit(ex)
+    else:
+        return submit(executor)
@@ -5,13 +5,26 @@ import json
 import os
 import re
 import shutil
+import zipfile
 from datetime import datetime
 from io import StringIO, BytesIO
 from pathlib import Path
-from typing import Union, Literal, Tuple, List, TextIO, Optional, TYPE_CHECKING, Any, BinaryIO
+from typing import (
+    Union,
+    Literal,
+    Tuple,
+    List,
+    TextIO,
+    Optional,
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Iterator,
+)
 from importlib import import_module
 import torch.nn as nn
 import torch as t
+import numpy as np
 import pandas as pd
 import yaml
 import warnings
@@ -25,20 +38,95 @@ if TYPE_CHECKING:
 PEPTIDE_DTYPES = {"start": int, "end": int, "stop": int, "_start": int, "_stop": int}
 
 
+# Dtypes of columns in DynamX state data files, after converting names to lower case / underscores
+DYNAMX_TEXT_COLUMNS = ["protein", "sequence", "modification", "fragment", "state"]
+DYNAMX_INT_COLUMNS = ["start", "end"]
+DYNAMX_FLOAT_COLUMNS = ["mhp", "center", "center_sd", "uptake", "uptake_sd", "rt", "rt_sd"]
+DYNAMX_COLUMNS = [
+    *DYNAMX_TEXT_COLUMNS,
+    *DYNAMX_INT_COLUMNS,
+    *DYNAMX_FLOAT_COLUMNS,
+    "maxuptake",
+    "exposure",
+]
+
+
+def _dynamx_read_kwargs(
+    filepath_or_buffer: Union[Path[str], str, StringIO],
+    categorical: bool,
+    float_dtype: str,
+    engine: Optional[Literal["c", "python", "pyarrow"]],
+    usecols: Optional[list[str]] = None,
+) -> dict[str, Any]:
+    """Returns keyword arguments for `pd.read_csv` with column names and dtypes for DynamX files."""
+    if isinstance(filepath_or_buffer, StringIO):
+        hdr = filepath_or_buffer.readline().strip("# \n\t")
+        filepath_or_buffer.seek(0)
+    else:
+        with open(filepath_or_buffer, "r") as f_obj:
+            hdr = f_obj.readline().strip("# \n\t")
+
+    names = [name.lower().strip("\r\t\n").replace(" ", "_") for name in hdr.split(",")]
+
+    text_dtype = "category" if categorical else str
+    dtype = {
+        **{name: text_dtype for name in DYNAMX_TEXT_COLUMNS},
+        **{name: "int64" for name in DYNAMX_INT_COLUMNS},
+        **{name: float_dtype for name in DYNAMX_FLOAT_COLUMNS},
+        "exposure": "float64",  # exposure is used for exact matching and remains float64
+        "maxuptake": "float64",  # float such that missing values (NaN) can be read
+    }
+    kwargs = {
+        "header": 0,
+        "names": names,
+        "dtype": {name: dtype[name] for name in names if name in dtype},
+    }
+    if usecols is not None:
+        missing = set(usecols) - set(names)
+        if missing:
+            raise ValueError(f"Columns {', '.join(sorted(missing))} not found in DynamX file")
+        kwargs["usecols"] = list(usecols)
+    if engine is not None:
+        kwargs["engine"] = engine
+
+    return kwargs
+
+
+def _process_dynamx(df: pd.DataFrame, time_factor: float) -> pd.DataFrame:
+    if "end" in df:
+        df.insert(df.columns.get_loc("end") + 1, "stop", df["end"] + 1)
+    if "exposure" in df:
+        df["exposure"] *= time_factor
+
+    return df
+
+
 def read_dynamx(
     filepath_or_buffer: Union[Path[str], str, StringIO],
     time_conversion: Tuple[Literal["h", "min", "s"], Literal["h", "min", "s"]] = (
         "min",
         "s",
     ),
+    categorical: bool = False,
+    float_dtype: Literal["float32", "float64"] = "float64",
+    engine: Optional[Literal["c", "python", "pyarrow"]] = None,
+    usecols: Optional[list[str]] = None,
 ) -> pd.DataFrame:
     """
     Reads DynamX .csv files and returns the resulting peptide table as a pandas DataFrame.
 
+    Columns are parsed with an explicit dtype schema rather than inferred.
+
     Args:
         filepath_or_buffer: File path of the .csv file or [io.StringIO][] object.
         time_conversion: How to convert the time unit of the field 'exposure'. Format is (`<from>`, `<to>`).
             Unit options are `'h'`, `'min'` or `'s'`.
+        categorical: Set to `True` to read text columns (protein, state, sequence, etc) as categorical,
+            which reduces memory usage for large files.
+        float_dtype: Dtype of floating point columns (except 'exposure', which is always float64).
+        engine: Optional parser engine passed to [pd.read_csv][pandas.read_csv], e.g. `'pyarrow'`
+            (requires the pyarrow package).
+        usecols: Optional list of (lower case) columns to read. If `None`, all columns are read.
 
     Returns:
         Peptide table as a pandas DataFrame.
@@ -46,25 +134,54 @@ def read_dynamx(
 
     warnings.warn("Will be removed in favour of the `hdxms-datasets` package ", DeprecationWarning)
 
-    if isinstance(filepath_or_buffer, StringIO):
-        hdr = filepath_or_buffer.readline().strip("# \n\t")
-        filepath_or_buffer.seek(0)
-    else:
-        with open(filepath_or_buffer, "r") as f_obj:
-            hdr = f_obj.readline().strip("# \n\t")
+    read_kwargs = _dynamx_read_kwargs(filepath_or_buffer, categorical, float_dtype, engine, usecols)
+    df = pd.read_csv(filepath_or_buffer, **read_kwargs)
 
-    names = [name.lower().strip("\r\t\n") for name in hdr.split(",")]
-    df = pd.read_csv(filepath_or_buffer, header=0, names=names)
+    time_lut = {"h": 3600, "min": 60, "s": 1}
+    time_factor = time_lut[time_conversion[0]] / time_lut[time_conversion[1]]
 
-    df.insert(df.columns.get_loc("end") + 1, "stop", df["end"] + 1)
+    return _process_dynamx(df, time_factor)
+
+
+def iter_dynamx(
+    filepath_or_buffer: Union[Path[str], str, StringIO],
+    chunksize: int = 100_000,
+    time_conversion: Tuple[Literal["h", "min", "s"], Literal["h", "min", "s"]] = (
+        "min",
+        "s",
+    ),
+    categorical: bool = False,
+    float_dtype: Literal["float32", "float64"] = "float64",
+    usecols: Optional[list[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Reads DynamX .csv files in chunks, yielding peptide tables of at most `chunksize` rows.
+
+    Chunks have the same columns and dtypes as the output of [read_dynamx][fileIO.read_dynamx], such
+    that large files can be processed (e.g. filtered) without reading them fully into memory.
+    With `categorical=True`, categories may differ between chunks.
+
+    Args:
+        filepath_or_buffer: File path of the .csv file or [io.StringIO][] object.
+        chunksize: Number of rows per chunk.
+        time_conversion: How to convert the time unit of the field 'exposure'. Format is (`<from>`, `<to>`).
+            Unit options are `'h'`, `'min'` or `'s'`.
+        categorical: Set to `True` to read text columns (protein, state, sequence, etc) as categorical.
+        float_dtype: Dtype of floating point columns (except 'exposure', which is always float64).
+        usecols: Optional list of (lower case) columns to read. If `None`, all columns are read.
+
+    Returns:
+        Iterator of peptide table chunks.
+    """
+
+    read_kwargs = _dynamx_read_kwargs(filepath_or_buffer, categorical, float_dtype, None, usecols)
 
     time_lut = {"h": 3600, "min": 60, "s": 1}
     time_factor = time_lut[time_conversion[0]] / time_lut[time_conversion[1]]
 
-    df["exposure"] *= time_factor
-    df.columns = df.columns.str.replace(" ", "_")
-
-    return df
+    with pd.read_csv(filepath_or_buffer, chunksize=chunksize, **read_kwargs) as reader:
+        for chunk in reader:
+            yield _process_dynamx(chunk, time_factor)
 
 
 def read_header(file_obj: Union[TextIO, BinaryIO], comment: str = "#") -> List[str]:
@@ -163,6 +280,24 @@ def csv_to_hdxm(
     """
 
     df = csv_to_dataframe(filepath_or_buffer, comment=comment, **kwargs)
+
+    return dataframe_to_hdxm(df)
+
+
+def dataframe_to_hdxm(
+    df: pd.DataFrame,
+) -> Union[pyhdx.models.HDXMeasurement, pyhdx.models.HDXMeasurementSet]:
+    """
+    Create a [HDXMeasurement][models.HDXMeasurement] or [HDXMeasurementSet][models.HDXMeasurementSet] from a
+    peptide table as written by their `to_file` methods. Metadata is taken from `df.attrs['metadata']`.
+
+    Args:
+        df: Peptide table with single (HDXMeasurement) or two-level (HDXMeasurementSet) columns.
+
+    Returns:
+        data_obj: The HDXMeasurement or HDXMeasurementSet object.
+
+    """
     metadata = df.attrs.pop("metadata", {})
     if df.columns.nlevels == 2:
         hdxm_list = []
@@ -259,6 +394,196 @@ def dataframe_to_stringio(
     return sio
 
 
+def _encode_array(
+    values: Union[pd.Series, pd.Index]
+) -> tuple[dict[str, np.ndarray], Union[str, dict]]:
+    """Encode a column or index level as numpy arrays which can be stored without pickling.
+
+    Returns the arrays together with a JSON serializable dtype tag used to restore the dtype.
+    """
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+        return {"values": np.asarray(values)}, str(dtype)
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        codes = np.asarray(pd.Categorical(values).codes)
+        cat_arrays, cat_dtype = _encode_array(dtype.categories)
+        arrays = {"codes": codes, **{f"categories_{k}": v for k, v in cat_arrays.items()}}
+        tag = {"dtype": "category", "ordered": bool(dtype.ordered), "categories": cat_dtype}
+        return arrays, tag
+
+    mask = np.asarray(pd.isna(values))
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        return {"values": values.array.tz_convert("UTC").tz_localize(None).to_numpy()}, str(dtype)
+    if isinstance(dtype, pd.api.extensions.ExtensionDtype) and hasattr(dtype, "numpy_dtype"):
+        # nullable integer, float and boolean dtypes; values at masked positions are arbitrary
+        fill = False if dtype.numpy_dtype.kind == "b" else 0
+        values = np.asarray(values.array.to_numpy(dtype=dtype.numpy_dtype, na_value=fill))
+        return {"values": values, "mask": mask}, str(dtype)
+    if isinstance(dtype, pd.StringDtype):
+        str_values = np.asarray(values.array.to_numpy(dtype=object, na_value=""), dtype=str)
+        return {"values": str_values, "mask": mask}, str(dtype)
+    if dtype != object:
+        raise TypeError(f"Unsupported dtype {dtype!s} for npz format")
+
+    # object columns are stored as strings
+    str_values = np.asarray(values.astype(str), dtype=str)
+    return {"values": str_values, "mask": mask}, "object"
+
+
+def _decode_array(
+    arrays: dict[str, np.ndarray], dtype: Union[str, dict]
+) -> Union[np.ndarray, pd.api.extensions.ExtensionArray]:
+    if isinstance(dtype, dict):  # categorical
+        cat_arrays = {
+            k[len("categories_") :]: v for k, v in arrays.items() if k.startswith("categories_")
+        }
+        categories = _decode_array(cat_arrays, dtype["categories"])
+        return pd.Categorical.from_codes(
+            arrays["codes"], categories=categories, ordered=dtype["ordered"]
+        )
+
+    values = arrays["values"]
+    if dtype == "object":
+        values = values.astype(object)
+        values[arrays["mask"]] = np.nan
+        return values
+
+    pd_dtype = pd.api.types.pandas_dtype(dtype)
+    if isinstance(pd_dtype, pd.DatetimeTZDtype):
+        return pd.array(values).tz_localize("UTC").tz_convert(pd_dtype.tz)
+    if isinstance(pd_dtype, pd.StringDtype):
+        values = values.astype(object)
+    if "mask" in arrays:
+        array = pd.array(values, dtype=pd_dtype)
+        array[arrays["mask"]] = pd.NA
+        return array
+
+    return values
+
+
+def _json_default(obj: Any) -> Any:
+    """Converts numpy scalars and arrays (eg in labels or metadata) for JSON serialization."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _to_label(label: Any) -> Any:
+    return list(label) if isinstance(label, tuple) else label
+
+
+def dataframe_to_npz(
+    file_path_or_buffer: Union[os.PathLike, BinaryIO],
+    df: pd.DataFrame,
+    include_metadata: Union[bool, dict] = True,
+    include_version: bool = False,
+) -> None:
+    """
+    Save a [pd.DataFrame][pandas.DataFrame] to a binary numpy `.npz` file.
+
+    Column and index labels (including MultiIndex levels and names), dtypes and metadata are stored
+    such that the dataframe is restored exactly by [npz_to_dataframe][fileIO.npz_to_dataframe].
+    Numeric, boolean and datetime columns are stored as native numpy arrays. Categorical columns
+    are stored as codes and categories, and nullable extension dtypes as values and a mask. Object
+    columns are stored as strings.
+
+    Args:
+        file_path_or_buffer: Path or binary file object to write to.
+        df: The [pd.DataFrame][pandas.DataFrame] to write.
+        include_metadata: If `True`, the metadata in `df.attrs['metadata']` is included. If a [dict][] is given, this
+            dictionary is used as the metadata. Otherwise, no metadata is included.
+        include_version: Set to `True` to include PyHDX version information.
+
+    """
+
+    header: dict[str, Any] = {
+        "columns": [_to_label(label) for label in df.columns],
+        "column_names": list(df.columns.names),
+        "index_names": list(df.index.names),
+        "dtypes": [],
+        "index_dtypes": [],
+    }
+    if include_version:
+        header["version"] = pyhdx.VERSION_STRING
+    if include_metadata is True and "metadata" in df.attrs:
+        header["metadata"] = df.attrs["metadata"]
+    elif include_metadata and isinstance(include_metadata, dict):
+        header["metadata"] = include_metadata
+
+    arrays: dict[str, np.ndarray] = {}
+    if isinstance(df.index, pd.RangeIndex):
+        header["range_index"] = [df.index.start, df.index.stop, df.index.step]
+    else:
+        for i in range(df.index.nlevels):
+            encoded, dtype = _encode_array(df.index.get_level_values(i))
+            arrays.update({f"index_{i}_{k}": v for k, v in encoded.items()})
+            header["index_dtypes"].append(dtype)
+
+    for i in range(df.shape[1]):
+        encoded, dtype = _encode_array(df.iloc[:, i])
+        arrays.update({f"column_{i}_{k}": v for k, v in encoded.items()})
+        header["dtypes"].append(dtype)
+
+    arrays["header"] = np.array(json.dumps(header, default=_json_default))
+    np.savez(file_path_or_buffer, **arrays)
+
+
+def npz_to_dataframe(file_path_or_buffer: Union[os.PathLike, BinaryIO]) -> pd.DataFrame:
+    """
+    Reads a `.npz` file written by [dataframe_to_npz][fileIO.dataframe_to_npz] into a
+    [pd.DataFrame][pandas.DataFrame]. Metadata is stored in the returned dataframe as `df.attrs['metadata']`.
+
+    Args:
+        file_path_or_buffer: Path or binary file object to read from.
+
+    Returns:
+        df: The read dataframe.
+
+    """
+
+    with np.load(file_path_or_buffer, allow_pickle=False) as npz_file:
+        arrays = dict(npz_file)
+
+    header = json.loads(arrays.pop("header").item())
+
+    def get_arrays(prefix: str) -> dict[str, np.ndarray]:
+        return {k[len(prefix) :]: v for k, v in arrays.items() if k.startswith(prefix)}
+
+    if "range_index" in header:
+        index = pd.RangeIndex(*header["range_index"], name=header["index_names"][0])
+    else:
+        levels = [
+            _decode_array(get_arrays(f"index_{i}_"), dtype)
+            for i, dtype in enumerate(header["index_dtypes"])
+        ]
+        if len(levels) == 1:
+            index = pd.Index(levels[0], name=header["index_names"][0])
+        else:
+            index = pd.MultiIndex.from_arrays(levels, names=header["index_names"])
+
+    if len(header["column_names"]) > 1:
+        columns = pd.MultiIndex.from_tuples(
+            [tuple(label) for label in header["columns"]], names=header["column_names"]
+        )
+    else:
+        columns = pd.Index(header["columns"], name=header["column_names"][0])
+
+    data = {
+        i: _decode_array(get_arrays(f"column_{i}_"), dtype)
+        for i, dtype in enumerate(header["dtypes"])
+    }
+    df = pd.DataFrame(data, index=index)
+    df.columns = columns
+
+    if "metadata" in header:
+        df.attrs["metadata"] = header["metadata"]
+
+    return df
+
+
 def dataframe_to_file(
     file_path: os.PathLike,
     df: pd.DataFrame,
@@ -275,13 +600,21 @@ def dataframe_to_file(
     Args:
         file_path: Path write to.
         df: The [pd.DataFrame][pandas.DataFrame] to write.
-        fmt: Specify the formatting of the output. Options are `csv` (machine readable) or `pprint` (human readable).
+        fmt: Specify the formatting of the output. Options are `csv` (machine readable), `pprint` (human readable)
+            or `npz` (binary, see [dataframe_to_npz][fileIO.dataframe_to_npz]).
         include_metadata: If `True`, the metadata in `df.attrs['metadata']` is included. If a [dict][] is given, this
             dictionary is used as the metadata. Otherwise, no metadata is included.
         include_version: Set to `True` to include PyHDX version information.
         **kwargs: Optional additional keyword arguments passed to [df.to_csv][pandas.DataFrame.to_csv].
 
     """
+    if fmt == "npz":
+        with open(str(file_path), "wb") as f:
+            dataframe_to_npz(
+                f, df, include_metadata=include_metadata, include_version=include_version
+            )
+        return
+
     sio = dataframe_to_stringio(
         df,
         fmt=fmt,
@@ -295,38 +628,49 @@ def dataframe_to_file(
 
 
 def save_fitresult(
-    output_dir: os.PathLike, fit_result: TorchFitResult, log_lines: Optional[list[str]] = None
+    output_dir: os.PathLike,
+    fit_result: TorchFitResult,
+    log_lines: Optional[list[str]] = None,
+    fmt: Literal["csv", "npz"] = "csv",
+    human_readable: bool = True,
 ) -> None:
     """
     Save a fit result object to the specified directory with associated metadata
 
     Output directory contents:
-    dG.csv/.txt: Fit output result (dG, covariance, k_obs, pfact)
-    losses.csv/.txt: Losses per epoch
+    fit_result.csv/.npz: Fit output result (dG, covariance, k_obs, pfact)
+    losses.csv/.npz: Losses per epoch
+    HDXMeasurements.csv/.npz: Peptide data of the fitted HDX measurements
+    fit_result.txt, losses.txt: Human readable versions of fit result and losses (optional)
     log.txt: Log file with additional metadata (number of epochs, final losses, pyhdx version, time/date)
 
     Args:
         output_dir: Output directory to save fit result to.
         fit_result: fit result object to save.
         log_lines: Optional additional lines to write to log file.
+        fmt: File format of the machine-readable output files, either `csv` or binary `npz`.
+        human_readable: Set to `False` to skip writing the human readable `.txt` files.
 
     """
 
+    if fmt not in ["csv", "npz"]:
+        raise ValueError(f"Invalid specification for fmt: '{fmt}', must be 'csv' or 'npz'")
+
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    fit_result.to_file(output_dir / "fit_result.csv")
-    fit_result.to_file(output_dir / "fit_result.txt", fmt="pprint")
-
-    dataframe_to_file(output_dir / "losses.csv", fit_result.losses)
-    dataframe_to_file(output_dir / "losses.txt", fit_result.losses, fmt="pprint")
+    fit_result.to_file(output_dir / f"fit_result.{fmt}", fmt=fmt)
+    dataframe_to_file(output_dir / f"losses.{fmt}", fit_result.losses, fmt=fmt)
+    if human_readable:
+        fit_result.to_file(output_dir / "fit_result.txt", fmt="pprint")
+        dataframe_to_file(output_dir / "losses.txt", fit_result.losses, fmt="pprint")
 
     if isinstance(
         fit_result.hdxm_set, pyhdx.HDXMeasurement
     ):  # check, but this should always be hdxm_set
-        fit_result.hdxm_set.to_file(output_dir / "HDXMeasurement.csv")
+        fit_result.hdxm_set.to_file(output_dir / f"HDXMeasurement.{fmt}", fmt=fmt)
     if isinstance(fit_result.hdxm_set, pyhdx.HDXMeasurementSet):
-        fit_result.hdxm_set.to_file(output_dir / "HDXMeasurements.csv")
+        fit_result.hdxm_set.to_file(output_dir / f"HDXMeasurements.{fmt}", fmt=fmt)
 
     loss = (
         f"Total_loss {fit_result.total_loss:.2f}, mse_loss {fit_result.mse_loss:.2f}, reg_loss {fit_result.reg_loss:.2f}"
@@ -348,7 +692,8 @@ def save_fitresult(
 def load_fitresult(fit_dir: os.PathLike) -> Union[TorchFitResult, TorchFitResultSet]:
     """Load a fitresult.
 
-    The fit result must be in the format as generated by saving a fit result with `save_fitresult`.
+    The fit result must be in the format as generated by saving a fit result with `save_fitresult`,
+    either in `csv` or `npz` format.
 
     Args:
         fir_dir: Fit result directory.
@@ -359,11 +704,14 @@ def load_fitresult(fit_dir: os.PathLike) -> Union[TorchFitResult, TorchFitResult
     """
     pth = Path(fit_dir)
     if pth.is_dir():
-        fit_result = csv_to_dataframe(fit_dir / "fit_result.csv")
-        losses = csv_to_dataframe(fit_dir / "losses.csv")
-
-        data_obj = csv_to_hdxm(fit_dir / "HDXMeasurements.csv")
-        result_klass = pyhdx.fitting_torch.TorchFitResult
+        if (pth / "fit_result.npz").exists():
+            fit_result = npz_to_dataframe(pth / "fit_result.npz")
+            losses = npz_to_dataframe(pth / "losses.npz")
+            data_obj = dataframe_to_hdxm(npz_to_dataframe(pth / "HDXMeasurements.npz"))
+        else:
+            fit_result = csv_to_dataframe(pth / "fit_result.csv")
+            losses = csv_to_dataframe(pth / "losses.csv")
+            data_obj = csv_to_hdxm(pth / "HDXMeasurements.csv")
     elif pth.is_file():
         raise DeprecationWarning("`load_fitresult` only loads from fit result directories")
         fit_result = csv_to_dataframe(fit_dir)
@@ -373,6 +721,15 @@ def load_fitresult(fit_dir: os.PathLike) -> Union[TorchFitResult, TorchFitResult
     else:
         raise ValueError("Specified fit result path is not a directory")
 
+    return _fitresult_from_dataframes(fit_result, losses, data_obj)
+
+
+def _fitresult_from_dataframes(
+    fit_result: pd.DataFrame,
+    losses: pd.DataFrame,
+    data_obj: Union[pyhdx.HDXMeasurement, pyhdx.HDXMeasurementSet],
+) -> TorchFitResult:
+    result_klass = pyhdx.fitting_torch.TorchFitResult
     fit_metadata = fit_result.attrs.pop("metadata")
     model_klass = getattr(import_module("pyhdx.fitting_torch"), fit_metadata["model_name"])
 
@@ -386,3 +743,195 @@ def load_fitresult(fit_dir: os.PathLike) -> Union[TorchFitResult, TorchFitResult
     fit_result_obj = result_klass(data_obj, model, losses=losses, metadata=fit_metadata)
 
     return fit_result_obj
+
+
+class ProjectArchive:
+    """
+    Single-file archive of HDX measurements, tables (e.g. rate guesses) and fit results.
+
+    The archive is an uncompressed zip file where each table is stored as a separate `.npz` member (see
+    [dataframe_to_npz][fileIO.dataframe_to_npz]). New entries are appended without rewriting the existing
+    contents, and entries are read individually, such that listing the archive and reading a single
+    entry does not load any other entries.
+
+    Entries are organized in groups: `hdxm_sets`, `tables` and `fits`. Overwriting an entry writes a
+    new archive without the members of the previous entry, such that no stale tables (e.g. a
+    checkpoint of a previous fit) remain.
+
+    Args:
+        file_path: Path of the archive file.
+        mode: Open the archive for reading (`r`) or reading and appending (`a`).
+
+    """
+
+    groups = ("hdxm_sets", "tables", "fits")
+
+    def __init__(self, file_path: os.PathLike, mode: Literal["r", "a"] = "a") -> None:
+        if mode not in ["r", "a"]:
+            raise ValueError(f"Invalid mode {mode!r}, must be 'r' or 'a'")
+        self.file_path = Path(file_path)
+        self._zip = zipfile.ZipFile(self.file_path, mode=mode, compression=zipfile.ZIP_STORED)
+
+    def __enter__(self) -> ProjectArchive:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def names(self, group: str) -> list[str]:
+        """Returns the names of all entries in a group."""
+        if group not in self.groups:
+            raise ValueError(f"Invalid group {group!r}, options are {', '.join(self.groups)}")
+
+        names = [
+            member.split("/")[1]
+            for member in self._zip.namelist()
+            if member.startswith(f"{group}/")
+        ]
+        return list(dict.fromkeys(names))
+
+    def _member(self, group: str, name: str, table: str) -> str:
+        if not name or "/" in name:
+            raise ValueError(f"Invalid entry name {name!r}")
+        return f"{group}/{name}/{table}.npz"
+
+    def _put(self, group: str, name: str, tables: dict[str, bytes], overwrite: bool) -> None:
+        """Writes all tables of an entry, replacing all members of a previous entry."""
+        members = {self._member(group, name, table): data for table, data in tables.items()}
+        existing = [m for m in self._zip.namelist() if m.startswith(f"{group}/{name}/")]
+        if existing:
+            if not overwrite:
+                raise ValueError(
+                    f"Archive already contains {group} entry {name!r}, use 'overwrite=True' to "
+                    "replace"
+                )
+            self._remove(existing)
+
+        for member, data in members.items():
+            self._zip.writestr(member, data)
+
+    def _remove(self, members: list[str]) -> None:
+        """Removes members by writing a new archive without them."""
+        self._zip.close()
+        tmp_path = self.file_path.with_name(f"{self.file_path.name}.{os.getpid()}.tmp")
+        try:
+            with zipfile.ZipFile(self.file_path) as src, zipfile.ZipFile(
+                tmp_path, mode="w", compression=zipfile.ZIP_STORED
+            ) as dst:
+                for info in src.infolist():
+                    if info.filename not in members:
+                        dst.writestr(info, src.read(info))
+            os.replace(tmp_path, self.file_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+            self._zip = zipfile.ZipFile(self.file_path, mode="a", compression=zipfile.ZIP_STORED)
+
+    @staticmethod
+    def _encode(df: pd.DataFrame, **kwargs: Any) -> bytes:
+        bio = BytesIO()
+        dataframe_to_npz(bio, df, **kwargs)
+        return bio.getvalue()
+
+    def _read(self, member: str) -> pd.DataFrame:
+        try:
+            data = self._zip.read(member)
+        except KeyError:
+            raise KeyError(f"Archive does not contain {member!r}") from None
+        return npz_to_dataframe(BytesIO(data))
+
+    def put_table(self, name: str, df: pd.DataFrame, overwrite: bool = False) -> None:
+        """Add a table (e.g. initial rate guesses) to the archive.
+
+        Args:
+            name: Name of the table.
+            df: The [pd.DataFrame][pandas.DataFrame] to store, including metadata in `df.attrs`.
+            overwrite: Set to `True` to replace an existing table with the same name.
+
+        """
+        self._put("tables", name, {"table": self._encode(df)}, overwrite)
+
+    def get_table(self, name: str) -> pd.DataFrame:
+        """Read a table from the archive."""
+        return self._read(self._member("tables", name, "table"))
+
+    def put_hdxm_set(
+        self,
+        name: str,
+        hdxm_set: Union[pyhdx.HDXMeasurement, pyhdx.HDXMeasurementSet],
+        overwrite: bool = False,
+    ) -> None:
+        """Add peptide data of an HDXMeasurement or HDXMeasurementSet to the archive.
+
+        Args:
+            name: Name of the entry.
+            hdxm_set: HDXMeasurement or HDXMeasurementSet to store.
+            overwrite: Set to `True` to replace an existing entry with the same name.
+
+        """
+        df, metadata = self._hdxm_set_dataframe(hdxm_set)
+        tables = {"HDXMeasurements": self._encode(df, include_metadata=metadata)}
+        self._put("hdxm_sets", name, tables, overwrite)
+
+    def get_hdxm_set(self, name: str) -> pyhdx.HDXMeasurementSet:
+        """Read an HDXMeasurementSet from the archive."""
+        return dataframe_to_hdxm(self._read(self._member("hdxm_sets", name, "HDXMeasurements")))
+
+    @staticmethod
+    def _hdxm_set_dataframe(
+        hdxm_set: Union[pyhdx.HDXMeasurement, pyhdx.HDXMeasurementSet]
+    ) -> tuple[pd.DataFrame, dict]:
+        hdxm_list = [hdxm_set] if isinstance(hdxm_set, pyhdx.HDXMeasurement) else list(hdxm_set)
+        names = [hdxm.name for hdxm in hdxm_list]
+        df = pd.concat([hdxm.data for hdxm in hdxm_list], axis=1, keys=names)
+        metadata = {hdxm.name: hdxm.metadata for hdxm in hdxm_list}
+
+        return df, metadata
+
+    def put_fit_result(
+        self,
+        name: str,
+        fit_result: TorchFitResult,
+        checkpoint: Optional[pyhdx.fitting_torch.CheckPoint] = None,
+        overwrite: bool = False,
+    ) -> None:
+        """Add a fit result, its losses and fitted HDX measurements to the archive.
+
+        Args:
+            name: Name of the fit result.
+            fit_result: Fit result object to store.
+            checkpoint: Optional [CheckPoint][fitting_torch.CheckPoint] callback from the fit, of which
+                the ΔG history is stored.
+            overwrite: Set to `True` to replace an existing fit result with the same name.
+
+        """
+
+        df, metadata = self._hdxm_set_dataframe(fit_result.hdxm_set)
+        tables = {
+            "fit_result": self._encode(fit_result.output, include_metadata=fit_result.metadata),
+            "losses": self._encode(fit_result.losses),
+            "HDXMeasurements": self._encode(df, include_metadata=metadata),
+        }
+        if checkpoint is not None:
+            checkpoint_df = checkpoint.to_dataframe(names=fit_result.hdxm_set.names)
+            tables["checkpoint"] = self._encode(checkpoint_df)
+
+        self._put("fits", name, tables, overwrite)
+
+    def get_fit_result(self, name: str) -> TorchFitResult:
+        """Read a fit result from the archive."""
+        fit_result = self._read(self._member("fits", name, "fit_result"))
+        losses = self.get_losses(name)
+        data_obj = dataframe_to_hdxm(self._read(self._member("fits", name, "HDXMeasurements")))
+
+        return _fitresult_from_dataframes(fit_result, losses, data_obj)
+
+    def get_losses(self, name: str) -> pd.DataFrame:
+        """Read the losses of a fit result from the archive."""
+        return self._read(self._member("fits", name, "losses"))
+
+    def get_checkpoint(self, name: str) -> pd.DataFrame:
+        """Read the ΔG checkpoint history of a fit result from the archive."""
+        return self._read(self._member("fits", name, "checkpoint"))
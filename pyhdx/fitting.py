@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from collections import namedtuple
+import inspect
+import os
+import pickle
+import threading
+from collections import namedtuple, OrderedDict
 from dataclasses import dataclass
-from functools import partial
-from typing import Union, Optional, Any, Literal
+from functools import partial, wraps
+from pathlib import Path
+from typing import Union, Optional, Any, Literal, Callable
 
 import numpy as np
 import pandas as pd
@@ -19,9 +24,10 @@ from pyhdx.fit_models import (
     TwoComponentAssociationModel,
     TwoComponentDissociationModel,
 )
-from pyhdx.fitting_torch import DeltaGFit, TorchFitResult
+from pyhdx.fitting_torch import Callback, DeltaGFit, TorchFitResult
 from pyhdx.local_cluster import DummyClient
-from pyhdx.support import temporary_seed, pbar_decorator, multiindex_astype
+from pyhdx.__version__ import __version__
+from pyhdx.support import temporary_seed, pbar_decorator, multiindex_astype, hash_object
 from pyhdx.models import HDXMeasurementSet, HDXTimepoint, HDXMeasurement
 from pyhdx.config import cfg
 
@@ -42,6 +48,9 @@ EPOCHS = 200000
 R1 = 1
 R2 = 1
 
+# Number of tasks per Dask worker when batching fitting tasks
+TASKS_PER_WORKER = 4
+
 optimizer_defaults = {
     "SGD": {"lr": 1e4, "momentum": 0.5, "nesterov": True},
 }
@@ -154,7 +163,13 @@ def fit_rates_half_time_interpolate(hdxm):
 
 
 def fit_rates_weighted_average(
-    hdxm, bounds=None, chisq_thd=0.20, model_type="association", client=None, pbar=None
+    hdxm,
+    bounds=None,
+    chisq_thd=0.20,
+    model_type="association",
+    client=None,
+    pbar=None,
+    chunksize=None,
 ):
     """
     Fit a model specified by 'model_type' to D-uptake kinetics. D-uptake is weighted averaged across peptides per
@@ -172,10 +187,14 @@ def fit_rates_weighted_average(
     client : : ??
         Controls delegation of fitting tasks to Dask clusters. Options are: `None`: Do not use task, fitting is done
         in the local thread in a for loop. :class: Dask Client : Uses the supplied Dask client to schedule fitting task.
+        :class:`~pyhdx.local_cluster.DummyClient`: Fitting is done locally, in chunks.
         `worker_client`: The function was ran by a Dask worker and the additional fitting tasks created are scheduled
         on the same Cluster.
     pbar:
         Not implemented
+    chunksize : :obj:`int`, optional
+        Number of coverage blocks fitted per Dask task. By default the blocks are divided such that each worker
+        receives about :data:`TASKS_PER_WORKER` tasks.
 
     Returns
     -------
@@ -196,21 +215,45 @@ def fit_rates_weighted_average(
             result = fit_kinetics(hdxm.timepoints, d, model, chisq_thd=chisq_thd)
             results.append(result)
     else:
-        iterables = [[hdxm.timepoints] * len(d_list), d_list, models]
 
-        if isinstance(client, Client):
-            futures = client.map(fit_kinetics, *iterables, chisq_thd=chisq_thd)
-            results = client.gather(futures)
+        def run_chunks(c) -> list:
+            n_workers = 1 if isinstance(c, DummyClient) else len(c.scheduler_info()["workers"])
+            size = chunksize or _chunk_size(len(d_list), n_workers)
+            chunks = [
+                (d_list[i : i + size], models[i : i + size]) for i in range(0, len(d_list), size)
+            ]
+            # arguments are positional as DummyClient.submit does not pass keyword arguments
+            futures = [
+                c.submit(_fit_kinetics_chunk, hdxm.timepoints, d, m, chisq_thd) for d, m in chunks
+            ]
+            # futures are gathered in submission order, which keeps results in block order
+            return [result for chunk in c.gather(futures) for result in chunk]
+
+        if isinstance(client, (Client, DummyClient)):
+            results = run_chunks(client)
         elif client == "worker_client":
-            with worker_client() as client:
-                futures = client.map(fit_kinetics, *iterables, chisq_thd=chisq_thd)
-                results = client.gather(futures)
+            with worker_client() as c:
+                results = run_chunks(c)
+        else:
+            raise TypeError(f"Invalid client {client!r}")
 
     fit_result = KineticsFitResult(hdxm, intervals, results, models)
 
     return fit_result
 
 
+def _chunk_size(n_items: int, n_workers: int, tasks_per_worker: Optional[int] = None) -> int:
+    """Number of items per task such that each worker receives about `tasks_per_worker` tasks."""
+    tasks_per_worker = tasks_per_worker or TASKS_PER_WORKER
+    n_tasks = max(n_workers, 1) * tasks_per_worker
+    return max(int(np.ceil(n_items / n_tasks)), 1)
+
+
+def _fit_kinetics_chunk(t, d_list, models, chisq_thd=100) -> list:
+    """Fit a batch of D-uptake kinetics in a single task, see :func:`fit_kinetics`."""
+    return [fit_kinetics(t, d, model, chisq_thd=chisq_thd) for d, model in zip(d_list, models)]
+
+
 def d_uptake_cost_func(x: np.ndarray, A: np.ndarray, b: np.ndarray, d: float) -> float:
     r"""
     Cost functions for residue-level D-uptake
@@ -282,22 +325,25 @@ def fit_d_uptake(
     pbar = tqdm(total=Nt * repeats, disable=not verbose)
     pbar_wrapper = pbar_decorator(pbar)
 
+    pfunc = partial(_fit_single_d_update, guess=guess, r1=r1, bounds=bounds)
+    if isinstance(client, DummyClient):
+        pfunc = pbar_wrapper(pfunc)
+
+    def run_repeats(c, X: np.ndarray, d_uptake: np.ndarray) -> list:
+        # send the arrays to the cluster once, to be shared by all repeats
+        X, d_uptake = c.scatter([X, d_uptake], hash=False)
+        futures = [c.submit(pfunc, X, d_uptake, pure=False) for r in range(repeats)]
+        return c.gather(futures)
+
     for Ni, hdx_t in enumerate(iterable):
         X = hdx_t.X
         d_uptake = hdx_t.data["uptake_corrected"].values
-        pfunc = partial(_fit_single_d_update, X, d_uptake, guess=guess, r1=r1, bounds=bounds)
-        if isinstance(client, DummyClient):
-            pbar_func = pbar_wrapper(pfunc)
-        else:
-            pbar_func = pfunc
 
         if client == "worker_client":
             with worker_client() as c:
-                futures = [c.submit(pbar_func, pure=False) for r in range(repeats)]
-                results = c.gather(futures)
+                results = run_repeats(c, X, d_uptake)
         else:
-            futures = [client.submit(pbar_func, pure=False) for r in range(repeats)]
-            results = client.gather(futures)
+            results = run_repeats(client, X, d_uptake)
 
         for r, (res, mse_loss, reg_loss) in enumerate(results):
             out[Ni, r, :] = res.x
@@ -465,7 +511,8 @@ def fit_kinetics(t, d, model, chisq_thd=100):
         ):
             fit = Fit(model.sf_model, t, d, minimizer=DifferentialEvolution)
             # grid = model.initial_grid(t, d, step=5)
-            res = fit.execute()
+            # explicit seed, as the global random state is shared between threaded dask workers
+            res = fit.execute(seed=43)
 
     return res
 
@@ -526,7 +573,9 @@ def run_optimizer(
     stop_loss : :obj:`float`
         Threshold of optimization value below which no progress is made
     callbacks: :obj:`list` or `None`
-        List of callback functions
+        List of callback functions, called with (epoch, model, optimizer) after each epoch.
+        Instances of :class:`~pyhdx.fitting_torch.Callback` are additionally passed the losses of
+        the epoch. Optimization is stopped when a callback returns `True`.
     verbose : :obj:`bool`
         Toggle progress bar
 
@@ -563,8 +612,15 @@ def run_optimizer(
         optimizer_obj.zero_grad()
         loss = optimizer_obj.step(closure)
 
+        # callbacks can stop the optimization by returning True
+        stop_fit = False
         for cb in callbacks:
-            cb(epoch, model, optimizer_obj)
+            if isinstance(cb, Callback):
+                stop_fit |= bool(cb(epoch, model, optimizer_obj, losses=losses_list[-1]))
+            else:
+                stop_fit |= bool(cb(epoch, model, optimizer_obj))
+        if stop_fit:
+            break
 
         diff = sum(losses_list[-2]) - sum(losses_list[-1])
         if diff < stop_loss:
@@ -1228,3 +1284,166 @@ class DUptakeFitResultSet(object):
         )
 
         return combined_df
+
+
+# ------------------------------------- #
+# Fit result cache
+# ------------------------------------- #
+
+# Arguments which do not affect the fit result and are excluded from cache keys
+CACHE_IGNORED_ARGUMENTS = {"client", "verbose", "pbar", "callbacks"}
+
+
+class FitResultCache:
+    """On-disk cache of fit results, keyed by the content of the fit inputs.
+
+    Fit results are pickled to `cache_dir`, with file names given by an md5 hash of the fitting
+    function, its (bound) arguments, the fitting dtype/device and the PyHDX version. When the
+    total size of the cache exceeds `max_size`, least recently used results are evicted.
+    Recently used results are additionally kept in memory.
+
+    Arguments which do not affect the result (`client`, `verbose`, `pbar` and `callbacks`) are
+    not part of the key. Callbacks are therefore not called when a result is returned from the
+    cache. Calls with inputs which cannot be hashed, such as lambdas or closures, bypass the
+    cache.
+
+    Results returned from the cache are copies, such that modifying them does not affect
+    subsequent cache hits.
+
+    Args:
+        cache_dir: Directory to store fit results in.
+        max_size: Maximum total size of the cached results in bytes.
+        maxsize_memory: Maximum number of results kept in memory.
+
+    Example:
+        >>> cache = FitResultCache("~/.pyhdx/fit_cache")
+        >>> result = cache(fit_gibbs_global, hdxm, guess, r1=0.5)
+        >>> cached_fit = cache.wrap(fit_gibbs_global)
+
+    """
+
+    def __init__(
+        self, cache_dir: os.PathLike, max_size: int = 2**30, maxsize_memory: int = 16
+    ) -> None:
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.max_size = max_size
+        self.maxsize_memory = maxsize_memory
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(func: Callable, *args, **kwargs) -> str:
+        """Returns the cache key for calling `func` with `args` and `kwargs`."""
+        bound = inspect.signature(func).bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = {k: v for k, v in bound.arguments.items() if k not in CACHE_IGNORED_ARGUMENTS}
+        settings = (str(cfg.fitting.dtype), str(cfg.fitting.device), __version__)
+
+        return hash_object((func, arguments, settings))
+
+    def __call__(self, func: Callable, *args, **kwargs) -> Any:
+        """Returns the result of `func(*args, **kwargs)`, from the cache if available."""
+        try:
+            key = self.key(func, *args, **kwargs)
+        except TypeError:  # unhashable inputs
+            return func(*args, **kwargs)
+        result = self.get(key)
+        if result is None:
+            result = func(*args, **kwargs)
+            self.put(key, result)
+
+        return result
+
+    def wrap(self, func: Callable) -> Callable:
+        """Returns a version of `func` which uses this cache."""
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return self(func, *args, **kwargs)
+
+        return wrapper
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns a copy of the cached result for `key`, or `None` if not available."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return pickle.loads(data)
+
+        path = self.cache_dir / f"{key}.pkl"
+        try:
+            data = path.read_bytes()
+            result = pickle.loads(data)
+            os.utime(path)  # mark as recently used
+        except (OSError, EOFError, pickle.UnpicklingError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self._remember(key, data)
+
+        return result
+
+    def put(self, key: str, result: Any) -> None:
+        """Stores `result` under `key` and evicts least recently used results if needed."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path = self.cache_dir / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, self.cache_dir / f"{key}.pkl")
+
+        # results are kept in memory in pickled form, such that each hit returns a new copy
+        with self._lock:
+            self._remember(key, data)
+        self.evict()
+
+    def _remember(self, key: str, data: bytes) -> None:
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize_memory:
+            self._memory.popitem(last=False)
+
+    def _entries(self) -> list[tuple[Path, os.stat_result]]:
+        entries = []
+        for path in self.cache_dir.glob("*.pkl"):
+            try:
+                entries.append((path, path.stat()))
+            except OSError:  # removed by another process
+                pass
+
+        return entries
+
+    @property
+    def size(self) -> int:
+        """Total size of the cached results on disk in bytes."""
+        return sum(stat.st_size for _, stat in self._entries())
+
+    def evict(self) -> None:
+        """Removes least recently used results until the cache size is below `max_size`."""
+        entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+        total = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if total <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+            with self._lock:
+                self._memory.pop(path.stem, None)
+
+    def clear(self) -> None:
+        """Removes all cached results and resets hit/miss counters."""
+        for path, _ in self._entries():
+            path.unlink(missing_ok=True)
+        with self._lock:
+            self._memory.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries())
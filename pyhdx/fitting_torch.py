@@ -1,4 +1,6 @@
+import time
 from copy import deepcopy
+from typing import Union
 
 import numpy as np
 import pandas as pd
@@ -438,17 +440,200 @@ class TorchFitResultSet(object):
         return len(self.results)
 
 
+def dG_fit_tables(
+    fit_result: Union[TorchFitResult, TorchFitResultSet], name: str
+) -> dict[str, pd.DataFrame]:
+    """Generates the tables which are added to a web app source for a ΔG fit result.
+
+    Evaluating the model for the calculated D-uptake and the per-peptide mean squared errors is
+    relatively expensive, and this function can be submitted to the dask worker which did the
+    fit such that the tables are returned together with the fit result.
+
+    Args:
+        fit_result: The ΔG fit result.
+        name: Name of the fit, used as `fit_ID` in the column index of the tables.
+
+    Returns:
+        Dictionary of table name: table block for the tables 'dG', 'd_calc', 'loss' and
+        'peptide_mse'.
+
+    """
+
+    tables = {}
+
+    # Add dG values table (+ covariances etc)
+    df = fit_result.output.copy()
+    tuples = [(name, *tup) for tup in df.columns]
+    columns = pd.MultiIndex.from_tuples(tuples, names=["fit_ID", "state", "quantity"])
+    df.columns = columns
+    tables["dG"] = df
+
+    # Add calculated d-uptake values
+    df = fit_result.get_dcalc()
+
+    tuples = [(name, *tup) for tup in df.columns]
+    columns = pd.MultiIndex.from_tuples(
+        tuples,
+        names=["fit_ID", "state", "peptide_id", "quantity"],
+    )
+    df.columns = columns
+    tables["d_calc"] = df
+
+    # Add losses df
+    df = fit_result.losses.copy()
+    if df.columns.nlevels == 1:
+        tuples = [(name, "*", column) for column in df.columns]
+        columns = pd.MultiIndex.from_tuples(tuples, names=["fit_ID", "state", "loss_type"])
+    else:
+        tuples = [(name, *tup) for tup in df.columns]
+        columns = pd.MultiIndex.from_tuples(tuples, names=["fit_ID", "state", "loss_type"])
+
+    df.columns = columns
+    tables["loss"] = df
+
+    # Add MSE per peptide df
+    # current bug: convert dtypes drop column names: https://github.com/pandas-dev/pandas/issues/41435
+    # use before assigning column names
+    mse_df = fit_result.get_peptide_mse().convert_dtypes()
+    # mse_df = pd.concat(dfs.values(), keys=dfs.keys(), axis=1).convert_dtypes()
+    mse_df.index.name = "peptide_id"
+    tuples = [(name, *tup) for tup in mse_df.columns]
+    columns = pd.MultiIndex.from_tuples(tuples, names=["fit_ID", "state", "quantity"])
+    mse_df.columns = columns
+    tables["peptide_mse"] = mse_df
+
+    return tables
+
+
 class Callback(object):
-    def __call__(self, epoch, model, optimizer):
+    """Base class for callbacks called after each epoch of optimization.
+
+    Instances are additionally passed the loss terms of the epoch (mean squared error loss followed
+    by the regularization losses) as `losses`. Callbacks can stop the optimization by returning
+    `True`.
+    """
+
+    def __call__(self, epoch, model, optimizer, losses=None):
         pass
 
 
+class IntervalCallback(Callback):
+    """Base class for callbacks which act at most once per `interval` seconds.
+
+    Used by callbacks which communicate with the dask scheduler, such that fits do not make a
+    request to the scheduler every epoch.
+
+    """
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self._last_time = time.monotonic()
+
+    def _elapsed(self):
+        """Returns the time in seconds since the callback last acted and restarts the interval, or
+        `None` if the interval has not yet passed."""
+        now = time.monotonic()
+        elapsed = now - self._last_time
+        if elapsed < self.interval:
+            return None
+        self._last_time = now
+
+        return elapsed
+
+
+class CancelCallback(IntervalCallback):
+    """Stops the optimization when the dask :class:`~distributed.Event` `event_name` is set.
+
+    Used to cancel fits running on dask workers. The event is checked at most once per `interval`
+    seconds to limit the number of requests to the scheduler.
+
+    """
+
+    def __init__(self, event_name, interval=1.0):
+        super().__init__(interval=interval)
+        self.event_name = event_name
+        self._event = None
+
+    def __call__(self, epoch, model, optimizer, losses=None):
+        if self._elapsed() is None:
+            return False
+
+        if self._event is None:
+            from distributed import Event
+
+            self._event = Event(self.event_name)
+
+        return self._event.is_set()
+
+    def __getstate__(self):
+        return {"event_name": self.event_name, "interval": self.interval}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+
+class ProgressCallback(IntervalCallback):
+    """Logs the progress of the optimization as dask events under `topic`.
+
+    Messages are dictionaries with the fields 'key', 'label', 'epoch' (number of completed epochs),
+    'loss' (total loss of the last epoch) and 'epochs_per_s'. Messages are logged at most once per
+    `interval` seconds. Subscribe to the events with :meth:`distributed.Client.subscribe_topic`.
+    Messages are dropped when the fit runs outside of dask without a dask client.
+
+    """
+
+    def __init__(self, topic, key=None, label="", interval=1.0):
+        super().__init__(interval=interval)
+        self.topic = topic
+        self.key = key
+        self.label = label
+        self._last_epoch = 0
+
+    def __call__(self, epoch, model, optimizer, losses=None):
+        elapsed = self._elapsed()
+        if elapsed is None:
+            return False
+
+        msg = {
+            "key": self.key,
+            "label": self.label,
+            "epoch": epoch + 1,
+            "loss": float(sum(losses)) if losses else None,
+            "epochs_per_s": (epoch + 1 - self._last_epoch) / max(elapsed, 1e-9),
+        }
+        self._last_epoch = epoch + 1
+
+        from distributed import get_client, get_worker
+
+        try:
+            get_worker().log_event(self.topic, msg)
+        except ValueError:  # not running on a dask worker
+            try:
+                client = get_client()
+            except ValueError:  # no dask client to log the event to
+                return False
+            client.log_event(self.topic, msg)
+
+        return False
+
+    def __getstate__(self):
+        return {
+            "topic": self.topic,
+            "key": self.key,
+            "label": self.label,
+            "interval": self.interval,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+
 class CheckPoint(Callback):
     def __init__(self, epoch_step=1000):
         self.epoch_step = epoch_step
         self.model_history = {}
 
-    def __call__(self, epoch, model, optimizer):
+    def __call__(self, epoch, model, optimizer, losses=None):
         if epoch % self.epoch_step == 0:
             self.model_history[epoch] = deepcopy(model.state_dict())
 
@@ -39,6 +39,10 @@ class DummyClient(object):
     def gather(futures) -> list[Any]:
         return [future.result() for future in futures]
 
+    @staticmethod
+    def scatter(data: Any, **kwargs) -> Any:
+        return data
+
 
 def default_client(timeout="2s", **kwargs):
     """Return Dask client at scheduler adress as defined by the global config"""
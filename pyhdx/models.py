@@ -1,16 +1,19 @@
 from __future__ import annotations
 
+import hashlib
 import os
 import textwrap
 import warnings
+from concurrent.futures import Executor
+from functools import cached_property, partial
 from numbers import Number
+from pathlib import Path
 from typing import Optional, Any, Union, TYPE_CHECKING
 
 import numpy as np
 import numpy.typing as npt
 import pandas as pd
 import torch
-from hdxrate import k_int_from_sequence
 from scipy import constants
 from scipy.constants import R
 from scipy.integrate import solve_ivp
@@ -18,7 +21,8 @@ from scipy.integrate import solve_ivp
 from pyhdx.alignment import align_dataframes
 from pyhdx.fileIO import dataframe_to_file
 from pyhdx.process import verify_sequence, parse_temperature, correct_d_uptake, apply_control
-from pyhdx.support import reduce_inter, dataframe_intersection
+from pyhdx.process import KIntCache, k_int_cache  # noqa: F401
+from pyhdx.support import reduce_inter, dataframe_intersection, hash_dataframe
 from pyhdx.config import cfg
 
 if TYPE_CHECKING:
@@ -43,18 +47,6 @@ class Coverage:
 
     """
 
-    X: np.ndarray
-    """
-    Np x Nr matrix (peptides x residues). Values are 1 where residue j is in peptide i.
-    """
-
-    Z: np.ndarray
-    """
-    Np x Nr matrix (peptides x residues). Values are 1/(ex_residues) where residue j 
-    is in peptide i.
-    """
-    # todo account for prolines: so that rows sum to 1 is currently not true
-
     def __init__(
         self,
         data: pd.DataFrame,
@@ -87,18 +79,38 @@ class Coverage:
         self.interval = (np.min(self.data["_start"]), np.max(self.data["_stop"]))
         self.protein = protein_df
 
+    @cached_property
+    def X(self) -> np.ndarray:
+        """
+        Np x Nr matrix (peptides x residues). Values are 1 where residue j is in peptide i.
+        """
+        return self._get_X(slice(None))
+
+    @cached_property
+    def Z(self) -> np.ndarray:
+        """
+        Np x Nr matrix (peptides x residues). Values are 1/(ex_residues) where residue j
+        is in peptide i.
+        """
+        # todo account for prolines: so that rows sum to 1 is currently not true
+        return self._get_Z(self.X, slice(None))
+
+    def _get_X(self, rows: slice) -> np.ndarray:
+        """Returns the rows `rows` of the X matrix."""
         # matrix dimensions N_peptides N_residues, dtype for PyTorch compatibility
+        # start, stop are already corrected for drop_first parameter
+        start = self.data["_start"].to_numpy()[rows, np.newaxis]
+        stop = self.data["_stop"].to_numpy()[rows, np.newaxis]
+        r_number = self.r_number.to_numpy()[np.newaxis, :]
+
+        return ((r_number >= start) & (r_number < stop)).astype(int)
+
+    def _get_Z(self, X: np.ndarray, rows: slice) -> np.ndarray:
+        """Returns the rows `rows` of the Z matrix, given the same rows `X` of the X matrix."""
         _exchanges = self["exchanges"]  # Array only on covered part
-        self.X = np.zeros((len(self.data), self.interval[1] - self.interval[0]), dtype=int)
-        self.Z = np.zeros_like(self.X, dtype=float)
-        for row, idx in enumerate(self.data.index):
-            # start, end are already corrected for drop_first parameter
-            start, end = self.data.loc[idx, "_start"], self.data.loc[idx, "_stop"]
-            i0, i1 = self.r_number.get_loc(start), self.r_number.get_loc(end - 1)
-            # i0, i1 = np.searchsorted(self.r_number, (entry['start'], entry['end']))
-            self.X[row][i0 : i1 + 1] = 1
-            self.Z[row][i0 : i1 + 1] = _exchanges.iloc[i0 : i1 + 1]
-        self.Z = self.Z / self.data["ex_residues"].to_numpy()[:, np.newaxis]
+        Z = X * _exchanges.to_numpy(dtype=float)[np.newaxis, :]
+
+        return Z / self.data["ex_residues"].to_numpy()[rows, np.newaxis]
 
     def __len__(self) -> int:
         return len(self.data)
@@ -159,12 +171,12 @@ class Coverage:
     @property
     def Np(self) -> int:
         """Number of peptides."""
-        return self.X.shape[0]
+        return len(self.data)
 
     @property
     def Nr(self) -> int:
         """Total number of residues spanned by the peptides."""
-        return self.X.shape[1]
+        return int(self.interval[1] - self.interval[0])
 
     # TODO homogenize this and next property
     @property
@@ -243,6 +255,8 @@ class HDXMeasurement:
 
     def __init__(self, data: pd.DataFrame, **metadata: Any):
         self.metadata = metadata
+        # <name>: memory-mapped array, see `to_memmap`
+        self._memmaps: dict[str, np.ndarray] = {}
         assert len(data["state"].unique()) == 1
         self.state: str = str(data["state"].iloc[0])
         self.timepoints: np.ndarray = np.sort(np.unique(data["exposure"]))
@@ -266,9 +280,7 @@ class HDXMeasurement:
 
         if self.temperature and self.pH:
             # list(self.protein["sequence"])
-            k_int_array = k_int_from_sequence(
-                self.coverage.protein["sequence"], self.temperature, self.pH
-            )
+            k_int_array = k_int_cache(self.coverage.protein["sequence"], self.temperature, self.pH)
 
             # k_int = self.coverage.protein.get_k_int(self.temperature, self.pH)
             self.coverage.protein["k_int"] = k_int_array
@@ -286,6 +298,17 @@ class HDXMeasurement:
             .sort_index(axis=1, level=0, sort_remaining=False)
         )
 
+    def __reduce__(self) -> tuple:
+        """Pickle only the peptide table and metadata.
+
+        Coverage, timepoint objects and wide-format data are derived from these when unpickling,
+        which keeps payloads small when sending measurements to dask workers. Memory-mapped
+        coverage matrices are not retained.
+        """
+        # the row index is restored from the 'index' column; 'peptide_id' is recomputed
+        data = self.data.drop(columns="peptide_id").set_index("index")
+        return _rebuild_hdxm, (data, self.metadata)
+
     @classmethod
     def from_dataset(cls, dataset: HDXDataSet, state: str | int, drop_first=cfg.analysis.drop_first, **metadata) -> HDXMeasurement:
         """Create an HDXMeasurement object from a HDXDataSet object.
@@ -311,8 +334,10 @@ class HDXMeasurement:
         )
 
         # take globally defined metadata and update with state specific metadata
-        spec_metadata = dataset.hdx_spec.get("metadata", {})
-        spec_metadata.update(dataset.hdx_spec["states"][state]["metadata"])
+        spec_metadata = {
+            **dataset.hdx_spec.get("metadata", {}),
+            **dataset.hdx_spec["states"][state]["metadata"],
+        }
 
         metadata = {**spec_metadata, **metadata}
 
@@ -427,6 +452,9 @@ class HDXMeasurement:
 
         Shape of the returned DataFrame is `(Np, Nt)`.
         """
+        if "rfu" in self._memmaps:
+            return self._memmap_frame("rfu")
+
         df = pd.concat([v.rfu_peptides for v in self], keys=self.timepoints, axis=1)
         df.columns.name = "exposure"
         return df
@@ -437,10 +465,35 @@ class HDXMeasurement:
 
         Shape of the returned DataFrame is `(Np, Nt)`.
         """
+        if "d_exp" in self._memmaps:
+            return self._memmap_frame("d_exp")
+
         df = pd.concat([v.d_exp for v in self], keys=self.timepoints, axis=1)
         df.columns.name = "exposure"
         return df
 
+    @property
+    def k_int(self) -> pd.Series:
+        """Intrinsic rates of exchange (s⁻¹) of the residues covered by peptides.
+
+        Length of the returned Series is `Nr`.
+        """
+        if "k_int" in self._memmaps:
+            return pd.Series(
+                self._memmaps["k_int"], index=self.coverage.r_number, name="k_int", copy=False
+            )
+
+        return self.coverage["k_int"]
+
+    def _memmap_frame(self, name: str) -> pd.DataFrame:
+        """Returns a memory-mapped `(Np, Nt)` array as DataFrame, without copying."""
+        return pd.DataFrame(
+            self._memmaps[name],
+            index=self.peptides[0].data.index,
+            columns=pd.Index(self.timepoints, name="exposure"),
+            copy=False,
+        )
+
     # todo check shapes of k_int and timepoints, compared to their shapes in hdxmeasurementset
     def get_tensors(
         self, exchanges: bool = False, dtype: Optional[torch.dtype] = cfg.TORCH_DTYPE
@@ -488,7 +541,7 @@ class HDXMeasurement:
             ),
             "X": torch.tensor(self.coverage.X[:, bools], dtype=dtype, device=device),
             "k_int": torch.tensor(
-                self.coverage["k_int"].to_numpy()[bools], dtype=dtype, device=device
+                self.k_int.to_numpy()[bools], dtype=dtype, device=device
             ).unsqueeze(-1),
             "timepoints": torch.tensor(self.timepoints, dtype=dtype, device=device).unsqueeze(0),
             "d_exp": torch.tensor(self.d_exp.to_numpy(), dtype=dtype, device=device),
@@ -534,6 +587,97 @@ class HDXMeasurement:
 
         return deltaG
 
+    def to_memmap(self, cache_dir: os.PathLike, chunk_size: int = 1024) -> Path:
+        """Move the numeric arrays of this measurement to memory-mapped `.npy` files.
+
+        The X and Z coverage matrices are written to disk in chunks of peptides, without creating
+        the full matrices in memory, and are shared by the coverage and all timepoints. D-uptake,
+        RFU, intrinsic rates and timepoints are also replaced by read-only memory maps, such that
+        pages are loaded from disk on demand. The peptide tables (`data` and the timepoints' `data`)
+        remain in memory.
+
+        Args:
+            cache_dir: Directory to store the `.npy` files. Files are written to a subdirectory
+                named by a hash of the measurement data, temperature, pH, and the protein sequence
+                and terminal residue numbers, and are reused if present.
+            chunk_size: Number of peptides (rows) of the coverage matrices written at once.
+
+        Returns:
+            Path of the subdirectory with `.npy` files.
+
+        """
+
+        protein = self.coverage.protein
+        key_str = "|".join(
+            [
+                hash_dataframe(self.data, method="md5"),
+                repr(self.temperature),
+                repr(self.pH),
+                str(protein.index.min()),
+                str(protein.index.max()),
+                "".join(protein["sequence"]),
+            ]
+        )
+        directory = Path(cache_dir) / f"hdxm_{hashlib.md5(key_str.encode()).hexdigest()}"
+        directory.mkdir(parents=True, exist_ok=True)
+
+        if not all((directory / f"{name}.npy").exists() for name in ["X", "Z"]):
+            self._write_coverage(directory, chunk_size)
+
+        arrays = {
+            "d_exp": lambda: self.d_exp.to_numpy(),
+            "rfu": lambda: self.rfu_peptides.to_numpy(),
+            "timepoints": lambda: np.asarray(self.timepoints),
+        }
+        if "k_int" in protein:
+            arrays["k_int"] = lambda: self.coverage["k_int"].to_numpy()
+
+        for name, get_array in arrays.items():
+            file_path = directory / f"{name}.npy"
+            if not file_path.exists():
+                tmp_path = directory / f"{name}.{os.getpid()}.tmp.npy"
+                np.save(tmp_path, get_array())
+                os.replace(tmp_path, file_path)
+
+        memmaps = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in ["X", "Z", *arrays]
+        }
+        self._memmaps = {name: memmaps[name] for name in arrays}
+        self.timepoints = memmaps["timepoints"]
+
+        for coverage in [*self.peptides, self.coverage]:
+            if self._same_layout(coverage):
+                coverage.X, coverage.Z = memmaps["X"], memmaps["Z"]
+        for i, timepoint in enumerate(self.peptides):
+            timepoint._memmaps = {name: memmaps[name][:, i] for name in ["d_exp", "rfu"]}
+
+        return directory
+
+    def _write_coverage(self, directory: Path, chunk_size: int) -> None:
+        """Writes the X and Z coverage matrices to `directory` in chunks of `chunk_size` rows."""
+        shape = (self.coverage.Np, self.coverage.Nr)
+        tmp_paths = {name: directory / f"{name}.{os.getpid()}.tmp.npy" for name in ["X", "Z"]}
+        X = np.lib.format.open_memmap(tmp_paths["X"], mode="w+", dtype=int, shape=shape)
+        Z = np.lib.format.open_memmap(tmp_paths["Z"], mode="w+", dtype=float, shape=shape)
+        for i in range(0, shape[0], chunk_size):
+            rows = slice(i, i + chunk_size)
+            X_rows = self.coverage._get_X(rows)
+            X[rows] = X_rows
+            Z[rows] = self.coverage._get_Z(X_rows, rows)
+        X.flush()
+        Z.flush()
+        del X, Z
+
+        for name, tmp_path in tmp_paths.items():
+            os.replace(tmp_path, directory / f"{name}.npy")
+
+    def _same_layout(self, coverage: Coverage) -> bool:
+        """Returns `True` if `coverage` has the same coverage matrices as `self.coverage`."""
+        columns = ["_start", "_stop", "ex_residues"]
+        return coverage.interval == self.coverage.interval and np.array_equal(
+            coverage.data[columns].to_numpy(), self.coverage.data[columns].to_numpy()
+        )
+
     def to_file(
         self,
         file_path: os.PathLike,
@@ -567,6 +711,10 @@ class HDXMeasurement:
         )
 
 
+def _rebuild_hdxm(data: pd.DataFrame, metadata: dict[str, Any]) -> HDXMeasurement:
+    return HDXMeasurement(data, **metadata)
+
+
 class HDXTimepoint(Coverage):
     """Class with subset of peptides corresponding to only one state and exposure.
 
@@ -590,15 +738,23 @@ class HDXTimepoint(Coverage):
 
         self.state = self.data["state"][0]
         self.exposure = self.data["exposure"][0]
+        # <name>: memory-mapped array, set by `HDXMeasurement.to_memmap`
+        self._memmaps: dict[str, np.ndarray] = {}
 
     @property
     def rfu_peptides(self) -> pd.Series:
         """Relative fractional uptake per peptide"""
+        if "rfu" in self._memmaps:
+            return pd.Series(self._memmaps["rfu"], index=self.data.index, name="rfu", copy=False)
         return self.data["rfu"]
 
     @property
     def d_exp(self) -> pd.Series:
         """Experimentally measured D-values (corrected)"""
+        if "d_exp" in self._memmaps:
+            return pd.Series(
+                self._memmaps["d_exp"], index=self.data.index, name="uptake_corrected", copy=False
+            )
         return self.data["uptake_corrected"]
 
     @property
@@ -800,6 +956,14 @@ class HDXMeasurementSet:
         self.aligned_indices = None
         self.aligned_dataframes = None
 
+    def __reduce__(self) -> tuple:
+        """Pickle only the measurements and alignment; derived arrays are recomputed."""
+        state = {
+            "aligned_indices": self.aligned_indices,
+            "aligned_dataframes": self.aligned_dataframes,
+        }
+        return HDXMeasurementSet, (self.hdxm_list,), state
+
     def __iter__(self):
         return self.hdxm_list.__iter__()
 
@@ -807,13 +971,44 @@ class HDXMeasurementSet:
         return self.hdxm_list.__getitem__(item)
 
     @classmethod
-    def from_dataset(self, dataset: HDXDataSet, **metadata) -> HDXMeasurementSet:
-        hdxm_list = [
-            HDXMeasurement.from_dataset(dataset, state, **metadata) for state in dataset.states
-        ]
+    def from_dataset(
+        self, dataset: HDXDataSet, executor: Optional[Executor] = None, **metadata
+    ) -> HDXMeasurementSet:
+        """Create an HDXMeasurementSet object from all states in a HDXDataSet object.
+
+        Args:
+            dataset: HDXDataSet object
+            executor: Optional [concurrent.futures.Executor][] (threads or processes) used to
+                load states concurrently. The order of states is retained.
+            **metadata: Additional metadata passed to each HDXMeasurement.
+
+        Returns:
+            HDXMeasurementSet object.
+
+        """
+
+        load_state = partial(HDXMeasurement.from_dataset, dataset, **metadata)
+        if executor is None:
+            hdxm_list = [load_state(state) for state in dataset.states]
+        else:
+            hdxm_list = list(executor.map(load_state, dataset.states))
 
         return HDXMeasurementSet(hdxm_list)
 
+    def to_memmap(self, cache_dir: os.PathLike) -> list[Path]:
+        """Move numeric arrays of all measurements to memory-mapped `.npy` files.
+
+        See [HDXMeasurement.to_memmap][models.HDXMeasurement.to_memmap].
+
+        Args:
+            cache_dir: Directory to store the `.npy` files.
+
+        Returns:
+            List of paths of the subdirectories with `.npy` files, one per measurement.
+
+        """
+        return [hdxm.to_memmap(cache_dir) for hdxm in self.hdxm_list]
+
     def get(self, name: str) -> HDXMeasurement:
         """
         Get HDXMeasurement object by name.
@@ -1046,6 +1241,63 @@ def contiguous_regions(condition):
     return idx
 
 
+def three_state_populations(
+    timepoints: npt.ArrayLike,
+    k_open: npt.ArrayLike,
+    k_close: npt.ArrayLike,
+    k_int: npt.ArrayLike,
+) -> np.ndarray:
+    """Closed-form populations of the three-state (closed, open, exchanged) Linderstrøm-Lang model.
+
+    The closed/open block of the rate matrix is solved by its analytical eigendecomposition,
+    such that populations are obtained for all residues (and peptides) and timepoints at once.
+    Populations at t=0 are the closed/open equilibrium populations and zero exchanged.
+
+    Args:
+        timepoints: Shape `(t,)` array with timepoints to sample.
+        k_open: Array of opening rates.
+        k_close: Array of closing rates.
+        k_int: Array of intrinsic exchange rates.
+
+    Returns:
+        Array of shape `(t, *k)` + `(3,)` with closed, open and exchanged populations, where `k`
+        is the broadcast shape of `k_open`, `k_close` and `k_int`.
+    """
+
+    k_open, k_close, k_int = np.broadcast_arrays(
+        *(np.asarray(k, dtype=float) for k in [k_open, k_close, k_int])
+    )
+    timepoints = np.asarray(timepoints, dtype=float).reshape((-1,) + (1,) * k_open.ndim)
+
+    k_tot = k_open + k_close
+    x0 = np.stack([k_close / k_tot, k_open / k_tot])  # (closed, open) populations at t=0
+    v = np.stack([np.zeros_like(k_tot), -k_int * k_open / k_tot])  # rate matrix applied to x0
+
+    # eigenvalues of the closed/open block; trace and determinant
+    trace = -(k_tot + k_int)
+    det = k_open * k_int
+    root = np.sqrt(np.clip(trace**2 - 4 * det, 0.0, None))
+    lambda_fast = 0.5 * (trace - root)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # computed from the determinant to prevent cancellation errors
+        lambda_slow = np.where(lambda_fast != 0.0, det / lambda_fast, 0.0)
+        degenerate = np.isclose(lambda_fast, lambda_slow, rtol=1e-12, atol=0.0)
+        denominator = np.where(degenerate, 1.0, lambda_slow - lambda_fast)
+
+        e_slow = np.exp(lambda_slow * timepoints)[:, np.newaxis]
+        e_fast = np.exp(lambda_fast * timepoints)[:, np.newaxis]
+
+        distinct = (e_slow * (v - lambda_fast * x0) - e_fast * (v - lambda_slow * x0)) / denominator
+        repeated = e_slow * (x0 + timepoints[:, np.newaxis] * (v - lambda_slow * x0))
+
+    closed_open = np.where(degenerate, repeated, distinct)
+    exchanged = 1 - closed_open.sum(axis=1)
+
+    populations = np.concatenate([closed_open, exchanged[:, np.newaxis]], axis=1)
+
+    return np.moveaxis(populations, 1, -1)
+
+
 class PeptideUptakeModel:
     """Model D-uptake in a single peptide.
 
@@ -1065,7 +1317,7 @@ class PeptideUptakeModel:
         self.temperature = temperature
         self.pH = pH
         padded_sequence = ["X"] + sequence + ["X"]
-        k_int = k_int_from_sequence(padded_sequence, temperature, pH)
+        k_int = k_int_cache(padded_sequence, temperature, pH)
         self.k_int: np.array = k_int[2:-1]
 
     def eval_analytical(
@@ -1090,6 +1342,26 @@ class PeptideUptakeModel:
 
         return D_obs
 
+    def eval_populations(
+        self, timepoints: np.ndarray, k_open: np.ndarray, k_close: np.ndarray
+    ) -> np.ndarray:
+        """Evaluate closed, open and exchanged populations for all amino acids at once.
+
+        Exact solution of the three-state model, equal to the result of
+        [eval_single_numerical][models.PeptideUptakeModel.eval_single_numerical] for each amino
+        acid. Opening and closing rates can have additional leading dimensions (ie peptides).
+
+        Args:
+            timepoints: Shape `(t,)` array with timepoints to sample.
+            k_open: Shape `(..., k)` array with opening rates.
+            k_close: Shape `(..., k)` array with closing rates.
+
+        Returns:
+            Shape `(t, ..., k, 3)` array with closed, open and exchanged populations.
+        """
+
+        return three_state_populations(timepoints, k_open, k_close, self.k_int)
+
     def eval_single_numerical(
         self,
         aa_index: int,
@@ -1,14 +1,131 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import threading
 import warnings
-from typing import Optional, Literal, Union
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Literal, Union, Iterable
 
 import pandas as pd
 import numpy as np
+from hdxrate import k_int_from_sequence
 
+from pyhdx.config import cfg
 from pyhdx.support import convert_time, dataframe_intersection
 
 
+class KIntCache:
+    """Process-wide cache of intrinsic exchange rates.
+
+    Intrinsic exchange rates are calculated with `hdxrate.k_int_from_sequence` and stored in an
+    in-memory LRU cache, keyed by a hash of the sequence together with temperature and pH.
+    Optionally, rates are also stored as `.npy` files in `cache_dir` such that they persist
+    between sessions.
+
+    Args:
+        maxsize: Maximum number of k_int arrays kept in memory.
+        cache_dir: Optional directory for the on-disk cache. If `None`, the directory set by
+            `analysis.k_int_cache_dir` in the PyHDX config is used, if any.
+
+    """
+
+    def __init__(self, maxsize: int = 256, cache_dir: Optional[os.PathLike] = None) -> None:
+        self.maxsize = maxsize
+        self._cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(sequence: Iterable[str], temperature: float, pH: float) -> str:
+        """Returns the cache key for a sequence, temperature and pH."""
+        sequence_str = "".join(sequence)
+        key_str = f"{sequence_str}|{float(temperature)!r}|{float(pH)!r}"
+
+        return hashlib.sha256(key_str.encode()).hexdigest()
+
+    def __call__(self, sequence: Iterable[str], temperature: float, pH: float) -> np.ndarray:
+        """Returns intrinsic exchange rates for the sequence at the given temperature and pH.
+
+        Args:
+            sequence: Amino acid sequence as string or iterable of one-letter codes.
+            temperature: Temperature of the H/D exchange reaction in Kelvin.
+            pH: pH of the H/D exchange reaction.
+
+        Returns:
+            Array of intrinsic exchange rates. The returned array is a copy and can be modified.
+        """
+        sequence = list(sequence)
+        key = self.key(sequence, temperature, pH)
+
+        with self._lock:
+            k_int = self._cache.get(key)
+            if k_int is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return k_int.copy()
+
+        k_int = self._load(key)
+        if k_int is None:
+            k_int = np.asarray(k_int_from_sequence(sequence, temperature, pH), dtype=float)
+            self._save(key, k_int)
+
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = k_int
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+        return k_int.copy()
+
+    @property
+    def cache_dir(self) -> Optional[Path]:
+        """Directory of the on-disk cache, or `None` if rates are only cached in memory."""
+        if self._cache_dir is not None:
+            return self._cache_dir
+
+        return cfg.k_int_cache_dir
+
+    @cache_dir.setter
+    def cache_dir(self, value: Optional[os.PathLike]) -> None:
+        self._cache_dir = Path(value) if value is not None else None
+
+    def _load(self, key: str) -> Optional[np.ndarray]:
+        cache_dir = self.cache_dir
+        if cache_dir is None:
+            return None
+        try:
+            return np.load(cache_dir / f"{key}.npy")
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, key: str, k_int: np.ndarray) -> None:
+        cache_dir = self.cache_dir
+        if cache_dir is None:
+            return
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_dir / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp.npy"
+        np.save(tmp_path, k_int)
+        os.replace(tmp_path, cache_dir / f"{key}.npy")
+
+    def clear(self) -> None:
+        """Clears the in-memory cache and resets hit/miss counters."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+k_int_cache = KIntCache()
+
+
 def parse_temperature(value: float, unit: Literal["Celsius", "C", "Kelvin", "K"]):
     temperature_offsets = {"c": 273.15, "celsius": 273.15, "k": 0, "kelvin": 0}
 
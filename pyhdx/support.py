@@ -3,10 +3,11 @@ from __future__ import annotations
 import contextlib
 import hashlib
 import itertools
+import os
 import re
 import warnings
 from collections import OrderedDict
-from functools import wraps, reduce
+from functools import partial, wraps, reduce
 from io import StringIO
 from itertools import count, groupby
 from pathlib import Path
@@ -15,12 +16,74 @@ from typing import Iterable, Mapping, Any, Literal, Union, TypeVar
 import numpy as np
 import numpy.typing as npt
 import pandas as pd
-import typer
-from skimage.filters import threshold_multiotsu
+from pandas.api.types import is_numeric_dtype
 
 from pyhdx.config import cfg
 
 
+def _intersection_keys(dataframes: list[pd.DataFrame], by: list[str]) -> list[np.ndarray]:
+    """Returns one int64 key per row for each dataframe, such that rows with equal values in the
+    `by` columns have equal keys across all dataframes.
+
+    A pair of integer columns (typically peptide 'start', 'stop') is packed into a single int64
+    key without hashing. Other column combinations are factorized jointly.
+    """
+
+    columns = [[df[col].to_numpy() for col in by] for df in dataframes]
+    integer = all(arr.dtype.kind in "iu" for cols in columns for arr in cols)
+
+    if integer and len(by) == 1:
+        return [cols[0].astype(np.int64, copy=False) for cols in columns]
+    elif integer and len(by) == 2:
+        # first column in the high 32 bits, second column offset to be non-negative in the low bits
+        return [
+            cols[0].astype(np.int64) * 2**32 + (cols[1].astype(np.int64) + 2**31)
+            for cols in columns
+        ]
+
+    combined = pd.concat([df[by] for df in dataframes], ignore_index=True)
+    codes, _ = pd.MultiIndex.from_frame(combined).factorize()
+    splits = np.cumsum([len(df) for df in dataframes])[:-1]
+
+    return np.split(codes.astype(np.int64), splits)
+
+
+def intersection_indexers(
+    dataframes: list[pd.DataFrame],
+    by: Union[list, str],
+) -> list[np.ndarray]:
+    """Return positional indexers which select the intersection of rows of selected columns.
+
+    The intersecting keys are ordered as they first appear in the first dataframe. For each
+    dataframe, the indexer selects all rows of each intersecting key in this order, keeping the
+    original relative order of rows with duplicate keys.
+
+    Args:
+        dataframes: List of dataframes to intersect
+        by: Column name or list of column names to intersect on.
+
+    Returns:
+        List of integer arrays, one per dataframe, to use with `df.iloc`.
+
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    keys = _intersection_keys(dataframes, by)
+
+    common = pd.unique(keys[0])
+    for other in keys[1:]:
+        common = common[np.isin(common, other)]
+
+    common_index = pd.Index(common)
+    indexers = []
+    for k in keys:
+        rank = common_index.get_indexer(k)
+        selected = np.flatnonzero(rank >= 0)
+        order = np.argsort(rank[selected], kind="stable")
+        indexers.append(selected[order])
+
+    return indexers
+
+
 def dataframe_intersection(
     dataframes: list[pd.DataFrame],
     by: Union[list, str],
@@ -37,14 +100,128 @@ def dataframe_intersection(
         List of dataframes with intersected rows
 
     """
-    set_index = [d.set_index(by) for d in dataframes]
-    index_intersection = reduce(pd.Index.intersection, (d.index for d in set_index))
-    intersected = [df.loc[index_intersection] for df in set_index]
+    by_list = [by] if isinstance(by, str) else list(by)
+    indexers = intersection_indexers(dataframes, by_list)
+
+    intersected = []
+    for df, indexer in zip(dataframes, indexers):
+        selected = df.iloc[indexer]
+        if reset_index:
+            columns = by_list + [col for col in df.columns if col not in by_list]
+            intersected.append(selected[columns].reset_index(drop=True))
+        else:
+            intersected.append(selected.set_index(by))
+
+    return intersected
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Selects points of a curve with the Largest-Triangle-Three-Buckets algorithm.
+
+    The first and last points are always selected. The other points are divided into `n_out` - 2
+    buckets, from each of which the point spanning the largest triangle with the previously
+    selected point and the average of the next bucket is selected.
+
+    Args:
+        x: Sorted x values of the curve.
+        y: y values of the curve.
+        n_out: Number of points to select.
+
+    Returns:
+        Sorted indices of the selected points.
+
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indices = np.empty(n_out, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[stop:next_stop].mean()
+        avg_y = y[stop:next_stop].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a])
+        )
+        a = start + np.argmax(area)
+        indices[i + 1] = a
+
+    return indices
 
-    if reset_index:
-        return [df.reset_index() for df in intersected]
-    else:
-        return intersected
+
+def minmax_indices(y: np.ndarray, n_bins: int) -> np.ndarray:
+    """Selects the first, last, and the minimum and maximum points of `n_bins` equal-sized bins.
+
+    Args:
+        y: y values of the curve.
+        n_bins: Number of bins.
+
+    Returns:
+        Sorted indices of the selected points.
+
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if 2 * n_bins + 2 >= n or n_bins < 1:
+        return np.arange(n)
+
+    size = int(np.ceil(n / n_bins))
+    padded = np.full(size * int(np.ceil(n / size)), np.nan)
+    padded[:n] = y
+    binned = padded.reshape(-1, size)
+    offset = np.arange(len(binned)) * size
+
+    minima = offset + np.nanargmin(binned, axis=1)
+    maxima = offset + np.nanargmax(binned, axis=1)
+
+    return np.unique(np.concatenate([[0, n - 1], minima, maxima]))
+
+
+def decimate_dataframe(
+    df: pd.DataFrame, n: int, method: Literal["lttb", "minmax"] = "minmax"
+) -> pd.DataFrame:
+    """Reduces the number of rows of a dataframe of curves for plotting.
+
+    Points are selected for each column separately with the index as x values, and the union
+    of the selected rows is returned. Rows with only NaN values are dropped.
+
+    Args:
+        df: Dataframe with sorted (numerical) index.
+        n: Number of points (lttb) or bins (minmax) to select per column.
+        method: Either 'lttb' (Largest-Triangle-Three-Buckets) or 'minmax' (minimum and maximum
+            per bin).
+
+    Returns:
+        Decimated dataframe.
+
+    """
+    if method not in ["lttb", "minmax"]:
+        raise ValueError(f"Invalid decimation method {method!r}, options are 'lttb' or 'minmax'")
+
+    df = df.dropna(how="all")
+    if len(df) <= n:
+        return df
+
+    x = df.index.to_numpy(dtype=float) if is_numeric_dtype(df.index) else np.arange(len(df))
+    selected = []
+    for i in range(df.shape[1]):
+        y = df.iloc[:, i].to_numpy(dtype=float)
+        (valid,) = np.nonzero(~np.isnan(y))
+        if method == "lttb":
+            idx = lttb_indices(x[valid], y[valid], n)
+        else:
+            idx = minmax_indices(y[valid], n)
+        selected.append(valid[idx])
+
+    return df.iloc[np.unique(np.concatenate(selected))]
 
 
 A = TypeVar("A", npt.ArrayLike, pd.Series, pd.DataFrame)
@@ -74,7 +251,7 @@ def make_tuple(item):
 def hash_dataframe(df, method="builtin"):
     if method == "builtin":
         tup = (
-            *pd.util.hash_pandas_object(df, index=True).values,
+            hash(pd.util.hash_pandas_object(df, index=True).values.tobytes()),
             *df.columns,
             *df.columns.names,
             df.index.name,
@@ -83,15 +260,13 @@ def hash_dataframe(df, method="builtin"):
         return hash(tup)
 
     elif method == "md5":
-        pd_values = list(pd.util.hash_pandas_object(df, index=True).values)
         if isinstance(df.columns, pd.MultiIndex):
             columns = [name for cols in df.columns for name in cols]
         else:
             columns = list(df.columns)
 
-        all_vals = pd_values + columns + list(df.index.names) + list(df.columns.names)
-        h = hashlib.md5()
-        for val in all_vals:
+        h = hashlib.md5(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        for val in columns + list(df.index.names) + list(df.columns.names):
             h.update(str(val).encode("UTF-8"))
 
         return h.digest().hex()
@@ -101,7 +276,7 @@ def hash_dataframe(df, method="builtin"):
 
 
 def hash_array(array, method="builtin"):
-    if method == "buitin":
+    if method == "builtin":
         return hash(array.data.tobytes())
     elif method == "md5":
         h = hashlib.md5(array.data.tobytes())
@@ -110,6 +285,75 @@ def hash_array(array, method="builtin"):
         raise ValueError(f"Invalid method {method!r}, must be 'builtin' or 'md5'")
 
 
+def hash_object(obj: Any) -> str:
+    """
+    Returns a stable md5 hash of (nested) fit inputs.
+
+    Supported are numbers, strings, paths, numpy arrays, pandas objects, torch tensors, (nested)
+    lists, tuples and dicts, functions and `functools.partial` objects, and `HDXMeasurement` and
+    `HDXMeasurementSet` objects, which are hashed by their peptide tables and metadata. Functions
+    are hashed by their qualified name, therefore lambdas and closures are not supported.
+
+    Args:
+        obj: Object to hash.
+
+    Returns:
+        Hexadecimal md5 digest.
+
+    Raises:
+        TypeError: If `obj` is or contains an object of an unsupported type.
+
+    """
+    h = hashlib.md5()
+    _update_hash(h, obj)
+
+    return h.hexdigest()
+
+
+def _update_hash(h, obj: Any) -> None:
+    h.update(type(obj).__name__.encode("UTF-8"))
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes, np.generic)):
+        h.update(repr(obj).encode("UTF-8"))
+    elif isinstance(obj, np.ndarray):
+        h.update(f"{obj.dtype.str}|{obj.shape}".encode("UTF-8"))
+        if obj.dtype == object:
+            _update_hash(h, obj.tolist())
+        else:
+            h.update(np.ascontiguousarray(obj).data)
+    elif isinstance(obj, pd.DataFrame):
+        h.update(hash_dataframe(obj, method="md5").encode("UTF-8"))
+        h.update(str(list(obj.dtypes)).encode("UTF-8"))
+    elif isinstance(obj, pd.Series):
+        _update_hash(h, obj.to_frame())
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            _update_hash(h, item)
+    elif isinstance(obj, dict):
+        for key in sorted(obj, key=repr):
+            _update_hash(h, key)
+            _update_hash(h, obj[key])
+    elif hasattr(obj, "detach") and hasattr(obj, "numpy"):  # torch tensors
+        _update_hash(h, obj.detach().cpu().numpy())
+    elif isinstance(obj, os.PathLike):
+        h.update(os.fspath(obj).encode("UTF-8"))
+    elif isinstance(obj, partial):
+        _update_hash(h, (obj.func, obj.args, obj.keywords))
+    elif callable(obj) and hasattr(obj, "__qualname__"):
+        # lambdas and closures are not identified by their name
+        if "<lambda>" in obj.__qualname__ or getattr(obj, "__closure__", None) is not None:
+            raise TypeError(f"Cannot hash lambda or closure {obj.__qualname__!r}")
+        h.update(f"{obj.__module__}.{obj.__qualname__}".encode("UTF-8"))
+    else:
+        from pyhdx.models import HDXMeasurement, HDXMeasurementSet
+
+        if isinstance(obj, HDXMeasurement):
+            _update_hash(h, (obj.data, obj.metadata))
+        elif isinstance(obj, HDXMeasurementSet):
+            _update_hash(h, (obj.hdxm_list, obj.aligned_indices, obj.aligned_dataframes))
+        else:
+            raise TypeError(f"Cannot hash object of type {type(obj).__name__!r}")
+
+
 def multiindex_apply_function(
     index: pd.MultiIndex,
     level: int,
@@ -714,6 +958,8 @@ def multi_otsu(*rates, classes=3):
     """
     all_rates = np.concatenate([data["rate"] for data in rates])
     thd_rates = np.log(all_rates[~np.isnan(all_rates)])
+    from skimage.filters import threshold_multiotsu
+
     thds = threshold_multiotsu(thd_rates, classes=classes)
     return tuple(np.e**thd for thd in thds)
 
@@ -808,6 +1054,8 @@ def select_config() -> None:
 
         print(s)
 
+        import typer
+
         choice = typer.prompt("Which config file to use?", type=int)
 
         if choice < 1 or choice > len(config_options):
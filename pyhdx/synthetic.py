@@ -0,0 +1,347 @@
+"""
+Generate synthetic HDX-MS datasets in DynamX state data format.
+
+Peptide D-uptake is calculated from a ΔG profile with the same forward model as
+[DeltaGFit][fitting_torch.DeltaGFit], using intrinsic exchange rates from `hdxrate`. Peptide
+uptake is summed from residue uptake with cumulative sums, such that proteins with thousands of
+residues and dozens of states can be generated without building dense coverage matrices.
+
+Example:
+
+    sequence = random_sequence(2000, rng=0)
+    dG = random_dG(len(sequence), n_states=12, rng=0)
+    df = generate_dynamx(sequence, dG, temperature=303.15, pH=8.0, rng=0)
+    df.to_csv("synthetic_dynamx.csv", index=False)
+
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Union
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from scipy.constants import R
+
+from pyhdx.process import k_int_cache
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+
+# Monoisotopic residue masses (Da)
+RESIDUE_MASS = {
+    "A": 71.03711,
+    "C": 103.00919,
+    "D": 115.02694,
+    "E": 129.04259,
+    "F": 147.06841,
+    "G": 57.02146,
+    "H": 137.05891,
+    "I": 113.08406,
+    "K": 128.09496,
+    "L": 113.08406,
+    "M": 131.04049,
+    "N": 114.04293,
+    "P": 97.05276,
+    "Q": 128.05858,
+    "R": 156.10111,
+    "S": 87.03203,
+    "T": 101.04768,
+    "V": 99.06841,
+    "W": 186.07931,
+    "Y": 163.06333,
+}
+
+WATER_MASS = 18.01056
+PROTON_MASS = 1.00728
+
+DYNAMX_COLUMNS = [
+    "Protein",
+    "Start",
+    "End",
+    "Sequence",
+    "Modification",
+    "Fragment",
+    "MaxUptake",
+    "MHP",
+    "State",
+    "Exposure",
+    "Center",
+    "Center SD",
+    "Uptake",
+    "Uptake SD",
+    "RT",
+    "RT SD",
+]
+
+# Default exposure times (minutes)
+EXPOSURES = np.array([0.0, 0.167, 0.5, 1.0, 5.0, 10.0, 100.0])
+
+RNGLike = Union[None, int, np.random.Generator]
+
+
+def random_sequence(n_residues: int, rng: RNGLike = None) -> str:
+    """Generate a random protein sequence.
+
+    Args:
+        n_residues: Number of residues in the protein.
+        rng: Seed or [numpy.random.Generator][] to use.
+
+    Returns:
+        Sequence as string of one-letter amino acid codes.
+
+    """
+
+    rng = np.random.default_rng(rng)
+    return "".join(rng.choice(list(AMINO_ACIDS), size=n_residues))
+
+
+def random_dG(
+    n_residues: int,
+    n_states: int = 1,
+    dG_range: tuple[float, float] = (10e3, 40e3),
+    smoothness: int = 10,
+    state_sd: float = 2e3,
+    rng: RNGLike = None,
+) -> np.ndarray:
+    """Generate smooth random ΔG profiles.
+
+    The profile of the first state is a moving average of random values within `dG_range`.
+    Additional states are perturbed from the first state by smooth random differences.
+
+    Args:
+        n_residues: Number of residues in the protein.
+        n_states: Number of states (profiles) to generate.
+        dG_range: Tuple of minimum and maximum ΔG values (J/mol).
+        smoothness: Width (in residues) of the moving average window.
+        state_sd: Standard deviation of the ΔG differences between states (J/mol).
+        rng: Seed or [numpy.random.Generator][] to use.
+
+    Returns:
+        Shape `(n_states, n_residues)` array of ΔG values.
+
+    """
+
+    rng = np.random.default_rng(rng)
+    window = np.ones(smoothness) / smoothness
+
+    def smooth(values: np.ndarray) -> np.ndarray:
+        padded = np.pad(values, (smoothness, smoothness), mode="reflect")
+        return np.convolve(padded, window, mode="same")[smoothness:-smoothness]
+
+    low, high = dG_range
+    base = smooth(rng.uniform(low, high, size=n_residues))
+    base = np.interp(base, (base.min(), base.max()), (low, high))
+
+    differences = [np.zeros(n_residues)]
+    for _ in range(n_states - 1):
+        diff = smooth(rng.normal(0.0, state_sd, size=n_residues))
+        differences.append(diff * state_sd / max(diff.std(), np.finfo(float).eps))
+
+    return np.clip(base + np.stack(differences), 0.0, None)
+
+
+def generate_peptides(
+    n_residues: int,
+    length_range: tuple[int, int] = (5, 20),
+    redundancy: float = 3.0,
+    rng: RNGLike = None,
+) -> pd.DataFrame:
+    """Generate a random set of unique peptides covering a protein.
+
+    Peptide lengths are drawn uniformly from `length_range` and peptide start positions uniformly
+    along the protein. The number of peptides is chosen such that the average number of peptides
+    covering each residue equals `redundancy`.
+
+    Args:
+        n_residues: Number of residues in the protein.
+        length_range: Tuple of minimum and maximum (inclusive) peptide length.
+        redundancy: Target average number of peptides per residue.
+        rng: Seed or [numpy.random.Generator][] to use.
+
+    Returns:
+        DataFrame with 'start' and 'end' (inclusive) residue numbers, sorted by start, end.
+
+    """
+
+    rng = np.random.default_rng(rng)
+    min_length, max_length = length_range
+    max_length = min(max_length, n_residues)
+    if not 1 < min_length <= max_length:
+        raise ValueError(f"Invalid peptide length range {length_range!r}")
+
+    n_peptides = max(int(round(redundancy * n_residues / (0.5 * (min_length + max_length)))), 1)
+    length = rng.integers(min_length, max_length + 1, size=n_peptides)
+    start = 1 + (rng.random(n_peptides) * (n_residues - length + 1)).astype(int)
+
+    peptides = pd.DataFrame({"start": start, "end": start + length - 1})
+
+    return peptides.drop_duplicates().sort_values(["start", "end"], ignore_index=True)
+
+
+def peptide_uptake(
+    sequence: str,
+    dG: npt.ArrayLike,
+    temperature: float,
+    pH: float,
+    peptides: pd.DataFrame,
+    timepoints: npt.ArrayLike,
+    drop_first: int = 1,
+) -> np.ndarray:
+    """Calculate D-uptake of peptides from a ΔG profile.
+
+    Residue uptake is given by `1 - exp(-k_int / (1 + P) * t)`, with protection factor `P` from ΔG,
+    as in [DeltaGFit][fitting_torch.DeltaGFit]. Prolines and the first `drop_first` residues of
+    each peptide do not contribute to peptide uptake.
+
+    Args:
+        sequence: Protein sequence.
+        dG: Shape `(..., n_residues)` array of ΔG values (J/mol).
+        temperature: Temperature of the H/D exchange reaction (K).
+        pH: pH of the H/D exchange reaction.
+        peptides: DataFrame with 'start' and 'end' (inclusive) residue numbers.
+        timepoints: Shape `(t,)` array of exposure times (s).
+        drop_first: Number of N-terminal residues per peptide which are fully back-exchanged.
+
+    Returns:
+        Shape `(..., n_peptides, t)` array of D-uptake values.
+
+    """
+
+    dG = np.asarray(dG, dtype=float)
+    timepoints = np.asarray(timepoints, dtype=float)
+    if dG.shape[-1] != len(sequence):
+        raise ValueError(
+            f"Length of ΔG profile ({dG.shape[-1]}) does not match sequence length ({len(sequence)})"
+        )
+
+    k_int = k_int_cache(sequence, temperature, pH)
+    k_int[np.isinf(k_int)] = 0.0  # N-terminal residue does not retain deuterium
+    k_obs = k_int / (1 + np.exp(dG / (R * temperature)))
+    residue_uptake = 1 - np.exp(-k_obs[..., np.newaxis] * timepoints)  # (..., n_residues, t)
+
+    # cumulative uptake with a leading zero, such that cumulative[i] is the sum over residues 1..i
+    cumulative = np.cumsum(residue_uptake, axis=-2)
+    cumulative = np.concatenate([np.zeros_like(cumulative[..., :1, :]), cumulative], axis=-2)
+
+    start = peptides["start"].to_numpy() - 1 + drop_first
+    end = peptides["end"].to_numpy()
+
+    return cumulative[..., end, :] - cumulative[..., np.minimum(start, end), :]
+
+
+def generate_dynamx(
+    sequence: str,
+    dG: npt.ArrayLike,
+    temperature: float,
+    pH: float,
+    exposures: npt.ArrayLike = EXPOSURES,
+    peptides: Optional[pd.DataFrame] = None,
+    states: Optional[list[str]] = None,
+    fd_exposure: float = 0.167,
+    back_exchange: float = 0.3,
+    back_exchange_sd: float = 0.05,
+    uptake_noise: float = 0.1,
+    drop_first: int = 1,
+    protein: str = "Synthetic",
+    rng: RNGLike = None,
+    **peptide_kwargs,
+) -> pd.DataFrame:
+    """Generate a synthetic HDX-MS peptide table in DynamX state data format.
+
+    Peptides are measured for all states and exposures, with a per-peptide back-exchange and
+    gaussian noise on the measured uptake. A 'Full deuteration control' state is added, which
+    has the maximum uptake of each peptide reduced by its back-exchange.
+
+    Args:
+        sequence: Protein sequence.
+        dG: ΔG profile of shape `(n_residues,)` or profiles of shape `(n_states, n_residues)` (J/mol).
+        temperature: Temperature of the H/D exchange reaction (K).
+        pH: pH of the H/D exchange reaction.
+        exposures: Exposure times (minutes).
+        peptides: Optional DataFrame with 'start' and 'end' residue numbers. If `None`, peptides
+            are generated with [generate_peptides][synthetic.generate_peptides].
+        states: Optional list of state names. Defaults to 'state_0', 'state_1', ...
+        fd_exposure: Exposure time of the full deuteration control (minutes).
+        back_exchange: Average fraction of back-exchange per peptide.
+        back_exchange_sd: Standard deviation of the back-exchange fraction between peptides.
+        uptake_noise: Standard deviation of the noise added to measured uptake (Da).
+        drop_first: Number of N-terminal residues per peptide which are fully back-exchanged.
+        protein: Value of the 'Protein' column.
+        rng: Seed or [numpy.random.Generator][] to use.
+        **peptide_kwargs: Additional keyword arguments passed to
+            [generate_peptides][synthetic.generate_peptides].
+
+    Returns:
+        DataFrame with DynamX state data columns.
+
+    """
+
+    rng = np.random.default_rng(rng)
+    dG = np.atleast_2d(np.asarray(dG, dtype=float))
+    exposures = np.asarray(exposures, dtype=float)
+
+    states = states or [f"state_{i}" for i in range(len(dG))]
+    if len(states) != len(dG):
+        raise ValueError(f"Number of states ({len(states)}) does not match number of ΔG profiles")
+    if "Full deuteration control" in states:
+        raise ValueError("State name 'Full deuteration control' is reserved")
+
+    if peptides is None:
+        peptides = generate_peptides(len(sequence), rng=rng, **peptide_kwargs)
+    peptides = peptides[["start", "end"]].reset_index(drop=True)
+
+    # per-peptide constant properties
+    pep_sequence = np.array([sequence[s - 1 : e] for s, e in peptides.itertuples(index=False)])
+    mass = np.array([RESIDUE_MASS.get(aa, 110.0) for aa in sequence])
+    cumulative_mass = np.concatenate([[0.0], np.cumsum(mass)])
+    mhp = (
+        cumulative_mass[peptides["end"]]
+        - cumulative_mass[peptides["start"] - 1]
+        + WATER_MASS
+        + PROTON_MASS
+    )
+    max_uptake = np.array([len(s[drop_first:].replace("P", "")) for s in pep_sequence])
+    retention_time = rng.uniform(1.0, 15.0, size=len(peptides))
+    d_fraction = 1 - np.clip(rng.normal(back_exchange, back_exchange_sd, len(peptides)), 0.0, 1.0)
+
+    uptake = peptide_uptake(sequence, dG, temperature, pH, peptides, exposures * 60, drop_first)
+    uptake = uptake * d_fraction[:, np.newaxis]  # (n_states, n_peptides, t)
+
+    fd_uptake = np.broadcast_to((max_uptake * d_fraction)[:, np.newaxis], uptake.shape[1:])
+    uptake = np.concatenate([fd_uptake[np.newaxis, ...], uptake])
+    states = ["Full deuteration control"] + list(states)
+    state_exposures = [np.array([fd_exposure])] + [exposures] * (len(states) - 1)
+
+    blocks = []
+    for state, state_uptake, state_exp in zip(states, uptake, state_exposures):
+        # peptide-major ordering, as in DynamX exports
+        n_pep, n_t = len(peptides), len(state_exp)
+        measured = state_uptake[:, :n_t] + rng.normal(0.0, uptake_noise, size=(n_pep, n_t))
+        measured[:, state_exp == 0] = 0.0
+        uptake_sd = np.where(state_exp == 0, 0.0, uptake_noise) * np.ones((n_pep, 1))
+
+        block = pd.DataFrame(
+            {
+                "Protein": protein,
+                "Start": np.repeat(peptides["start"].to_numpy(), n_t),
+                "End": np.repeat(peptides["end"].to_numpy(), n_t),
+                "Sequence": np.repeat(pep_sequence, n_t),
+                "Modification": np.nan,
+                "Fragment": np.nan,
+                "MaxUptake": np.repeat(max_uptake, n_t),
+                "MHP": np.repeat(mhp, n_t),
+                "State": state,
+                "Exposure": np.tile(state_exp, n_pep),
+                "Center": np.repeat(mhp, n_t) + measured.ravel(),
+                "Center SD": uptake_sd.ravel(),
+                "Uptake": measured.ravel(),
+                "Uptake SD": uptake_sd.ravel(),
+                "RT": np.repeat(retention_time, n_t),
+                "RT SD": 0.0,
+            },
+            columns=DYNAMX_COLUMNS,
+        )
+        blocks.append(block)
+
+    return pd.concat(blocks, ignore_index=True)
@@ -6,13 +6,18 @@ import yaml
 import re
 
 from pyhdx import VERSION_STRING
+from pyhdx.config import cfg
 from pyhdx.web.constructor import AppConstructor
 from pyhdx.web.log import logger
-from pyhdx.web.cache import MemoryCache
+from pyhdx.web.cache import default_cache
+from pyhdx.web.jobs import JobManager
 from pyhdx.web.template import GoldenElvis, ExtendedGoldenTemplate
 from pyhdx.web.theme import ExtendedGoldenDefaultTheme
 
-cache = MemoryCache(max_items=2000)
+cache = default_cache
+job_manager = JobManager(
+    max_jobs=cfg.server.get("max_jobs", 4), max_user_jobs=cfg.server.get("max_user_jobs", 2)
+)
 
 # Check for new panel releases if this is still needed
 pn.extension("mathjax")
@@ -34,7 +39,7 @@ def main_app():
 
     ctr = AppConstructor(loggers={"pyhdx": main_app.logger}, cache=cache)
 
-    ctrl = ctr.parse(yaml_dict)
+    ctrl = ctr.parse(yaml_dict, job_manager=job_manager)
 
     elvis = GoldenElvis(
         ctrl, ExtendedGoldenTemplate, ExtendedGoldenDefaultTheme, title=VERSION_STRING
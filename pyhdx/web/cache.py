@@ -1,6 +1,32 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
 import param
 import pandas as pd
 
+from pyhdx.config import cfg
+
+
+def _nbytes(value) -> int:
+    """Estimated memory usage of a cached value in bytes."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    elif isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    elif isinstance(value, np.ndarray):
+        return value.nbytes
+    else:
+        return sys.getsizeof(value)
+
 
 class Cache(param.Parameterized):
     def __getitem__(self, item):
@@ -12,83 +38,239 @@ class Cache(param.Parameterized):
     def __contains__(self, item):
         return False
 
+    def get(self, key, default=None):
+        return default
+
 
 class MemoryCache(Cache):
-    _cache = param.Dict(default={})
+    """
+    In-memory least recently used (LRU) cache.
+
+    Items are evicted least recently used first when either the number of items exceeds
+    `max_items` or their total size exceeds `max_size`. Size of dataframes is measured with
+    `memory_usage(deep=True)`.
+
+    """
 
     max_items = param.Integer(None, doc="Maximum number of items allowed in the cache")
 
+    max_size = param.Integer(None, doc="Maximum total size of the cached items in bytes")
+
+    hits = param.Integer(0, doc="Number of cache hits")
+
+    misses = param.Integer(0, doc="Number of cache misses")
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self._cache = OrderedDict()
+        self._sizes = {}
+        self.size = 0
+
     def __getitem__(self, item):
-        return self._cache.__getitem__(item)
+        value = self._cache.__getitem__(item)
+        self._cache.move_to_end(item)
+
+        return value
+
+    def get(self, key, default=None):
+        try:
+            value = self[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        return value
 
     def __setitem__(self, key, value):
-        if self.max_items is not None and len(self._cache) >= self.max_items:
-            self._cache.popitem()
+        if key in self._cache:
+            self._remove(key)
+
+        nbytes = _nbytes(value)
+        if self.max_size is not None and nbytes > self.max_size:
+            self._evict(key, value)  # item would evict the complete cache
+            return
 
         self._cache[key] = value
+        self._sizes[key] = nbytes
+        self.size += nbytes
+
+        while (self.max_items is not None and len(self._cache) > self.max_items) or (
+            self.max_size is not None and self.size > self.max_size
+        ):
+            lru_key = next(iter(self._cache))
+            self._evict(lru_key, self._remove(lru_key))
+
+    def _remove(self, key):
+        self.size -= self._sizes.pop(key)
+        return self._cache.pop(key)
+
+    def _evict(self, key, value):
+        """Called with items which are removed or not added to make space. Dropped by default."""
+        pass
 
     def __contains__(self, item):
         return item in self._cache
 
+    def __len__(self):
+        return len(self._cache)
+
+    def clear(self):
+        """Removes all items and resets hit/miss counters."""
+        self._cache.clear()
+        self._sizes.clear()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
 
-class HybridHDFCache(Cache):
+
+class HybridCache(MemoryCache):
     """
+    Two-tier cache of an in-memory LRU cache which spills to disk.
 
-    Hybrid HDFStore / Memory cache
+    Items evicted from memory, or too large to be kept in memory, are pickled to `cache_dir`.
+    Items read from disk are copied back to memory. Files on disk are removed when older than
+    `max_age` or, oldest first, when their total size exceeds `max_disk_size`.
 
-    Sometimes there are errors depending on the dtypes of dataframes stored
+    Files are named by the md5 hash of `repr(key)` and are written atomically, and missing files
+    are treated as cache misses, such that multiple caches (eg app sessions) can share a cache
+    directory. Note that app transforms are keyed by Python's builtin `hash`, which is salted per
+    process: items spilled by app transforms are only found again by the same server process.
+    Files left by previous processes are removed by `max_age` and `max_disk_size`.
 
     """
 
-    file_path = param.String()
-
-    _store = param.ClassSelector(class_=pd.HDFStore)
+    cache_dir = param.ClassSelector(class_=(str, Path), doc="Directory to spill items to")
 
-    _cache = param.Dict(default={})
+    max_disk_size = param.Integer(int(1e10), doc="Maximum total size of items on disk in bytes")
 
-    bytes_threshold = param.Integer(default=int(1e8))
+    max_age = param.Number(
+        None, doc="Maximum age in seconds since last use of items on disk before removal"
+    )
 
     def __init__(self, **params):
         super().__init__(**params)
-        if self.file_path is not None:
-            self._store = pd.HDFStore(self.file_path)
+        self.cache_dir = Path(self.cache_dir).expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key) -> Path:
+        return self.cache_dir / f"{hashlib.md5(repr(key).encode()).hexdigest()}.pkl"
 
     def __getitem__(self, item):
-        key = str(item)
         try:
-            return self._cache.__getitem__(key)
+            return super().__getitem__(item)
         except KeyError:
-            return self._store.__getitem__(key)
+            pass
 
-    def _store_put(self, key, value):
+        path = self._path(item)
         try:
-            self._store[key] = value
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            raise KeyError(item)
 
-            # Check if reading back the dataframe works
+        # copy back to memory, the file is kept for other sessions
+        if self.max_size is None or _nbytes(value) <= self.max_size:
+            super().__setitem__(item, value)
+
+        return value
+
+    def __contains__(self, item):
+        return super().__contains__(item) or self._path(item).exists()
+
+    def __len__(self):
+        paths = {path for path, _ in self._entries()}
+        return len(paths | {self._path(key) for key in self._cache})
+
+    def _evict(self, key, value):
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            tmp_path.unlink(missing_ok=True)  # unpicklable items are dropped
+            return
+
+        self.evict_disk()
+
+    def _entries(self) -> list[tuple[Path, os.stat_result]]:
+        entries = []
+        for path in self.cache_dir.glob("*.pkl"):
             try:
-                _value = self._store[key]
-            except AttributeError:
-                del self._store[key]
-                self._cache[key] = value
+                entries.append((path, path.stat()))
+            except OSError:  # removed by another session
+                pass
 
-        except (
-            NotImplementedError,
-            TypeError,
-        ):  # pytables does not support categorical dtypes
-            self._cache[key] = value
+        return entries
 
-    def __setitem__(self, key, value):
-        key = str(key)
-        if isinstance(value, pd.DataFrame) and value.memory_usage().sum() > self.bytes_threshold:
-            self._store_put(key, value)
-        elif isinstance(value, pd.Series) and value.memory_usage() > self.bytes_threshold:
-            self._store_put(key, value)
-        else:
-            self._cache[str(key)] = value
+    def evict_disk(self):
+        """Removes items from disk which are older than `max_age` or exceed `max_disk_size`."""
+        entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+        total = sum(stat.st_size for _, stat in entries)
+        now = time.time()
+        for path, stat in entries:
+            expired = self.max_age is not None and now - stat.st_mtime > self.max_age
+            if not expired and total <= self.max_disk_size:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+
+    @property
+    def disk_size(self) -> int:
+        """Total size of the items on disk in bytes."""
+        return sum(stat.st_size for _, stat in self._entries())
+
+    def clear(self):
+        """Removes all items from memory and disk and resets hit/miss counters."""
+        super().clear()
+        for path, _ in self._entries():
+            path.unlink(missing_ok=True)
+
+
+class HybridHDFCache(HybridCache):
+    """
+    Deprecated, use [HybridCache][web.cache.HybridCache].
+
+    Items are stored in a directory next to `file_path` instead of in an HDF5 file;
+    `bytes_threshold` is ignored.
+
+    """
+
+    file_path = param.String(None, doc="Path of the HDF5 file, replaced by `cache_dir`")
+
+    bytes_threshold = param.Integer(default=int(1e8), doc="Ignored")
+
+    def __init__(self, **params):
+        warnings.warn(
+            "'HybridHDFCache' is deprecated and will be removed, use 'HybridCache' instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        if params.get("cache_dir") is None:
+            file_path = params.get("file_path")
+            if file_path is None:
+                params["cache_dir"] = tempfile.mkdtemp(prefix="pyhdx_cache_")
+            else:
+                params["cache_dir"] = Path(file_path).with_suffix("")
+        super().__init__(**params)
+
+
+def make_cache() -> MemoryCache:
+    """Returns a cache for the web apps as configured by `server.cache_dir` in the PyHDX config.
+
+    The cache is an in-memory [MemoryCache][web.cache.MemoryCache] by default. The on-disk tier
+    of [HybridCache][web.cache.HybridCache] is opt-in, by setting `server.cache_dir`.
+    """
+    kwargs = {"max_items": 2000, "max_size": int(1e9)}
+    cache_dir = cfg.server.get("cache_dir")
+    if cache_dir:
+        return HybridCache(cache_dir=cache_dir, **kwargs)
+
+    return MemoryCache(**kwargs)
 
-    def __contains__(self, item):
-        return str(item) in self._cache.keys() | self._store.keys()
 
-    # todo with statement for creating caches?
-    # def __exit__(self):
-    #     pass
+# Cache shared by the apps and by transforms not given a cache by the app constructor
+default_cache = make_cache()
@@ -4,6 +4,7 @@ import asyncio
 import sys
 import uuid
 import zipfile
+from functools import partial
 from io import StringIO, BytesIO
 from typing import Any
 
@@ -43,7 +44,7 @@ from pyhdx.fitting import (
     DUptakeFitResultSet,
 )
 from pyhdx.datasets import HDXDataSet, DataVault, DataFile
-from pyhdx.fitting_torch import TorchFitResultSet
+from pyhdx.fitting_torch import TorchFitResultSet, dG_fit_tables
 from pyhdx.models import (
     PeptideUptakeModel,
     HDXMeasurement,
@@ -64,6 +65,7 @@ from pyhdx.support import (
     dataframe_intersection,
 )
 from pyhdx.web.base import ControlPanel, DEFAULT_CLASS_COLORS
+from pyhdx.web.jobs import CANCELLED, ERROR, FINISHED, QUEUED, Job
 from pyhdx.web.opts import CmapOpts
 from pyhdx.web.sources import TABLE_INFO
 from pyhdx.web.transforms import CrossSectionTransform
@@ -144,7 +146,7 @@ class AsyncControlPanel(ControlPanel):
 
     def print_stuff(self):
         print(self.parent.executor)
-        df = self.src.tables["test_data"]
+        df = self.src.get_table("test_data")
         print()
 
 
@@ -208,15 +210,65 @@ class MWEControl(ControlPanel):
             }
         )
 
-        self.src.tables["test_data"] = df
+        self.src.add_table("test_data", df)
         self.src.param.trigger("updated")
 
 
 class PyHDXControlPanel(ControlPanel):
+    def __init__(self, parent, **params):
+        self._jobs: list[Job] = []  # queued and running jobs submitted by this controller
+        super().__init__(parent, **params)
+
     @property
     def src(self):
         return self.parent.sources["main"]
 
+    def submit_job(self, func, name: str, priority: int = 0) -> Job:
+        """Submits a job to the job manager shared between sessions and logs the queue depth.
+
+        Args:
+            func: Coroutine function called with the dask client and the job.
+            name: Name of the job.
+            priority: Jobs with a higher priority are started first.
+
+        Returns:
+            The submitted job.
+
+        """
+        manager = self.parent.job_manager
+        job = manager.submit(
+            func,
+            name=name,
+            priority=priority,
+            on_done=self._job_finished,
+            on_progress=self._job_progress,
+        )
+        if not job.done:
+            self._jobs.append(job)
+        if job.status == QUEUED:
+            self.parent.logger.info(
+                f"Queued job {name!r} at position {manager.position(job) + 1} "
+                f"({manager.queued} queued, {manager.running} running)"
+            )
+
+        return job
+
+    async def cancel_jobs(self) -> None:
+        """Cancels all queued and running jobs of this controller."""
+        for job in list(self._jobs):
+            await self.parent.job_manager.cancel(job)
+
+    def _job_finished(self, job: Job) -> None:
+        if job in self._jobs:
+            self._jobs.remove(job)
+        if job.status == CANCELLED:
+            self.parent.logger.info(f"Cancelled job {job.name!r}")
+        elif job.status == ERROR:
+            self.parent.logger.error(f"Job {job.name!r} failed: {job.exception!r}")
+
+    def _job_progress(self, job: Job, msg: dict) -> None:
+        pass
+
 
 class GlobalSettingsControl(ControlPanel):
     _type = "global_settings"
@@ -901,6 +953,12 @@ class DUptakeFitControl(PyHDXControlPanel):
         doc="Start D-uptake fit",
     )
 
+    cancel_fit = param.Action(
+        lambda self: async_execute(self.cancel_jobs),
+        label="Cancel Fitting",
+        doc="Cancel the running D-uptake fit",
+    )
+
     def make_dict(self):
         widgets = self.generate_widgets(
             r1=pn.widgets.FloatInput,
@@ -927,7 +985,15 @@ class DUptakeFitControl(PyHDXControlPanel):
 
         user_dict = self.sources["metadata"].get("user_settings")
         user_dict["d_uptake_fit"][self.fit_name] = self.get_user_settings()
-        async_execute(self._fit_d_uptake)
+
+        func = partial(
+            self._fit_d_uptake,
+            self.fit_name,
+            list(self.src.hdxm_objects.values()),
+            self.get_user_settings(),
+            self.repeats,
+        )
+        self.submit_job(func, self.fit_name)
 
     def get_user_settings(self) -> dict:
         """
@@ -938,38 +1004,40 @@ class DUptakeFitControl(PyHDXControlPanel):
 
         return d
 
-    async def _fit_d_uptake(self):
-        name = self.fit_name
-        num_samples = len(self.src.hdxm_objects)
+    async def _fit_d_uptake(self, name, hdxm_list, settings, repeats, client, job):
         guess = None
 
-        self.widgets["pbar"].num_tasks = num_samples
-        async with Client(cfg.cluster.scheduler_address, asynchronous=True) as client:
-            futures = []
-            for hdxm in self.src.hdxm_objects.values():
-                future = client.submit(
-                    fit_d_uptake,
-                    hdxm,
-                    guess,
-                    self.r1,
-                    self.bounds,
-                    self.repeats,
-                    False,
-                    "worker_client",
-                )
-                futures.append(future)
+        self.widgets["pbar"].num_tasks = len(hdxm_list)
+        futures = []
+        for hdxm in hdxm_list:
+            future = client.submit(
+                fit_d_uptake,
+                hdxm,
+                guess,
+                settings["r1"],
+                settings["bounds"],
+                repeats,
+                False,
+                "worker_client",
+            )
+            futures.append(future)
+        job.track(futures)
 
-            await self.widgets["pbar"].run(futures)
-            results = await asyncio.gather(*futures)
+        await self.widgets["pbar"].run(futures)
+        results = await asyncio.gather(*futures)
 
         result_obj = DUptakeFitResultSet(list(results))
         self.src.add(result_obj, name)
 
+        self.parent.logger.info(f"Finished D-uptake fit {name}")
+
+    def _job_finished(self, job: Job) -> None:
+        super()._job_finished(job)
+        if job.status != FINISHED:
+            self._fit_names.remove(job.name)
         self.param["do_fit"].constant = False
         self.widgets["do_fit"].loading = False
 
-        self.parent.logger.info(f"Finished D-uptake fit {name}")
-
 
 class InitialGuessControl(PyHDXControlPanel):
     """
@@ -1096,8 +1164,15 @@ class InitialGuessControl(PyHDXControlPanel):
         user_dict["initial_guess"][self.guess_name] = self.get_user_settings()
 
         if self.fitting_model.lower() in ["association", "dissociation"]:
-            loop = asyncio.get_running_loop()
-            loop.create_task(self._fit_rates(self.guess_name))
+            hdxm_list = list(self.src.hdxm_objects.values())
+            if self.global_bounds:
+                bounds = [(self.lower_bound, self.upper_bound)] * len(hdxm_list)
+            else:
+                bounds = list(self.bounds.values())
+
+            # guesses are quick compared to ΔG fits and are started first
+            func = partial(self._fit_rates, self.guess_name, hdxm_list, bounds)
+            self.submit_job(func, self.guess_name, priority=1)
 
         # this is practically instantaneous and does not require dask
         elif self.fitting_model == "Half-life (λ)":
@@ -1110,32 +1185,29 @@ class InitialGuessControl(PyHDXControlPanel):
             self.widgets["do_fit1"].loading = False
             self.parent.logger.info(f"Finished initial guess fit {self.guess_name}")
 
-    async def _fit_rates(self, name):
-        num_samples = len(self.src.hdxm_objects)
+    async def _fit_rates(self, name, hdxm_list, bounds, client, job):
+        self.widgets["pbar"].num_tasks = len(hdxm_list)
+        futures = []
+        for hdxm, bound in zip(hdxm_list, bounds):
+            future = client.submit(fit_rates_weighted_average, hdxm, bound, client="worker_client")
+            futures.append(future)
+        job.track(futures)
 
-        self.widgets["pbar"].num_tasks = num_samples
-        async with Client(cfg.cluster.scheduler_address, asynchronous=True) as client:
-            if self.global_bounds:
-                bounds = [(self.lower_bound, self.upper_bound)] * num_samples
-            else:
-                bounds = self.bounds.values()
-            futures = []
-            for hdxm, bound in zip(self.src.hdxm_objects.values(), bounds):
-                future = client.submit(
-                    fit_rates_weighted_average, hdxm, bound, client="worker_client"
-                )
-                futures.append(future)
+        await self.widgets["pbar"].run(futures)
 
-            await self.widgets["pbar"].run(futures)
-
-            results = await asyncio.gather(*futures)
+        results = await asyncio.gather(*futures)
 
         result_obj = RatesFitResult(list(results))
         self.src.add(result_obj, name)
 
+        self.parent.logger.info(f"Finished initial guess fit {name}")
+
+    def _job_finished(self, job: Job) -> None:
+        super()._job_finished(job)
+        if job.status != FINISHED:
+            self._guess_names.remove(job.name)
         self.param["do_fit1"].constant = False
         self.widgets["do_fit1"].loading = False
-        self.parent.logger.info(f"Finished initial guess fit {name}")
 
     def get_user_settings(self) -> dict:
         """
@@ -1242,20 +1314,26 @@ class FitControl(PyHDXControlPanel):
         doc="Start global fitting",
     )
 
+    cancel_fit = param.Action(
+        lambda self: async_execute(self.cancel_jobs),
+        label="Cancel Fitting",
+        doc="Cancel queued and running fits",
+    )
+
     def __init__(self, parent, **params):
         self.pbar1 = ASyncProgressBar()  # tqdm?
+        self._progress = {}  # (job id, label): latest progress line of running fits
+        self._epochs = {}  # job id: number of epochs of running fits
         super(FitControl, self).__init__(parent, **params)
 
         self.src.param.watch(self._source_updated, ["updated"])
         self._mode_updated()  # Initialize excluded widgets
-        self._current_jobs = 0
-        self._max_jobs = 2  # todo config
 
     def make_dict(self):
         widgets = self.generate_widgets()
         # widgets['pbar_col'] = pn.layout.Column()
         widgets["pbar"] = ASyncProgressBar()
-        # widgets['progress'] = CallbackProgress()
+        widgets["progress"] = pn.pane.Markdown("", sizing_mode="stretch_width")
 
         return widgets
 
@@ -1308,18 +1386,20 @@ class FitControl(PyHDXControlPanel):
         user_dict = self.sources["metadata"].get("user_settings")
         user_dict["dG_fit"][self.fit_name] = self.get_user_settings()
 
-        self._current_jobs += 1
-        # if self._current_jobs >= self._max_jobs:
-        #     self.widgets['do_fit'].constant = True
-
         self.widgets["do_fit"].loading = True
 
-        self.parent.logger.info(f"Current number of active jobs: {self._current_jobs}")
-
+        # inputs are taken when the fit is submitted, as the fit may be queued
+        gibbs_guess = self.get_guesses()
         if self.fit_mode == "Batch":
-            async_execute(self._batch_fit)
+            func = partial(
+                self._batch_fit, self.fit_name, self.src.hdx_set, gibbs_guess, self.fit_kwargs
+            )
         else:
-            async_execute(self._single_fit)
+            hdxm_objects = dict(self.src.hdxm_objects)
+            func = partial(
+                self._single_fit, self.fit_name, hdxm_objects, gibbs_guess, self.fit_kwargs
+            )
+        self.submit_job(func, self.fit_name)
 
     def get_guesses(self):
         ...
@@ -1350,52 +1430,48 @@ class FitControl(PyHDXControlPanel):
 
         return gibbs_guess
 
-    async def _single_fit(self):
-        name = self.fit_name
+    async def _single_fit(self, name, hdxm_objects, gibbs_guesses, fit_kwargs, client, job):
+        self._epochs[job.id] = fit_kwargs["epochs"]
 
-        # data_objs = self.src.hdxm_objects.values()
-        # rates_df = self.src.rate_results[self.initial_guess].output
-        gibbs_guesses = (
-            self.get_guesses()
-        )  # returns either DataFrame or Series depending on guess mode
+        # gibbs_guesses is either a DataFrame or Series depending on guess mode
         futures = []
+        for protein_state, hdxm in hdxm_objects.items():
+            if isinstance(gibbs_guesses, pd.Series):
+                guess = gibbs_guesses
+            else:
+                guess = gibbs_guesses[protein_state]
 
-        async with Client(cfg.cluster.scheduler_address, asynchronous=True) as client:
-            for protein_state, hdxm in self.src.hdxm_objects.items():
-                if isinstance(gibbs_guesses, pd.Series):
-                    guess = gibbs_guesses
-                else:
-                    guess = gibbs_guesses[protein_state]
+            callbacks = [job.cancel_callback(), job.progress_callback(protein_state)]
+            future = client.submit(fit_gibbs_global, hdxm, guess, callbacks=callbacks, **fit_kwargs)
+            futures.append(future)
+        job.track(futures)
 
-                future = client.submit(fit_gibbs_global, hdxm, guess, **self.fit_kwargs)
-                futures.append(future)
+        self.widgets["pbar"].num_tasks = len(futures)
+        await self.widgets["pbar"].run(futures)
 
-            self.widgets["pbar"].num_tasks = len(futures)
-            await self.widgets["pbar"].run(futures)
+        # combine the results and generate the output tables on the workers
+        result_future = client.submit(TorchFitResultSet, futures)
+        tables_future = client.submit(dG_fit_tables, result_future, name)
+        job.track([result_future, tables_future])
+        result, tables = await asyncio.gather(result_future, tables_future)
 
-            results = await asyncio.gather(*futures)
-
-        result = TorchFitResultSet(results)
-        self.src.add(result, name)
-        self._current_jobs -= 1
-        self.widgets["pbar"].active = False
-        self.widgets["do_fit"].loading = False
+        self.src.add(result, name, tables=tables)
         self.parent.logger.info(f"Finished PyTorch fit: {name}")
 
-    async def _batch_fit(self):
+    async def _batch_fit(self, name, hdx_set, gibbs_guess, fit_kwargs, client, job):
+        self._epochs[job.id] = fit_kwargs["epochs"]
+
         self.widgets["pbar"].active = True
-        name = self.fit_name
-        hdx_set = self.src.hdx_set
-        gibbs_guess = self.get_guesses()
-        async with Client(cfg.cluster.scheduler_address, asynchronous=True) as client:
-            future = client.submit(fit_gibbs_global_batch, hdx_set, gibbs_guess, **self.fit_kwargs)
-            result = await future
+        callbacks = [job.cancel_callback(), job.progress_callback()]
+        future = client.submit(
+            fit_gibbs_global_batch, hdx_set, gibbs_guess, callbacks=callbacks, **fit_kwargs
+        )
+        tables_future = client.submit(dG_fit_tables, future, name)
+        job.track([future, tables_future])
+        result, tables = await asyncio.gather(future, tables_future)
 
-        self.src.add(result, name)
+        self.src.add(result, name, tables=tables)
 
-        self._current_jobs -= 1
-        self.widgets["pbar"].active = False
-        self.widgets["do_fit"].loading = False
         self.parent.logger.info(f"Finished PyTorch fit: {name}")
         self.parent.logger.info(
             f"Finished fitting in {len(result.losses)} epochs, final mean squared residuals is {result.mse_loss:.2f}"
@@ -1405,6 +1481,29 @@ class FitControl(PyHDXControlPanel):
             f"({result.regularization_percentage:.1f}%)"
         )
 
+    def _job_progress(self, job: Job, msg: dict) -> None:
+        label = f"{job.name} ({msg['label']})" if msg["label"] else job.name
+        epochs = self._epochs.get(job.id, "?")
+        line = f"{label}: epoch {msg['epoch']}/{epochs}, {msg['epochs_per_s']:.0f} epochs/s"
+        if msg["loss"] is not None:
+            line += f", loss {msg['loss']:.4g}"
+
+        self._progress[(job.id, msg["label"])] = line
+        self.widgets["progress"].object = "  \n".join(self._progress.values())
+        self.parent.logger.debug(line)
+
+    def _job_finished(self, job: Job) -> None:
+        super()._job_finished(job)
+        if job.status != FINISHED:
+            self._fit_names.remove(job.name)
+
+        self._epochs.pop(job.id, None)
+        self._progress = {k: v for k, v in self._progress.items() if k[0] != job.id}
+        self.widgets["progress"].object = "  \n".join(self._progress.values())
+        if not self._jobs:
+            self.widgets["pbar"].active = False
+            self.widgets["do_fit"].loading = False
+
     @property
     def fit_kwargs(self):
         fit_kwargs = dict(
@@ -1416,7 +1515,6 @@ class FitControl(PyHDXControlPanel):
             patience=self.stop_patience,
             stop_loss=self.stop_loss,
         )
-        # callbacks=[self.widgets['progress'].callback])
         if self.fit_mode == "Batch":
             fit_kwargs["r2"] = self.r2
             fit_kwargs["r2_reference"] = self.reference
@@ -1750,7 +1848,7 @@ class ColorTransformControl(PyHDXControlPanel):
             return None
 
         # get the table key corresponding to the selected cmap quantity
-        table_key = next(iter((k for k in self.src.tables.keys() if k.startswith(self.quantity))))
+        table_key = next(iter((k for k in self.src.get_tables() if k.startswith(self.quantity))))
 
         table = self.src.get_table(table_key)
         if table is None:
@@ -2261,7 +2359,7 @@ class FileExportControl(PyHDXControlPanel):
         return final_widgets
 
     def _tables_updated(self, *events):
-        options = list(self.sources["main"].tables.keys())
+        options = self.sources["main"].get_tables()
         self.param["table"].objects = options
         if not self.table and options:
             self.table = options[0]
@@ -2288,7 +2386,7 @@ class FileExportControl(PyHDXControlPanel):
     @pn.depends("table")
     def table_export_callback(self):
         if self.table:
-            df = self.sources["main"].tables[self.table]
+            df = self.sources["main"].get_table(self.table)
             io = dataframe_to_stringio(df, fmt=self.export_format)
             return io
         else:
@@ -2317,7 +2415,7 @@ class FileExportControl(PyHDXControlPanel):
             return bio
 
     def get_color_df(self) -> pd.Dataframe:
-        df = self.sources["main"].tables[self.table]
+        df = self.sources["main"].get_table(self.table)
         opt = self.opts[TABLE_INFO[self.table]["cmap_opt"]]
         field = TABLE_INFO[self.table]["cmap_field"]
         cmap = opt.cmap
@@ -2443,7 +2541,7 @@ class FigureExportControl(PyHDXControlPanel):
         else:
             table_options = {"dG"}
 
-        options = list(table_options & self.src.tables.keys())
+        options = list(table_options & set(self.src.get_tables()))
         self.param["table"].objects = options
         if (not self.table and options) or (options and self.table not in options):
             self.table = options[0]
@@ -2493,7 +2591,7 @@ class FigureExportControl(PyHDXControlPanel):
 
     @property
     def plot_data(self):
-        df = self.sources["main"].tables[self.table]
+        df = self.sources["main"].get_table(self.table)
         return df
 
     @pn.depends("table", watch=True)
@@ -2523,7 +2621,7 @@ class FigureExportControl(PyHDXControlPanel):
 
     @pn.depends("figure_selection", watch=True)
     def _figure_selection_updated(self):  # selection is usually Fit ID
-        df = self.sources["main"].tables["dG"][self.figure_selection]
+        df = self.sources["main"].get_table("dG")[self.figure_selection]
         options = list(df.columns.unique(level=0))
         self.param["reference"].objects = [None] + options
         if not self.reference and options:
@@ -2651,7 +2749,9 @@ class SessionManagerControl(PyHDXControlPanel):
         bio = BytesIO()
         with zipfile.ZipFile(bio, "w") as session_zip:
             # Write tables
-            for name, table in self.sources["main"].tables.items():
+            src = self.sources["main"]
+            for name in src.get_tables():
+                table = src.get_table(name)
                 sio = dataframe_to_stringio(table)
                 session_zip.writestr(name + ".csv", sio.getvalue())
 
@@ -2740,7 +2840,7 @@ class SessionManagerControl(PyHDXControlPanel):
             src.rate_results = {}
             src.dG_fits = {}
 
-        src.tables = {}  # are there any dependies on this?
+        src.clear()
 
 
 class GraphControl(PyHDXControlPanel):
@@ -2975,7 +3075,8 @@ class PeptidePropertiesControl(ControlPanel):
     def update_d_uptake(self):
         time = np.logspace(-2, 6, num=250)
 
-        d_uptake = self.model.eval_analytical(time, 10.0**self.k_open, 10.0**self.k_close)
+        populations = self.model.eval_populations(time, 10.0**self.k_open, 10.0**self.k_close)
+        d_uptake = populations[..., 2]
 
         cols = [f"aa_{i}" for i in range(len(self.model))]
         idx = pd.Index(time, name="time")
@@ -0,0 +1,349 @@
+"""
+Job manager shared by all sessions of a PyHDX server, which queues and runs (fitting) jobs on the
+dask cluster.
+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import itertools
+import uuid
+import weakref
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Awaitable, Callable, List, Optional
+
+import panel as pn
+import param
+from distributed import Client, Event, Future
+from panel.io.state import set_curdoc
+from tornado.ioloop import IOLoop
+
+from pyhdx.config import cfg
+from pyhdx.fitting_torch import CancelCallback, ProgressCallback
+
+QUEUED = "queued"
+RUNNING = "running"
+FINISHED = "finished"
+CANCELLED = "cancelled"
+ERROR = "error"
+
+PROGRESS_TOPIC = "pyhdx-progress"
+
+
+@dataclass
+class Job:
+    """A job submitted to the :class:`JobManager`.
+
+    Attributes:
+        func: Coroutine function which runs the job. It is called with the shared dask client and
+            the job itself.
+        user: Identifier of the user who submitted the job.
+        name: Name of the job.
+        priority: Jobs with a higher priority are started first.
+        on_done: Optional function called with the job when it is finished, cancelled or failed.
+        on_progress: Optional function called with the job and the progress messages of its fits.
+        id: Unique identifier of the job.
+        status: One of 'queued', 'running', 'finished', 'cancelled' or 'error'.
+        result: The return value of `func`.
+        exception: The exception raised by `func`, if any.
+        futures: Dask futures of the job, which are cancelled together with the job.
+
+    """
+
+    func: Callable[[Client, "Job"], Awaitable[Any]]
+    user: str
+    name: str = ""
+    priority: int = 0
+    on_done: Optional[Callable[["Job"], None]] = None
+    on_progress: Optional[Callable[["Job", dict], None]] = None
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = QUEUED
+    result: Any = None
+    exception: Optional[BaseException] = None
+    futures: List[Future] = field(default_factory=list)
+    doc: Any = field(default=None, repr=False)
+    _seq: int = field(default=0, repr=False)
+    _task: Optional[asyncio.Task] = field(default=None, repr=False)
+    _cancel_requested: bool = field(default=False, repr=False)
+
+    @property
+    def cancel_event(self) -> str:
+        """Name of the dask event which is set when the job is cancelled."""
+        return f"pyhdx-cancel-{self.id}"
+
+    @property
+    def done(self) -> bool:
+        return self.status in (FINISHED, CANCELLED, ERROR)
+
+    def cancel_callback(self, interval: float = 1.0) -> CancelCallback:
+        """Returns a fitting callback which stops the optimization when the job is cancelled."""
+        return CancelCallback(self.cancel_event, interval=interval)
+
+    def progress_callback(self, label: str = "", interval: float = 1.0) -> ProgressCallback:
+        """Returns a fitting callback which reports its progress to the job's `on_progress`."""
+        return ProgressCallback(PROGRESS_TOPIC, key=self.id, label=label, interval=interval)
+
+    def track(self, futures: List[Future]) -> List[Future]:
+        """Registers dask futures with the job, such that they are cancelled with the job."""
+        self.futures.extend(futures)
+        return futures
+
+
+class JobManager(param.Parameterized):
+    """Queues jobs and runs them on the dask cluster with a single shared async client.
+
+    At most `max_jobs` jobs run concurrently, of which at most `max_user_jobs` per user. Queued jobs
+    are started in order of priority and then in order of submission, skipping jobs of users which
+    are at their limit. Jobs of a session are cancelled when the session is closed.
+
+    """
+
+    scheduler_address = param.String(
+        default=None,
+        allow_None=True,
+        doc="Address of the dask scheduler. Defaults to the address in the PyHDX config.",
+    )
+
+    max_jobs = param.Integer(
+        4, bounds=(1, None), doc="Maximum number of concurrently running jobs."
+    )
+
+    max_user_jobs = param.Integer(
+        2, bounds=(1, None), doc="Maximum number of concurrently running jobs per user."
+    )
+
+    cancel_delay = param.Number(
+        10.0,
+        bounds=(0, None),
+        doc="Seconds after a cancelled job is done before its cancel event is cleared. Fits which "
+        "still run on the workers stop if they check the event within this time.",
+    )
+
+    queued = param.Integer(0, constant=True, doc="Number of queued jobs.")
+
+    running = param.Integer(0, constant=True, doc="Number of running jobs.")
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self._queue: list[Job] = []
+        self._running: list[Job] = []
+        self._counter = itertools.count()
+        self._client: Optional[Client] = None
+        self._client_lock: Optional[asyncio.Lock] = None
+        self._sessions: weakref.WeakSet = weakref.WeakSet()
+
+    async def get_client(self) -> Client:
+        """Returns the shared async dask client, connecting if needed."""
+        if self._client_lock is None:
+            self._client_lock = asyncio.Lock()
+        async with self._client_lock:
+            if self._client is None or self._client.status not in ("running", "connecting"):
+                address = self.scheduler_address or cfg.cluster.scheduler_address
+                self._client = await Client(address, asynchronous=True)
+                self._client.subscribe_topic(PROGRESS_TOPIC, self._handle_progress)
+
+        return self._client
+
+    async def close(self) -> None:
+        """Closes the shared dask client."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    def submit(
+        self,
+        func: Callable[[Client, Job], Awaitable[Any]],
+        name: str = "",
+        priority: int = 0,
+        user: Optional[str] = None,
+        on_done: Optional[Callable[[Job], None]] = None,
+        on_progress: Optional[Callable[[Job, dict], None]] = None,
+    ) -> Job:
+        """Submits a job to the queue.
+
+        Args:
+            func: Coroutine function which runs the job, called with the shared dask client and the
+                job. Dask futures should be registered with :meth:`Job.track` and fitting functions
+                should be given the :meth:`Job.cancel_callback` to support cancellation and the
+                :meth:`Job.progress_callback` to report their progress.
+            name: Name of the job.
+            priority: Jobs with a higher priority are started first.
+            user: Identifier of the user. Defaults to the authenticated user or otherwise the
+                current session.
+            on_done: Optional function called with the job when it is finished, cancelled or
+                failed.
+            on_progress: Optional function called with the job and the progress messages of the
+                job's fits (see :class:`~pyhdx.fitting_torch.ProgressCallback`).
+
+        Returns:
+            The submitted job.
+
+        """
+
+        job = Job(
+            func=func,
+            user=user or current_user(),
+            name=name,
+            priority=priority,
+            on_done=on_done,
+            on_progress=on_progress,
+            doc=pn.state.curdoc if pn.state.curdoc and pn.state.curdoc.session_context else None,
+            _seq=next(self._counter),
+        )
+        if job.doc is not None and job.doc not in self._sessions:
+            self._sessions.add(job.doc)
+            pn.state.on_session_destroyed(partial(self._session_destroyed, job.doc))
+        self._queue.append(job)
+        self._queue.sort(key=lambda j: (-j.priority, j._seq))
+        self._schedule()
+
+        return job
+
+    def position(self, job: Job) -> Optional[int]:
+        """Returns the position of a queued job in the queue, or `None` if it is not queued."""
+        try:
+            return self._queue.index(job)
+        except ValueError:
+            return None
+
+    def user_jobs(self, user: Optional[str] = None) -> list[Job]:
+        """Returns the queued and running jobs of a user (default the current user)."""
+        user = user or current_user()
+        return [job for job in self._running + self._queue if job.user == user]
+
+    async def cancel(self, job: Job) -> None:
+        """Cancels a queued or running job.
+
+        Running fits are signalled through the job's dask event to stop optimization, and the
+        job's dask futures are cancelled.
+
+        """
+
+        if job in self._queue:
+            self._queue.remove(job)
+            self._finish(job, CANCELLED)
+            self._schedule()
+        elif job in self._running and not job._cancel_requested:
+            job._cancel_requested = True
+            client = await self.get_client()
+            await Event(job.cancel_event, client=client).set()
+            if job.futures:
+                await client.cancel(job.futures)
+            if job._task is not None:
+                job._task.cancel()
+
+    def _schedule(self) -> None:
+        """Starts queued jobs for which there is a free slot."""
+        for job in list(self._queue):
+            if len(self._running) >= self.max_jobs:
+                break
+            if sum(j.user == job.user for j in self._running) >= self.max_user_jobs:
+                continue
+            self._queue.remove(job)
+            self._running.append(job)
+            job.status = RUNNING
+            self._start(job)
+
+        self._update_counts()
+
+    def _start(self, job: Job) -> None:
+        """Runs `job` on the server IOLoop in the context of the session which submitted it.
+
+        The job is not started through the session's document, such that it runs and frees its slot
+        also when the session is closed before the job is started.
+
+        """
+
+        async def run():
+            with set_curdoc(job.doc) if job.doc is not None else nullcontext():
+                await self._run(job)
+
+        self._spawn(run)
+
+    def _call_soon(self, job: Job, func: Callable, *args) -> None:
+        """Calls `func` (function or coroutine function) in the session which submitted `job`.
+
+        Calls are dropped if the session has been closed.
+
+        """
+
+        async def run():
+            with set_curdoc(job.doc) if job.doc is not None else nullcontext():
+                result = func(*args)
+                if inspect.isawaitable(result):
+                    await result
+
+        if job.doc is None:
+            self._spawn(run)
+        elif job.doc.session_context is not None:
+            job.doc.add_next_tick_callback(run)
+
+    @staticmethod
+    def _spawn(func: Callable[[], Awaitable[None]]) -> None:
+        """Schedules the coroutine function `func` on the current IOLoop."""
+        IOLoop.current().add_callback(func)
+
+    async def _run(self, job: Job) -> None:
+        job._task = asyncio.current_task()
+        try:
+            client = await self.get_client()
+            job.result = await job.func(client, job)
+        except asyncio.CancelledError:
+            status = CANCELLED
+        except Exception as e:
+            job.exception = e
+            status = CANCELLED if job._cancel_requested else ERROR
+        else:
+            status = CANCELLED if job._cancel_requested else FINISHED
+        finally:
+            job._task = None
+            self._running.remove(job)
+
+        # the cancel event is left set for a while, fits on workers may only check it after the job
+        # is done
+        if job._cancel_requested:
+            IOLoop.current().call_later(self.cancel_delay, self._clear_cancel_event, job)
+        self._finish(job, status)
+        self._schedule()
+
+    async def _clear_cancel_event(self, job: Job) -> None:
+        """Clears the cancel event of `job`, which removes it from the scheduler."""
+        if self._client is not None:
+            await Event(job.cancel_event, client=self._client).clear()
+
+    def _session_destroyed(self, doc, session_context) -> None:
+        """Cancels the queued and running jobs of a closed session."""
+        for job in self._running + self._queue:
+            if job.doc is doc:
+                self._spawn(partial(self.cancel, job))
+
+    def _handle_progress(self, event: tuple[float, dict]) -> None:
+        _, msg = event
+        job = next((j for j in self._running if j.id == msg.get("key")), None)
+        if job is not None and job.on_progress is not None:
+            self._call_soon(job, job.on_progress, job, msg)
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status = status
+        job.futures.clear()
+        if job.on_done is not None:
+            self._call_soon(job, job.on_done, job)
+
+    def _update_counts(self) -> None:
+        with param.edit_constant(self):
+            self.param.update(queued=len(self._queue), running=len(self._running))
+
+
+def current_user() -> str:
+    """Returns an identifier for the current user: the authenticated user name if available,
+    otherwise the id of the current session."""
+
+    if pn.state.user:
+        return pn.state.user
+    if pn.state.curdoc and pn.state.curdoc.session_context:
+        return pn.state.curdoc.session_context.id
+    return "default"
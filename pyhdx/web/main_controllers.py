@@ -11,6 +11,7 @@ import yaml
 from omegaconf import OmegaConf
 from pyhdx.config import cfg
 from pyhdx.support import clean_types
+from pyhdx.web.jobs import JobManager
 import pyhdx
 
 if TYPE_CHECKING:
@@ -98,8 +99,17 @@ class PyHDXController(MainController):
 
     sample_name = param.String(doc="Name describing the selected protein(s) state")
 
+    job_manager = param.ClassSelector(
+        default=None,
+        class_=JobManager,
+        precedence=-1,
+        doc="Job manager for running fits, shared between sessions",
+    )
+
     def __init__(self, *args, **kwargs):
         super(PyHDXController, self).__init__(*args, **kwargs)
+        if self.job_manager is None:
+            self.job_manager = JobManager()
 
         self.log_io = StringIO()
         sh = logging.StreamHandler(self.log_io)
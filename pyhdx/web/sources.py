@@ -1,12 +1,13 @@
 import json
 import uuid
 from collections import defaultdict
-from typing import Optional
+from typing import Any, Optional
 
 import pandas as pd
 import param
 
 from pyhdx import TorchFitResult, TorchFitResultSet
+from pyhdx.fitting_torch import dG_fit_tables
 from pyhdx.fitting import RatesFitResult, DUptakeFitResultSet
 from pyhdx.models import HDXMeasurement, HDXMeasurementSet
 from pyhdx.support import multiindex_astype, multiindex_set_categories, hash_dataframe
@@ -38,46 +39,146 @@ class Source(param.Parameterized):
 
 
 class TableSource(Source):
-    tables = param.Dict(default={}, doc="Dictionary of tables (pd.DataFrames)")
+    """Source of (wide) tables.
+
+    Tables can be added whole with `add_table`, or as separate column blocks with `append_table`.
+    Appended blocks are kept as they are. Transforms read the blocks of a single top-level column
+    with `get_block`, and blocks are only concatenated into a single table when the whole table is
+    requested with `get_table` (eg for exporting), such that adding many blocks in a row does not
+    repeatedly copy the full table.
+
+    """
+
+    tables = param.Dict(default={}, doc="Dictionary of concatenated tables (pd.DataFrames)")
 
     hashes = param.Dict(default={}, doc="Dictionary of table hashes")
 
     _type = "table"
 
+    def __init__(self, **params):
+        super().__init__(**params)
+        # <table_name>: list of column blocks of the table, in order of addition
+        self._blocks: dict[str, list[pd.DataFrame]] = {}
+        # <table_name>: {<top level column>: list of blocks with columns under this top level}
+        self._lookup: dict[str, dict[Any, list[pd.DataFrame]]] = {}
+        # <table_name>: column index of the table
+        self._columns: dict[str, pd.Index] = {}
+        # <table_name>: row index of the table, the sorted union of the row indices of the blocks
+        self._index: dict[str, pd.Index] = {}
+        # <table_name>: ordered categories of the column index top level, or None if not categorical
+        self._categories: dict[str, Optional[list]] = {}
+
     def get(self):
-        if len(self.tables) == 0:
+        tables = self.get_tables()
+        if len(tables) == 0:
             return None
-        elif len(self.tables) == 1:
-            return next(iter(self.tables.values()))
+        elif len(tables) == 1:
+            return self.get_table(tables[0])
 
         else:
             raise ValueError("TableSource has multiple tables, use `get_table`")
 
     def set(self, df: pd.DataFrame) -> None:
-        if len(self.tables) > 1:
+        tables = self.get_tables()
+        if len(tables) > 1:
             raise ValueError(
                 "Can only use the `set` method when the number of tables is below 1. "
                 "Use `add_table`"
             )
 
-        table = next(iter(self.tables.keys())) if self.tables else "main"
+        table = tables[0] if tables else "main"
         self.add_table(table, df)
 
-    def add_table(self, table: str, df: pd.DataFrame) -> None:
-        table_hash = hash_dataframe(df)
-        self.hashes[table] = table_hash
+    def add_table(self, table: str, df: pd.DataFrame, table_hash: Optional[int] = None) -> None:
+        """Adds or replaces a table. The table is hashed unless `table_hash` is given."""
+        self._remove(table)
+        self.hashes[table] = table_hash if table_hash is not None else hash_dataframe(df)
+        self._add_block(table, df)
         self.tables[table] = df
 
         # todo self.updated = True? (yes because right now this is done manually (?))
         # although would be good to have an option to not trigger (or context manager)
         # when adding multiple tables in batch and not wanted to update
 
-    def get_table(self, table):
+    def append_table(self, table: str, df: pd.DataFrame, categorical: bool = False) -> None:
+        """Appends a block of columns to a table, or creates the table if it does not exist.
+
+        Only the new block is hashed, and its hash is combined with the hash of the current table.
+        Existing blocks are not copied; concatenation is deferred until the whole table is requested
+        with `get_table`.
+
+        Args:
+            table: Name of the table.
+            df: Block of columns to append. Its columns should not be present in the table.
+            categorical: If `True`, the top level of the column index of the table is made
+                categorical, ordered by the order in which the blocks are added.
+
+        """
+
+        block_hash = hash_dataframe(df)
+        if table in self._blocks:
+            self.hashes[table] = hash((self.hashes[table], block_hash))
+            categories = self._categories.get(table)
+            if categories is None:
+                categories = list(self._columns[table].unique(level=0))
+        else:
+            self.hashes[table] = block_hash
+            categories = []
+
+        self._add_block(table, df)
+        self.tables.pop(table, None)
+        if categorical:
+            self._categories[table] = categories + list(df.columns.unique(level=0))
+        else:
+            self._categories[table] = None
+
+    def get_table(self, table: str) -> Optional[pd.DataFrame]:
+        """Returns the whole table, concatenating its blocks if needed."""
+        if table not in self.tables and table in self._blocks:
+            blocks = self._blocks[table]
+            df = pd.concat(blocks, axis=1, sort=True) if len(blocks) > 1 else blocks[0].copy()
+            df.columns = self._set_categories(df.columns, table)
+            self.tables[table] = df
         df = self.tables.get(table, None)
 
         return df
 
-    def get_tables(self):
+    def get_columns(self, table: str) -> Optional[pd.Index]:
+        """Returns the column index of a table without concatenating its blocks."""
+        if table not in self._blocks:
+            return None
+
+        return self._set_categories(self._columns[table], table)
+
+    def get_block(self, table: str, key: Any) -> Optional[pd.DataFrame]:
+        """Returns the columns of a table under the top-level column `key`.
+
+        Only the blocks with columns under `key` are selected, and the result is equal to
+        selecting `key` from the whole table returned by `get_table` (keeping the top level).
+
+        Args:
+            table: Name of the table.
+            key: Value of the top level of the column index.
+
+        Returns:
+            The selected columns, or `None` if the table or key does not exist.
+
+        """
+
+        blocks = self._lookup.get(table, {}).get(key)
+        if not blocks:
+            return None
+
+        selected = [b.loc[:, b.columns.get_level_values(0) == key] for b in blocks]
+        df = pd.concat(selected, axis=1) if len(selected) > 1 else selected[0]
+        index = self._index[table]
+        if not df.index.equals(index):
+            df = df.reindex(index)
+        df.columns = self._set_categories(df.columns, table)
+
+        return df
+
+    def get_tables(self) -> list[str]:
         """
         Returns the list of tables available on this source.
         Returns
@@ -86,7 +187,46 @@ class TableSource(Source):
             The list of available tables on this source.
         """
 
-        return list(self.tables.keys())
+        return list(dict.fromkeys([*self.tables, *self._blocks]))
+
+    def clear(self) -> None:
+        """Removes all tables."""
+        self._blocks = {}
+        self._lookup = {}
+        self._columns = {}
+        self._index = {}
+        self._categories = {}
+        self.hashes = {}
+        self.tables = {}
+
+    def _add_block(self, table: str, df: pd.DataFrame) -> None:
+        """Registers a block of columns of `table`, updating the table's column and row index."""
+        if table in self._blocks:
+            self._columns[table] = self._columns[table].append(df.columns)
+            if not self._index[table].equals(df.index):
+                self._index[table] = self._index[table].union(df.index)
+        else:
+            self._columns[table] = df.columns
+            self._index[table] = df.index
+
+        self._blocks.setdefault(table, []).append(df)
+        lookup = self._lookup.setdefault(table, {})
+        for key in df.columns.unique(level=0):
+            lookup.setdefault(key, []).append(df)
+
+    def _remove(self, table: str) -> None:
+        for d in (self._blocks, self._lookup, self._columns, self._index, self._categories):
+            d.pop(table, None)
+        self.tables.pop(table, None)
+
+    def _set_categories(self, columns: pd.Index, table: str) -> pd.Index:
+        """Makes the top level of `columns` categorical, if `table` is categorical."""
+        categories = self._categories.get(table)
+        if categories is not None:
+            columns = multiindex_astype(columns, 0, "category")
+            columns = multiindex_set_categories(columns, 0, categories, ordered=True)
+
+        return columns
 
 
 class PyHDXSource(TableSource):
@@ -104,11 +244,20 @@ class PyHDXSource(TableSource):
         # todo load hdxms first
         # then use those to reload dG results
 
-    def add(self, obj, name):  # todo Name is None and use obj name?
+    def add(self, obj, name, tables=None):  # todo Name is None and use obj name?
+        """Adds an object and its derived tables to the source.
+
+        Args:
+            obj: HDX measurement or fit result to add.
+            name: Name of the object.
+            tables: Optional dictionary of precomputed tables for ΔG fit results, as returned by
+                :func:`~pyhdx.fitting_torch.dG_fit_tables`.
+
+        """
         if isinstance(obj, HDXMeasurement):
             self._add_hdxm_object(obj, name)
         elif isinstance(obj, (TorchFitResult, TorchFitResultSet)):
-            self._add_dG_fit(obj, name)
+            self._add_dG_fit(obj, name, tables=tables)
         elif isinstance(obj, RatesFitResult):
             self._add_rates_fit(obj, name)
         elif isinstance(obj, DUptakeFitResultSet):
@@ -183,48 +332,10 @@ class PyHDXSource(TableSource):
         self.param.trigger("hdxm_objects")  # protein controller listens here
         self.updated = True
 
-    def _add_dG_fit(self, fit_result, name):
-        # Add dG values table (+ covariances etc)
-        df = fit_result.output.copy()
-        tuples = [(name, *tup) for tup in df.columns]
-        columns = pd.MultiIndex.from_tuples(tuples, names=["fit_ID", "state", "quantity"])
-        df.columns = columns
-        self._add_table(df, "dG")
-
-        # Add calculated d-uptake values
-        df = fit_result.get_dcalc()
-
-        tuples = [(name, *tup) for tup in df.columns]
-        columns = pd.MultiIndex.from_tuples(
-            tuples,
-            names=["fit_ID", "state", "peptide_id", "quantity"],
-        )
-        df.columns = columns
-
-        self._add_table(df, "d_calc")
-
-        # Add losses df
-        df = fit_result.losses.copy()
-        if df.columns.nlevels == 1:
-            tuples = [(name, "*", column) for column in df.columns]
-            columns = pd.MultiIndex.from_tuples(tuples, names=["fit_ID", "state", "loss_type"])
-        else:
-            tuples = [(name, *tup) for tup in df.columns]
-            columns = pd.MultiIndex.from_tuples(tuples, names=["fit_ID", "state", "loss_type"])
-
-        df.columns = columns
-        self._add_table(df, "loss")
-
-        # Add MSE per peptide df
-        # current bug: convert dtypes drop column names: https://github.com/pandas-dev/pandas/issues/41435
-        # use before assigning column names
-        mse_df = fit_result.get_peptide_mse().convert_dtypes()
-        # mse_df = pd.concat(dfs.values(), keys=dfs.keys(), axis=1).convert_dtypes()
-        mse_df.index.name = "peptide_id"
-        tuples = [(name, *tup) for tup in mse_df.columns]
-        columns = pd.MultiIndex.from_tuples(tuples, names=["fit_ID", "state", "quantity"])
-        mse_df.columns = columns
-        self._add_table(mse_df, "peptide_mse")
+    def _add_dG_fit(self, fit_result, name, tables=None):
+        tables = tables if tables is not None else dG_fit_tables(fit_result, name)
+        for table, df in tables.items():
+            self._add_table(df, table)
 
         self.dG_fits[name] = fit_result
         self.updated = True
@@ -238,18 +349,7 @@ class PyHDXSource(TableSource):
         :return:
         """
 
-        if table in self.tables:
-            current = self.tables[table]
-            new = pd.concat([current, df], axis=1, sort=True)
-            categories = list(current.columns.unique(level=0)) + list(df.columns.unique(level=0))
-        else:
-            new = df
-            categories = list(df.columns.unique(level=0))
-        if categorical:
-            new.columns = multiindex_astype(new.columns, 0, "category")
-            new.columns = multiindex_set_categories(new.columns, 0, categories, ordered=True)
-
-        self.add_table(table, new)
+        self.append_table(table, df, categorical=categorical)
 
 
 class PDBSource(Source):
@@ -8,9 +8,9 @@ import panel as pn
 import param
 from param.parameterized import default_label_formatter
 
-from pyhdx.support import autowrap, make_tuple
+from pyhdx.support import autowrap, decimate_dataframe, make_tuple
 from pyhdx.web.sources import Source
-from pyhdx.web.cache import Cache
+from pyhdx.web.cache import Cache, default_cache
 
 
 # ABC
@@ -29,7 +29,7 @@ class Transform(param.Parameterized):
 
     _hash = param.Integer(doc="Hash of current transform state")
 
-    _cache = param.ClassSelector(default=Cache(), class_=Cache)
+    _cache = param.ClassSelector(default=default_cache, class_=Cache, instantiate=False)
 
     def __init__(self, **params):
         super().__init__(**params)
@@ -51,7 +51,7 @@ class Transform(param.Parameterized):
 
     @property
     def hash(self):
-        tup = (*self.hash_key, self.source_hash)
+        tup = (type(self).__name__, *self.hash_key, self.source_hash)
 
         return hash(tup)
 
@@ -155,6 +155,15 @@ class TableSourceTransform(Transform):
         )  # returns None on KeyError #todo change to source.get_table
         return df
 
+    def get_columns(self) -> Union[pd.Index, None]:
+        """Returns the column index of the table, without concatenating the table's blocks"""
+        return self.source.get_columns(self.table)
+
+    def get_block(self, key) -> Union[pd.DataFrame, None]:
+        """Returns the columns of the table under top-level column `key`, without concatenating
+        the whole table"""
+        return self.source.get_block(self.table, key)
+
     @property
     def source_hash(self):
         return self.source.hashes.get(self.table, hash(None))
@@ -186,13 +195,20 @@ class AppTransform(Transform):
         return self.source.get()
 
     def get(self):
-        """method called to get the dataframe"""
-        if self.hash in self._cache:
-            return self._cache[self.hash]
-        else:
+        """method called to get the dataframe, transform outputs are memoized by hash
+
+        Returned dataframes are copies, such that modifying them does not alter cached outputs.
+        """
+        key = self.hash
+        data = self._cache.get(key)
+        if data is None:
             data = self.transform()
-            self._cache[self.hash] = data
-            return data
+            if data is not None:
+                self._cache[key] = data
+
+        if isinstance(data, (pd.DataFrame, pd.Series)):
+            return data.copy()
+        return data
 
     @param.depends("source.updated", watch=True)
     def update(self):
@@ -234,11 +250,11 @@ class CrossSectionTransform(AppTransform):
         if self.update_hash():
             # todo remove watchers when new transforms are created?
             old_index = self.index
-            df = self.source.get()
+            index = self._source_index()
 
-            if df is None:
+            if index is None:
                 return
-            self.index = df.columns if self.axis else df.index
+            self.index = index
             self._names = self.names or self.index.names
 
             if old_index is not None and self.index.nlevels == old_index.nlevels:
@@ -283,18 +299,36 @@ class CrossSectionTransform(AppTransform):
         self.redrawn = True
 
     def transform(self) -> Union[pd.DataFrame, None]:
-        df = self.source.get()
+        kwargs = self.pd_kwargs
+        if not kwargs["key"]:
+            return None
+
+        # tables are read per top-level column (eg fit_ID) to avoid concatenating the whole table
+        if self._reads_blocks and self.level[0] == 0 and not isinstance(self.key[0], slice):
+            df = self.source.get_block(self.key[0])
+        else:
+            df = self.source.get()
         if df is None:
             return df
 
-        kwargs = self.pd_kwargs
         # drop level bugged? https://github.com/pandas-dev/pandas/issues/6507
+        return df.xs(**kwargs)
 
-        if kwargs["key"]:
-            return df.xs(**kwargs)
-        else:
+    @property
+    def _reads_blocks(self) -> bool:
+        """True if the source table is read in blocks of columns"""
+        return self.axis == 1 and isinstance(self.source, TableSourceTransform)
+
+    def _source_index(self) -> Union[pd.Index, None]:
+        if self._reads_blocks:
+            return self.source.get_columns()
+
+        df = self.source.get()
+        if df is None:
             return None
 
+        return df.columns if self.axis else df.index
+
     def _selector_changed(self, *events):
         # this sends multiple updated events as it triggers changes in other selectors
         for event in events:
@@ -664,6 +698,39 @@ class SampleTransform(AppTransform):
         return df
 
 
+class DecimateTransform(AppTransform):
+    """Reduces the number of rows of curves (along the index) for plotting.
+
+    The number of rows is reduced to about the pixel `width` of the plot. Views which render the
+    output of this transform set `width` to their rendered width.
+
+    """
+
+    _type = "decimate"
+
+    method = param.Selector(
+        default="minmax",
+        objects=["minmax", "lttb"],
+        doc="Decimation method: minimum and maximum per bin or Largest-Triangle-Three-Buckets",
+    )
+
+    width = param.Integer(800, bounds=(1, None), doc="Pixel width of the plot")
+
+    def transform(self):
+        df = self.source.get()
+        if df is None:
+            return None
+
+        # minmax selects two points per bin
+        n = self.width // 2 if self.method == "minmax" else self.width
+
+        return decimate_dataframe(df, n, method=self.method)
+
+    @param.depends("source.updated", "method", "width", watch=True)
+    def update(self):
+        self.updated = True
+
+
 class PipeTransform(AppTransform):
     """applies a list of pandas functions
 
@@ -13,14 +13,14 @@ import numpy as np
 import pandas as pd
 import panel as pn
 import param
-from holoviews.streams import Pipe, Params
+from holoviews.streams import Pipe, Params, PlotSize
 from hvplot import hvPlotTabular
 from panel.pane.base import PaneBase
 
 from pyhdx.support import hex_to_rgb
 from pyhdx.web.pane import PDBeMolStar, REPRESENTATIONS
 from pyhdx.web.sources import Source
-from pyhdx.web.transforms import Transform
+from pyhdx.web.transforms import DecimateTransform, Transform
 from pyhdx.web.widgets import LoggingMarkdown, COLOR_SCHEMES, NGL
 from pyhdx.web.widgets import REPRESENTATIONS as NGL_REPRESENTATIONS
 from pyhdx.web.opts import CmapOpts
@@ -186,7 +186,23 @@ class hvView(View):
             df = self.empty_df
 
         self._stream = Pipe(data=df)
-        return dict(object=self.get_plot(), sizing_mode="stretch_both")  # todo update sizing mode
+        plot = self.get_plot()
+        self._link_plot_width(plot)
+
+        return dict(object=plot, sizing_mode="stretch_both")  # todo update sizing mode
+
+    def _link_plot_width(self, plot: hv.DynamicMap) -> None:
+        """Sets the `width` of a decimating source transform to the rendered width of the plot."""
+        if not isinstance(self.source, DecimateTransform):
+            return
+
+        def set_width(width=None, **kwargs):
+            if width:
+                # round up to limit recomputation while the plot is resized
+                self.source.width = int(np.ceil(width / 100) * 100)
+
+        self._plot_size = PlotSize(source=plot)
+        self._plot_size.add_subscriber(set_width)
 
     @property
     def panel(self):
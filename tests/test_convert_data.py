@@ -0,0 +1,81 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyhdx.convert_data import convert_hdexaminer_files, hdexa_to_pyhdx
+from pyhdx.fileIO import csv_to_dataframe
+
+
+@pytest.fixture()
+def hdexa_data() -> pd.DataFrame:
+    peptides = [(1, 8, "MPKSAGLT"), (5, 14, "AGLTPPEKVF")]
+    times = ["0s", "30s", "5m", "1h", "FD"]
+    rows = []
+    for state, fd_fraction in [("apo", 0.8), ("holo", 0.7)]:
+        for start, end, sequence in peptides:
+            max_d = len(sequence) - 1 - sequence[1:].count("P")
+            fd_uptake = fd_fraction * max_d
+            for i, time in enumerate(times):
+                uptake = fd_uptake * i / (len(times) - 1)
+                rows.append(
+                    {
+                        "Protein State": state,
+                        "Start": start,
+                        "End": end,
+                        "Sequence": sequence,
+                        "Peptide Mass": 100.0 * len(sequence),
+                        "RT (min)": 3.2,
+                        "Deut Time": time,
+                        "maxD": max_d,
+                        "Theor Uptake #D": uptake,
+                        "# Deut": uptake,
+                        "Deut %": 100 * uptake / max_d,
+                        "Confidence": "High",
+                        "Stddev": 0.05,
+                    }
+                )
+
+    return pd.DataFrame(rows)
+
+
+def test_hdexa_to_pyhdx(hdexa_data: pd.DataFrame):
+    data = hdexa_to_pyhdx(hdexa_data)
+
+    assert len(data) == 16
+    assert np.allclose(np.unique(data["exposure"]), [0.0, 30.0, 300.0, 3600.0])
+
+    apo = data[(data["state"] == "apo") & (data["start"] == 5)]
+    holo = data[(data["state"] == "holo") & (data["start"] == 5)]
+    assert np.allclose(apo["fd_uptake"], 0.8 * 7)
+    assert np.allclose(holo["fd_uptake"], 0.7 * 7)
+
+    # Leading residues and prolines are excluded from the exchanging residues
+    peptide = data.iloc[0]
+    assert peptide["sequence"] == "xxKSAGLT"
+    assert peptide["_start"] == 3
+    assert peptide["ex_residues"] == pytest.approx(6 * 0.85)
+
+    with pytest.raises(ValueError):
+        hdexa_to_pyhdx(hdexa_data[hdexa_data["Deut Time"] != "FD"])
+
+    bad_time = hdexa_data.copy()
+    bad_time.loc[0, "Deut Time"] = "2d"
+    with pytest.raises(ValueError):
+        hdexa_to_pyhdx(bad_time)
+
+
+def test_convert_hdexaminer_files(hdexa_data: pd.DataFrame, tmp_path):
+    files = []
+    for i in range(3):
+        files.append(tmp_path / f"export_{i}.csv")
+        hdexa_data.to_csv(files[-1], index=False)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        written = convert_hdexaminer_files(files, tmp_path / "out", executor=executor)
+
+    assert [f.name for f in written] == [f"export_{i}_pyhdx.csv" for i in range(3)]
+    data = csv_to_dataframe(written[0])
+    expected = hdexa_to_pyhdx(hdexa_data).reset_index(drop=True)
+    pd.testing.assert_frame_equal(data, expected, check_dtype=False)
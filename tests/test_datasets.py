@@ -1,6 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from typer.testing import CliRunner
+
+from pyhdx.batch_processing import (
+    PEPTIDE_COLUMNS,
+    DataFile,
+    JobParser,
+    StateParser,
+    batch_filter_peptides,
+    batch_fit,
+    fit_project,
+)
+from pyhdx.cli import app
 from pyhdx.datasets import HDXDataSet
 from pyhdx.models import HDXMeasurement, HDXMeasurementSet
 import numpy as np
+import pandas as pd
 from pathlib import Path
 import yaml
 
@@ -31,3 +47,190 @@ def test_load_from_yaml():
     hdxm_set = HDXMeasurementSet.from_dataset(dataset)
     assert isinstance(hdxm_set, HDXMeasurementSet)
     assert hdxm_set.names == list(hdx_spec["states"].keys())
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        hdxm_set_threaded = HDXMeasurementSet.from_dataset(dataset, executor=executor)
+
+    assert hdxm_set_threaded.names == hdxm_set.names
+    for hdxm_ref, hdxm_threaded in zip(hdxm_set, hdxm_set_threaded):
+        assert np.allclose(hdxm_ref.d_exp, hdxm_threaded.d_exp)
+
+
+def test_state_parser_selection():
+    yaml_pth = Path(input_dir / "data_states.yaml")
+    hdx_spec = yaml.safe_load(yaml_pth.read_text())
+    parser = StateParser(hdx_spec, data_src=input_dir)
+
+    data_file = parser.data_files["data_apo"]
+    assert data_file.states == {"SecB WT apo", "Full deuteration control"}
+    assert list(data_file.columns) == PEPTIDE_COLUMNS
+
+    full_data = DataFile(
+        name="full", format="DynamX", filepath_or_buffer=data_file.filepath_or_buffer
+    ).data
+    for state in ["SecB_tetramer", "SecB_dimer"]:
+        for peptides, peptide_spec in hdx_spec["states"][state]["peptides"].items():
+            data = parser.data_files[peptide_spec["data_file"]].data
+            assert set(data["state"]) <= parser.data_files[peptide_spec["data_file"]].states
+
+            spec = {k: v for k, v in peptide_spec.items() if k != "data_file"}
+            df = parser.load_peptides(state, peptides)
+            full_file = DataFile(
+                name="full",
+                format="DynamX",
+                filepath_or_buffer=parser.data_files[peptide_spec["data_file"]].filepath_or_buffer,
+            )
+            expected = batch_filter_peptides(full_file.data, **spec)
+            pd.testing.assert_frame_equal(df, expected[df.columns])
+
+    projected = DataFile(
+        name="projected",
+        format="DynamX",
+        filepath_or_buffer=data_file.filepath_or_buffer,
+        columns=["uptake", "stop"],
+    )
+    assert list(projected.data.columns) == ["start", "end", "stop", "state", "exposure", "uptake"]
+    assert len(projected.select(state="SecB WT apo", exposure=[0.0, 10.02])) == len(
+        full_data.query("state == 'SecB WT apo' and exposure in [0.0, 10.02]")
+    )
+
+    # columns used in queries are read; data file entries in the spec take precedence
+    experiment_spec = hdx_spec["states"]["SecB_tetramer"]["peptides"]["experiment"]
+    experiment_spec["query"] = ["rt > 2 and stop < 40"]
+    hdx_spec["data_files"]["data_dimer"].update(states=["SecB his dimer apo"], columns=None)
+    parser = StateParser(hdx_spec, data_src=input_dir)
+    assert list(parser.data_files["data_apo"].columns) == PEPTIDE_COLUMNS + ["rt"]
+    assert parser.data_files["data_dimer"].columns is None
+    assert parser.data_files["data_dimer"].states == ["SecB his dimer apo"]
+    df = parser.load_peptides("SecB_tetramer", "experiment")
+    assert (df["rt"] > 2).all() and (df["stop"] < 40).all()
+
+
+@pytest.fixture()
+def state_spec() -> dict:
+    """Reduced single state specification with absolute data file paths."""
+    hdx_spec = yaml.safe_load((input_dir / "data_states.yaml").read_text())
+    hdx_spec["states"] = {"SecB_tetramer": hdx_spec["states"]["SecB_tetramer"]}
+    hdx_spec["states"]["SecB_tetramer"]["peptides"]["experiment"]["query"] = ["stop < 30"]
+    for spec in hdx_spec["data_files"].values():
+        spec["filename"] = str(input_dir / spec["filename"])
+
+    return hdx_spec
+
+
+@pytest.fixture()
+def state_file(tmp_path, state_spec) -> Path:
+    """The reduced state specification written to `states.yaml`."""
+    state_file = tmp_path / "states.yaml"
+    state_file.write_text(yaml.dump(state_spec))
+
+    return state_file
+
+
+@pytest.fixture()
+def settings_file(tmp_path) -> Path:
+    """The test fit settings with fewer epochs."""
+    fit_settings = yaml.safe_load((input_dir / "fit_settings.yaml").read_text())
+    settings_file = tmp_path / "fit_settings.yaml"
+    settings_file.write_text(yaml.dump({**fit_settings, "epochs": 100}))
+
+    return settings_file
+
+
+def test_job_parser(tmp_path, state_file):
+    job_spec = yaml.safe_load((input_dir / "jobfile.yaml").read_text())
+    job_spec["steps"][0]["state_file"] = state_file.name
+
+    parser = JobParser(job_spec, cwd=tmp_path, cache_dir=tmp_path / "cache")
+    with ThreadPoolExecutor() as executor:
+        outputs = parser.execute(executor=executor)
+
+    assert list(outputs) == ["load_data", "rates", "guess", "global_fit", "save_fit_result_4"]
+    assert isinstance(outputs["load_data"], HDXMeasurementSet)
+    assert (tmp_path / "fit_result_output_1" / "fit_result.csv").exists()
+    assert not parser.cached
+
+    # rerun loads rates, guesses and fit result from cache
+    parser = JobParser(job_spec, cwd=tmp_path, cache_dir=tmp_path / "cache")
+    rerun_outputs = parser.execute()
+    assert parser.cached == {"rates", "guess", "global_fit"}
+    pd.testing.assert_frame_equal(outputs["global_fit"].output, rerun_outputs["global_fit"].output)
+
+    # changing fit settings invalidates the fit step only
+    job_spec["steps"][3]["kwargs"]["epochs"] = 50
+    parser = JobParser(job_spec, cwd=tmp_path, cache_dir=tmp_path / "cache")
+    parser.execute()
+    assert parser.cached == {"rates", "guess"}
+
+    cyclic_spec = {
+        "steps": [
+            {"task": "create_guess", "name": "a", "hdxm_set": "$(b.out)", "rates_df": "$(b.out)"},
+            {"task": "estimate_rates", "name": "b", "hdxm_set": "$(a.out)"},
+        ]
+    }
+    with pytest.raises(ValueError):
+        JobParser(cyclic_spec)
+
+    with pytest.raises(ValueError):
+        JobParser({"steps": [{"task": "estimate_rates", "hdxm_set": "$(missing.out)"}]})
+
+
+def test_fit_project(tmp_path, state_file, settings_file):
+    summary = fit_project(state_file, settings_file, tmp_path / "output")
+    assert summary["status"] == "ok"
+    assert summary["n_states"] == 1
+    assert set(summary) >= {"load_data", "rates", "guess", "global_fit", "save", "total"}
+    assert (tmp_path / "output" / "fit_result.csv").exists()
+
+    settings_file.write_text(yaml.dump({"epochs": 100, "invalid_kwarg": 0.5}))
+    summary = fit_project(state_file, settings_file, tmp_path / "output_invalid")
+    assert summary["status"].startswith("TypeError")
+    assert "global_fit" not in summary
+
+
+def test_batch_fit(tmp_path, state_file, settings_file):
+    invalid_file = tmp_path / "invalid.yaml"
+    invalid_file.write_text(yaml.dump({"epochs": 100, "invalid_kwarg": 0.5}))
+
+    output_dir = tmp_path / "output"
+    summary = batch_fit([state_file], [settings_file, invalid_file], output_dir, workers=2)
+
+    assert list(summary["settings_file"]) == [str(settings_file), str(invalid_file)]
+    assert summary["status"][0] == "ok"
+    assert summary["status"][1].startswith("TypeError")
+    assert (output_dir / "states" / "fit_settings" / "fit_result.csv").exists()
+    assert not (output_dir / "states" / "invalid" / "fit_result.csv").exists()
+    assert (output_dir / "timings.csv").exists()
+
+
+def test_batch_fit_output_dirs(tmp_path, state_spec, settings_file):
+    # state files with the same name in different directories are written to separate directories
+    state_files = []
+    for project in ["project_a", "project_b"]:
+        (tmp_path / project).mkdir()
+        state_files.append(tmp_path / project / "states.yaml")
+        state_files[-1].write_text(yaml.dump(state_spec))
+
+    output_dir = tmp_path / "output"
+    summary = batch_fit(state_files, [settings_file], output_dir, workers=2)
+    assert (summary["status"] == "ok").all()
+    for project in ["project_a", "project_b"]:
+        assert (output_dir / project / "states" / "fit_settings" / "fit_result.csv").exists()
+
+    with pytest.raises(ValueError):
+        batch_fit([state_files[0], state_files[0]], [settings_file], output_dir)
+
+
+def test_cli_fit(tmp_path, state_file, settings_file):
+    output_dir = tmp_path / "output"
+
+    runner = CliRunner()
+    args = ["fit", str(state_file), "--settings", str(settings_file)]
+    result = runner.invoke(app, args + ["--output-dir", str(output_dir), "--workers", "1"])
+    assert result.exit_code == 0, result.output
+    assert "Running 1 fit job(s)" in result.output
+    assert (output_dir / "states" / "fit_settings" / "fit_result.csv").exists()
+
+    result = runner.invoke(app, ["fit", str(tmp_path / "missing.yaml"), "-s", str(settings_file)])
+    assert result.exit_code == 1
+    assert "File not found" in result.output
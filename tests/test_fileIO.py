@@ -2,8 +2,12 @@ import pyhdx
 from pyhdx import TorchFitResult
 from pyhdx.fileIO import (
     csv_to_dataframe,
+    iter_dynamx,
+    read_dynamx as read_dynamx_typed,
     dataframe_to_stringio,
     dataframe_to_file,
+    npz_to_dataframe,
+    ProjectArchive,
     save_fitresult,
     load_fitresult,
 )
@@ -16,6 +20,7 @@ import pytest
 
 from pyhdx.models import HDXMeasurement, HDXMeasurementSet
 from pyhdx.fitting import fit_gibbs_global
+from pyhdx.fitting_torch import CheckPoint
 from pyhdx.datasets import read_dynamx, filter_peptides
 from pyhdx.process import apply_control, correct_d_uptake
 
@@ -67,6 +72,32 @@ def test_read_dynamx():
         df = read_dynamx(StringIO(f.read()))
         assert df.shape[0] == 567
 
+    df = read_dynamx_typed(fpath)
+    assert df["start"].dtype == np.int64
+    assert df["stop"][0] == 18
+    chunks = list(iter_dynamx(fpath, chunksize=100))
+    assert len(chunks) == 6
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df)
+
+    df_compact = read_dynamx_typed(fpath, categorical=True, float_dtype="float32")
+    assert isinstance(df_compact["state"].dtype, pd.CategoricalDtype)
+    assert df_compact["uptake"].dtype == np.float32
+    assert df_compact["exposure"].dtype == np.float64
+    assert np.allclose(df_compact["uptake"], df["uptake"])
+
+    # missing MaxUptake values
+    lines = fpath.read_text().splitlines(keepends=True)
+    header = [name.strip().lower() for name in lines[0].split(",")]
+    row = lines[1].split(",")
+    row[header.index("maxuptake")] = ""
+    text = "".join([lines[0], ",".join(row)] + lines[2:])
+    df_nan = read_dynamx_typed(StringIO(text))
+    assert df_nan["maxuptake"].dtype == np.float64
+    assert np.isnan(df_nan["maxuptake"][0])
+    assert np.allclose(df_nan["maxuptake"][1:], df["maxuptake"][1:])
+    chunks = list(iter_dynamx(StringIO(text), chunksize=100))
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df_nan)
+
 
 def test_read_write_tables(tmp_path):
     # Single-index columns
@@ -120,6 +151,52 @@ def test_read_write_tables(tmp_path):
     assert len(lines) == 38
     assert lines[0].strip() == pyhdx.VERSION_STRING
 
+    fpath = Path(tmp_path) / "multi_index_with_metadata.npz"
+    dataframe_to_file(fpath, df, fmt="npz")
+    df_read = npz_to_dataframe(fpath)
+    pd.testing.assert_frame_equal(df, df_read)
+    assert df_read.attrs["metadata"] == metadata
+
+
+def test_read_write_npz(tmp_path, hdxm: HDXMeasurement):
+    df = hdxm.data
+    fpath = Path(tmp_path) / "peptides.npz"
+    dataframe_to_file(fpath, df, fmt="npz")
+    df_read = npz_to_dataframe(fpath)
+    pd.testing.assert_frame_equal(df, df_read)
+
+    df = pd.DataFrame(
+        {"a": [1.0, np.nan, 3.0], "b": ["x", None, "z"], "c": [True, False, True]},
+        index=pd.MultiIndex.from_tuples([(1, "p"), (2, "q"), (3, "r")], names=["i", "j"]),
+    )
+    fpath = Path(tmp_path) / "mixed.npz"
+    dataframe_to_file(fpath, df, fmt="npz")
+    df_read = npz_to_dataframe(fpath)
+    pd.testing.assert_frame_equal(df, df_read)
+    assert np.isnan(df_read.loc[(2, "q"), "b"])
+
+    # categorical MultiIndex levels, nullable dtypes and numpy scalar labels
+    index = pd.MultiIndex.from_arrays(
+        [pd.Categorical(["b", "a", "b"], categories=["b", "a"]), np.array([1, 2, 3])],
+        names=["state", "exposure"],
+    )
+    df = pd.DataFrame(
+        {
+            "int": pd.array([1, None, 3], dtype="Int64"),
+            "bool": pd.array([True, None, False], dtype="boolean"),
+            "str": pd.array(["x", None, "z"], dtype="string"),
+            "cat": pd.Categorical(["u", None, "v"], ordered=True),
+        },
+        index=index,
+    )
+    df.columns = pd.MultiIndex.from_arrays([df.columns, np.arange(4, dtype=np.int64)])
+    fpath = Path(tmp_path) / "extension_dtypes.npz"
+    dataframe_to_file(fpath, df, fmt="npz")
+    df_read = npz_to_dataframe(fpath)
+    pd.testing.assert_frame_equal(df, df_read)
+    assert isinstance(df_read.index.levels[0], pd.CategoricalIndex)
+    assert df_read[("int", 0)].isna().tolist() == [False, True, False]
+
 
 def test_load_save_fitresult(tmp_path, fit_result: TorchFitResult, hdxm: HDXMeasurement):
     # todo missing read batch result test
@@ -148,3 +225,67 @@ def test_load_save_fitresult(tmp_path, fit_result: TorchFitResult, hdxm: HDXMeas
     assert len(fr_load_with_hdxm_and_losses.losses) == 100
 
     assert fr_load_with_hdxm_and_losses.metadata["total_loss"] == losses.iloc[-1].sum()
+
+    npz_dir = Path(tmp_path) / "fit_result_npz"
+    save_fitresult(npz_dir, fit_result, fmt="npz", human_readable=False)
+    assert not (npz_dir / "fit_result.txt").exists()
+
+    fr_npz = load_fitresult(npz_dir)
+    pd.testing.assert_frame_equal(fr_npz.losses, fit_result.losses, check_exact=True)
+    assert fr_npz.metadata["total_loss"] == fit_result.metadata["total_loss"]
+    assert np.allclose(fr_npz(timepoints), d_calc)
+
+
+def test_project_archive(tmp_path, hdxm: HDXMeasurement):
+    initial_rates = csv_to_dataframe(output_dir / "ecSecB_guess.csv")
+    gibbs_guess = hdxm.guess_deltaG(initial_rates["rate"])
+    checkpoint = CheckPoint(epoch_step=25)
+    fit_result = fit_gibbs_global(hdxm, gibbs_guess, epochs=100, r1=2, callbacks=[checkpoint])
+
+    fpath = Path(tmp_path) / "project.zip"
+    with ProjectArchive(fpath) as archive:
+        archive.put_table("guess", initial_rates)
+        archive.put_hdxm_set("secb", hdxm)
+        archive.put_fit_result("fit_1", fit_result, checkpoint=checkpoint)
+
+        with pytest.raises(ValueError):
+            archive.put_table("guess", initial_rates)
+
+    # append to existing archive
+    with ProjectArchive(fpath) as archive:
+        archive.put_fit_result("fit_2", fit_result)
+        archive.put_table("guess", initial_rates.iloc[:10], overwrite=True)
+
+    with ProjectArchive(fpath, mode="r") as archive:
+        assert archive.names("fits") == ["fit_1", "fit_2"]
+        assert archive.names("tables") == ["guess"]
+        assert archive.names("hdxm_sets") == ["secb"]
+
+        pd.testing.assert_frame_equal(archive.get_table("guess"), initial_rates.iloc[:10])
+
+        hdxm_set = archive.get_hdxm_set("secb")
+        assert isinstance(hdxm_set, HDXMeasurementSet)
+        assert hdxm_set.names == [hdxm.name]
+        assert np.allclose(hdxm_set[0].d_exp, hdxm.d_exp)
+
+        fr_loaded = archive.get_fit_result("fit_1")
+        pd.testing.assert_frame_equal(fr_loaded.output, fit_result.output)
+        pd.testing.assert_frame_equal(archive.get_losses("fit_2"), fit_result.losses)
+        assert archive.get_checkpoint("fit_1").shape[1] == 4
+
+        with pytest.raises(KeyError):
+            archive.get_checkpoint("fit_2")
+
+    # overwriting an entry removes all members of the previous entry
+    with ProjectArchive(fpath) as archive:
+        archive.put_fit_result("fit_1", fit_result, overwrite=True)
+        with pytest.raises(ValueError):
+            archive.put_fit_result("fit_2", fit_result)
+
+    with ProjectArchive(fpath, mode="r") as archive:
+        members = archive._zip.namelist()
+        assert len(members) == len(set(members))
+        assert archive.names("fits") == ["fit_2", "fit_1"]
+        with pytest.raises(KeyError):
+            archive.get_checkpoint("fit_1")
+        pd.testing.assert_frame_equal(archive.get_table("guess"), initial_rates.iloc[:10])
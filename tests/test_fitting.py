@@ -7,6 +7,7 @@ import pandas as pd
 import pytest
 import torch
 import yaml
+from distributed import Client, Event, LocalCluster
 from hdxms_datasets import HDXDataSet
 from pandas.testing import assert_frame_equal, assert_series_equal
 
@@ -14,7 +15,9 @@ from pyhdx import HDXMeasurement
 from pyhdx.config import cfg
 from pyhdx.fileIO import csv_to_dataframe
 from pyhdx.fitting import (
+    FitResultCache,
     GenericFitResult,
+    _chunk_size,
     fit_d_uptake,
     fit_gibbs_global,
     fit_gibbs_global_batch,
@@ -22,6 +25,8 @@ from pyhdx.fitting import (
     fit_rates_half_time_interpolate,
     fit_rates_weighted_average,
 )
+from pyhdx.fitting_torch import CancelCallback, ProgressCallback
+from pyhdx.local_cluster import DummyClient
 from pyhdx.models import HDXMeasurementSet
 
 cwd = Path(__file__).parent
@@ -96,6 +101,31 @@ def test_initial_guess_wt_average(hdxm_apo_red: HDXMeasurement):
     pd.testing.assert_series_equal(check_rates["rate"], output["rate"])
 
 
+def test_initial_guess_wt_average_chunked(hdxm_apo_red: HDXMeasurement):
+    reference = fit_rates_weighted_average(hdxm_apo_red).output
+
+    # blocks refitted with differential evolution vary slightly between runs, as the order of
+    # the model parameters depends on their (globally numbered) names
+    result = fit_rates_weighted_average(hdxm_apo_red, client=DummyClient(), chunksize=3)
+    assert_series_equal(result.output["rate"], reference["rate"], rtol=1e-2)
+
+    with LocalCluster(n_workers=2, processes=False) as cluster, Client(cluster) as client:
+        for chunksize in [None, 7]:
+            result = fit_rates_weighted_average(hdxm_apo_red, client=client, chunksize=chunksize)
+            assert_series_equal(result.output["rate"], reference["rate"], rtol=1e-2)
+
+
+def test_chunk_size():
+    assert _chunk_size(100, 4, tasks_per_worker=5) == 5
+    assert _chunk_size(101, 4, tasks_per_worker=5) == 6
+    # fewer items than tasks or workers
+    assert _chunk_size(3, 4, tasks_per_worker=5) == 1
+    assert _chunk_size(3, 10) == 1
+    # no workers (yet) is treated as a single worker
+    assert _chunk_size(100, 0, tasks_per_worker=5) == 20
+    assert _chunk_size(0, 4) == 1
+
+
 def test_initial_guess_half_time_interpolate(hdxm_apo_red: HDXMeasurement):
     result = fit_rates_half_time_interpolate(hdxm_apo_red)
     assert isinstance(result, GenericFitResult)
@@ -186,6 +216,97 @@ def test_global_fit(hdxm_apo: HDXMeasurement):
     assert errors.shape == (1, hdxm_apo.Np, hdxm_apo.Nt)
 
 
+def test_fit_result_cache(hdxm_apo: HDXMeasurement, tmp_path):
+    initial_rates = csv_to_dataframe(output_dir / "ecSecB_guess.csv")
+    gibbs_guess = hdxm_apo.guess_deltaG(initial_rates["rate"])
+
+    cache = FitResultCache(tmp_path)
+    fr_global = cache(fit_gibbs_global, hdxm_apo, gibbs_guess, epochs=100, r1=2)
+    assert cache.misses == 1
+    assert len(cache) == 1
+
+    # positional and keyword arguments resolve to the same key
+    key = FitResultCache.key(fit_gibbs_global, hdxm_apo, gibbs_guess, r1=2, epochs=100)
+    assert key == FitResultCache.key(fit_gibbs_global, hdxm_apo, gibbs_guess, 2, 100)
+    assert key != FitResultCache.key(fit_gibbs_global, hdxm_apo, gibbs_guess, r1=1, epochs=100)
+
+    # new cache instance loads the result from disk
+    cache = FitResultCache(tmp_path)
+    cached_fit = cache.wrap(fit_gibbs_global)
+    fr_cached = cached_fit(hdxm_apo, gibbs_guess, r1=2, epochs=100)
+    assert cache.hits == 1
+    assert_frame_equal(fr_global.output, fr_cached.output)
+
+    # modifying a returned result does not affect the cache
+    fr_cached.output.iloc[:, :] = np.nan
+    assert_frame_equal(fr_global.output, cached_fit(hdxm_apo, gibbs_guess, r1=2, epochs=100).output)
+    assert cache.hits == 2
+
+    # unhashable inputs bypass the cache
+    cache(lambda: fr_global)
+    assert cache.hits == 2 and cache.misses == 0
+
+    cached_fit(hdxm_apo, gibbs_guess, r1=1, epochs=100)
+    assert len(cache) == 2
+
+    cache.max_size = cache.size - 1
+    cache.evict()
+    assert len(cache) == 1
+    assert cache.get(key) is None
+
+
+def test_cancel_callback(hdxm_apo: HDXMeasurement):
+    initial_rates = csv_to_dataframe(output_dir / "ecSecB_guess.csv")
+    gibbs_guess = hdxm_apo.guess_deltaG(initial_rates["rate"])
+
+    with LocalCluster(n_workers=1, processes=False) as cluster, Client(cluster) as client:
+        callback = CancelCallback("pyhdx-test-cancel", interval=0.0)
+        future = client.submit(
+            fit_gibbs_global, hdxm_apo, gibbs_guess, epochs=10, callbacks=[callback]
+        )
+        assert len(future.result().losses) == 10
+
+        # setting the event stops the fit after the first epoch
+        Event("pyhdx-test-cancel", client=client).set()
+        future = client.submit(
+            fit_gibbs_global, hdxm_apo, gibbs_guess, epochs=1000, callbacks=[callback]
+        )
+        assert len(future.result().losses) == 1
+
+        # the event is not checked before the interval has passed
+        callback = CancelCallback("pyhdx-test-cancel", interval=60.0)
+        result = fit_gibbs_global(hdxm_apo, gibbs_guess, epochs=10, callbacks=[callback])
+        assert len(result.losses) == 10
+        assert callback._event is None
+
+
+def test_progress_callback(hdxm_apo: HDXMeasurement):
+    initial_rates = csv_to_dataframe(output_dir / "ecSecB_guess.csv")
+    gibbs_guess = hdxm_apo.guess_deltaG(initial_rates["rate"])
+
+    with LocalCluster(n_workers=1, processes=False) as cluster, Client(cluster) as client:
+        messages = []
+        client.subscribe_topic("pyhdx-test-progress", lambda event: messages.append(event[1]))
+        callback = ProgressCallback("pyhdx-test-progress", key="fit", label="apo", interval=0.0)
+        future = client.submit(
+            fit_gibbs_global, hdxm_apo, gibbs_guess, epochs=10, callbacks=[callback]
+        )
+        result = future.result()
+
+        t0 = time.time()
+        while len(messages) < 10 and time.time() - t0 < 10:
+            time.sleep(0.05)
+
+    assert [msg["epoch"] for msg in messages] == list(range(1, 11))
+    assert all(msg["key"] == "fit" and msg["label"] == "apo" for msg in messages)
+    assert all(msg["epochs_per_s"] > 0 for msg in messages)
+    assert messages[-1]["loss"] == pytest.approx(result.losses.iloc[-1].sum())
+
+    # without a dask client the fit runs and messages are dropped
+    result = fit_gibbs_global(hdxm_apo, gibbs_guess, epochs=10, callbacks=[callback])
+    assert len(result.losses) == 10
+
+
 @pytest.mark.skip(reason="Longer fit is not checked by default due to long computation times")
 def test_global_fit_extended(hdxm_apo: HDXMeasurement):
     check_deltaG = csv_to_dataframe(output_dir / "ecSecB_torch_fit_epochs_20000.csv")
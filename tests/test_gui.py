@@ -1,3 +1,4 @@
+import asyncio
 import sys
 from pathlib import Path
 
@@ -6,10 +7,22 @@ import pandas as pd
 import pytest
 import torch
 import yaml
+from bokeh.document import Document
+from distributed import LocalCluster
 
+from pyhdx.config import cfg
+from pyhdx.datasets import HDXDataSet
 from pyhdx.fileIO import csv_to_dataframe
+from pyhdx.fitting import fit_gibbs_global
+from pyhdx.fitting_torch import dG_fit_tables
+from pyhdx.models import HDXMeasurement
 from pyhdx.web.apps import main_app, rfu_app
+from pyhdx.web.cache import HybridCache, HybridHDFCache, MemoryCache, default_cache, make_cache
+from pyhdx.web.jobs import JobManager
+from pyhdx.web.sources import PyHDXSource, TableSource
+from pyhdx.web.transforms import CrossSectionTransform, DecimateTransform, TableSourceTransform
 from pyhdx.web.utils import load_state
+from pyhdx.web.views import hvPlotView
 
 cwd = Path(__file__).parent
 input_dir = cwd / "test_data" / "input"
@@ -272,6 +285,323 @@ def test_rfu(ppix_spec, ppix_file_dict):
     pd.testing.assert_frame_equal(df_test, df_ref)
 
 
+def test_memory_cache():
+    df = pd.DataFrame({"a": np.arange(100, dtype=float)})
+    nbytes = df.memory_usage(deep=True).sum()
+
+    cache = MemoryCache(max_size=int(3.5 * nbytes))
+    for i in range(3):
+        cache[i] = df.copy()
+    assert cache.size == 3 * nbytes
+
+    # least recently used item is evicted first
+    assert cache.get(0) is not None
+    cache[3] = df.copy()
+    assert 1 not in cache
+    assert list(cache._cache) == [2, 0, 3]
+
+    assert cache.get(1) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache = MemoryCache(max_items=2)
+    cache["a"], cache["b"] = 1, 2
+    cache["a"]
+    cache["c"] = 3
+    assert "b" not in cache and "a" in cache
+
+
+def test_transform_cache():
+    src = TableSource()
+    src.add_table("loss", pd.DataFrame({"mse_loss": np.linspace(1, 0, 100)}))
+
+    # transforms share the app cache unless given one
+    transform = DecimateTransform(source=TableSourceTransform(source=src, table="loss"))
+    assert transform._cache is default_cache
+
+    cache = MemoryCache()
+    transform = DecimateTransform(
+        source=TableSourceTransform(source=src, table="loss"), width=400, _cache=cache
+    )
+    df = transform.get()
+    df.iloc[0, 0] = -1.0  # modifying the output does not alter the cached output
+    assert transform.get().iloc[0, 0] == 1.0
+    assert (len(cache), cache.hits) == (1, 1)
+
+
+def test_hybrid_cache(tmp_path):
+    columns = pd.MultiIndex.from_product(
+        [pd.CategoricalIndex(["apo", "dimer"]), ["dG", "covariance"]], names=["state", "quantity"]
+    )
+    df = pd.DataFrame(np.random.rand(50, 4), columns=columns)
+    nbytes = df.memory_usage(deep=True).sum()
+
+    cache = HybridCache(cache_dir=tmp_path, max_size=int(2.5 * nbytes))
+    for i in range(4):
+        cache[i] = df.copy()
+
+    # least recently used items are spilled to disk
+    assert list(cache._cache) == [2, 3]
+    assert len(cache) == 4
+    assert 0 in cache
+
+    pd.testing.assert_frame_equal(cache.get(0), df)
+    assert list(cache._cache) == [3, 0]
+
+    # items on disk are available to other caches sharing the directory
+    other_cache = HybridCache(cache_dir=tmp_path)
+    pd.testing.assert_frame_equal(other_cache.get(1), df)
+
+    cache.max_disk_size = 0
+    cache.evict_disk()
+    assert cache.disk_size == 0
+    assert cache.get(2) is None
+
+    # the disk tier is opt-in
+    assert isinstance(make_cache(), MemoryCache)
+    assert not isinstance(make_cache(), HybridCache)
+    with cfg.context({"server.cache_dir": str(tmp_path / "app_cache")}):
+        assert isinstance(make_cache(), HybridCache)
+
+    with pytest.deprecated_call():
+        hdf_cache = HybridHDFCache(file_path=str(tmp_path / "cache.h5"))
+    assert hdf_cache.cache_dir == tmp_path / "cache"
+
+
+def test_table_hashes():
+    def dG_block(fit_id: str, value: float) -> pd.DataFrame:
+        columns = pd.MultiIndex.from_product(
+            [[fit_id], ["apo"], ["dG", "covariance"]], names=["fit_ID", "state", "quantity"]
+        )
+        return pd.DataFrame(np.full((10, 2), value), columns=columns)
+
+    sources = [PyHDXSource(), PyHDXSource()]
+    hashes = []
+    for src in sources:
+        src._add_table(dG_block("fit_1", 1.0), "dG")
+        hashes.append(src.hashes["dG"])
+
+    # equal content gives equal hashes, adding a block changes the hash
+    assert hashes[0] == hashes[1]
+    sources[0]._add_table(dG_block("fit_2", 2.0), "dG")
+    sources[1]._add_table(dG_block("fit_2", 3.0), "dG")
+    assert sources[0].hashes["dG"] != hashes[0]
+    assert sources[0].hashes["dG"] != sources[1].hashes["dG"]
+    assert sources[0].get_table("dG").shape == (10, 4)
+
+
+def make_dG_block(fit_id: str, index: range) -> pd.DataFrame:
+    columns = pd.MultiIndex.from_product(
+        [[fit_id], ["apo", "holo"], ["dG", "covariance"]], names=["fit_ID", "state", "quantity"]
+    )
+    return pd.DataFrame(
+        np.random.rand(len(index), len(columns)),
+        index=pd.Index(index, name="r_number"),
+        columns=columns,
+    )
+
+
+def test_table_store():
+    blocks = [
+        make_dG_block("fit_b", range(5, 20)),
+        make_dG_block("fit_a", range(1, 12)),
+        make_dG_block("fit_10", range(3, 25)),
+        make_dG_block("fit_2", range(2, 9)),
+    ]
+
+    src = PyHDXSource()
+    for block in blocks[:2]:
+        src._add_table(block, "dG")
+
+    # blocks are only concatenated on request
+    assert "dG" not in src.tables
+    assert src.get_tables() == ["dG"]
+    df = src.get_table("dG")
+    assert src.get_table("dG") is df
+
+    for block in blocks[2:]:
+        src._add_table(block, "dG")
+    df = src.get_table("dG")
+
+    expected = pd.concat(blocks, axis=1, sort=True)
+    assert df.shape == expected.shape
+    assert list(df.columns.get_level_values(0).categories) == ["fit_b", "fit_a", "fit_10", "fit_2"]
+    assert df.columns.get_level_values(0).ordered
+    assert np.allclose(df["fit_10"].to_numpy(), expected["fit_10"].to_numpy(), equal_nan=True)
+
+    src.clear()
+    assert src.get_tables() == []
+    assert src.get_table("dG") is None
+
+
+def test_table_store_transforms(monkeypatch):
+    src = PyHDXSource()
+    src._add_table(make_dG_block("fit_0", range(1, 10)), "dG")
+    xs = CrossSectionTransform(source=TableSourceTransform(source=src, table="dG"), n_levels=2)
+
+    # only the selected block is read by transforms
+    concat = pd.concat
+    n_concat = []
+    monkeypatch.setattr(
+        pd, "concat", lambda objs, **kwargs: n_concat.append(1) or concat(objs, **kwargs)
+    )
+    n_fits = 20
+    for i in range(1, n_fits):
+        src._add_table(make_dG_block(f"fit_{i}", range(i, i + 10)), "dG")
+        src.updated = True
+        xs.selectors[0].value = f"fit_{i}"
+        assert xs.get().shape == (i + 9, 2)
+    assert xs.index.unique(level=0).tolist() == [f"fit_{i}" for i in range(n_fits)]
+    assert "dG" not in src.tables
+    assert not n_concat
+    monkeypatch.undo()
+
+    # equal to the cross-section of the whole table
+    expected = src.get_table("dG").xs(**xs.pd_kwargs)
+    pd.testing.assert_frame_equal(xs.get(), expected)
+
+
+def test_decimate_transform():
+    epochs = pd.Index(np.arange(50_000), name="epoch")
+    loss = pd.DataFrame(
+        {"mse_loss": np.exp(-epochs / 5_000), "reg_1": np.exp(-epochs / 500)}, index=epochs
+    )
+
+    src = TableSource()
+    src.add_table("loss", loss)
+    decimate = DecimateTransform(source=TableSourceTransform(source=src, table="loss"), width=400)
+    df = decimate.get()
+    assert len(df) <= 4 * 400
+    assert df.index[[0, -1]].tolist() == [0, 49_999]
+
+    # the view sets the width of the transform to its rendered width
+    view = hvPlotView(source=decimate, kind="line")
+    updates = []
+    decimate.param.watch(lambda event: updates.append(event), ["updated"])
+    view._plot_size.event(width=1234, height=300)
+    assert decimate.width == 1300
+    assert len(updates) == 1
+    assert len(view.get_data()) > len(df)
+
+
+def test_dG_fit_tables(secb_spec):
+    dataset = HDXDataSet.from_spec(secb_spec, data_dir=input_dir)
+    hdxm = HDXMeasurement.from_dataset(dataset, state="SecB_tetramer", d_percentage=100.0)
+    guess = csv_to_dataframe(output_dir / "ecSecB_guess.csv")
+    fit_result = fit_gibbs_global(hdxm, hdxm.guess_deltaG(guess["rate"]), epochs=10)
+
+    # tables generated on a worker are added as-is
+    tables = dG_fit_tables(fit_result, "fit_1")
+    assert set(tables) == {"dG", "d_calc", "loss", "peptide_mse"}
+    assert all(df.columns.unique(level=0).tolist() == ["fit_1"] for df in tables.values())
+
+    src, ref = PyHDXSource(), PyHDXSource()
+    src.add(fit_result, "fit_1", tables=tables)
+    ref.add(fit_result, "fit_1")
+    assert src.get_tables() == ref.get_tables()
+    for table in ref.get_tables():
+        pd.testing.assert_frame_equal(src.get_table(table), ref.get_table(table))
+        assert src.hashes[table] == ref.hashes[table]
+
+
+def test_job_manager():
+    started = []
+
+    def make_job(tag, duration=0.0):
+        async def func(client, job):
+            started.append(tag)
+            await asyncio.sleep(duration)
+            if tag == "error":
+                raise ValueError("job failed")
+            return tag
+
+        return func
+
+    async def wait(jobs):
+        while not all(job.done for job in jobs):
+            await asyncio.sleep(0.01)
+
+    async def run(manager):
+        a1 = manager.submit(make_job("a1", 0.2), user="a")
+        a2 = manager.submit(make_job("a2"), user="a")
+        b1 = manager.submit(make_job("b1", 0.2), user="b")
+        b2 = manager.submit(make_job("b2"), user="b", priority=1)
+        assert started == []  # jobs are scheduled on the event loop, not run by submit
+
+        # a2 waits for the per-user limit, b2 for a free slot but has priority
+        assert (manager.running, manager.queued) == (2, 2)
+        assert manager.position(b2) == 0
+        await manager.cancel(a2)
+        assert a2.status == "cancelled"
+
+        await wait([a1, b1, b2])
+        assert started == ["a1", "b1", "b2"]
+        assert b2.result == "b2"
+
+        # running jobs are cancelled, errors are captured
+        c1 = manager.submit(make_job("c1", 10.0), user="c")
+        c2 = manager.submit(make_job("error"), user="d")
+        await asyncio.sleep(0.1)
+        await manager.cancel(c1)
+        await wait([c1, c2])
+        assert c1.status == "cancelled"
+        assert c2.status == "error"
+        assert isinstance(c2.exception, ValueError)
+        assert (manager.running, manager.queued) == (0, 0)
+
+        # the cancel event is removed from the scheduler after `cancel_delay`
+        events = cluster.scheduler.extensions["events"]._events
+        assert c1.cancel_event in events
+        await asyncio.sleep(0.2)
+        assert c1.cancel_event not in events
+
+        # progress of fits on the workers is passed to the job's on_progress
+        progress = []
+
+        async def report(client, job):
+            callback = job.progress_callback(label="apo", interval=0.0)
+            await client.submit(callback, 9, None, None, losses=[1.0, 0.5])
+            while not progress:
+                await asyncio.sleep(0.01)
+
+        d1 = manager.submit(report, on_progress=lambda job, msg: progress.append((job, msg)))
+        await wait([d1])
+        assert d1.status == "finished"
+        job, msg = progress[0]
+        assert job is d1
+        assert (msg["label"], msg["epoch"], msg["loss"]) == ("apo", 10, 1.5)
+
+        # queued jobs of closed sessions still run and free their slot, their callbacks are dropped
+        done = []
+        e1 = manager.submit(make_job("e1", 0.2), user="e")
+        e2 = manager.submit(make_job("e2"), user="e", on_done=done.append)
+        e2.doc = Document()  # without session context, as after the session is destroyed
+        await wait([e1, e2])
+        assert e2.result == "e2"
+        assert (manager.running, manager.queued) == (0, 0)
+        assert done == []
+
+        # jobs of a session are cancelled when the session is closed
+        doc = Document()
+        f1 = manager.submit(make_job("f1", 10.0), user="f")
+        f2 = manager.submit(make_job("f2"), user="f")
+        f1.doc = f2.doc = doc
+        await asyncio.sleep(0.1)
+        manager._session_destroyed(doc, None)
+        await wait([f1, f2])
+        assert (f1.status, f2.status) == ("cancelled", "cancelled")
+        assert "f2" not in started
+        await manager.close()
+
+    with LocalCluster(n_workers=1, processes=False) as cluster:
+        manager = JobManager(
+            scheduler_address=cluster.scheduler_address,
+            max_jobs=2,
+            max_user_jobs=1,
+            cancel_delay=0.1,
+        )
+        asyncio.run(run(manager))
+
+
 # with cluster() as (s, [a, b]):
 #     conf.set("cluster", "scheduler_address", s["address"])
 #
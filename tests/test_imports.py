@@ -0,0 +1,67 @@
+import ast
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Modules which should not be imported by the package or the CLI until they are needed
+HEAVY_MODULES = ["torch", "scipy", "matplotlib", "hdxms_datasets", "panel", "skimage", "dask"]
+
+# Import time limit in seconds, set PYHDX_IMPORT_TIME_LIMIT to adjust it for slow machines or to 0
+# to skip the timing check
+IMPORT_TIME_LIMIT = float(os.environ.get("PYHDX_IMPORT_TIME_LIMIT", 2.0))
+
+
+def import_in_subprocess(statement: str) -> tuple[float, list[str]]:
+    """Runs an import statement in a fresh interpreter.
+
+    Returns:
+        Tuple of the import time in seconds and the heavy modules which were imported.
+
+    """
+    code = (
+        "import sys, time\n"
+        "t0 = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - t0)\n"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    elapsed, modules = result.stdout.strip().splitlines()[-2:]
+
+    return float(elapsed), ast.literal_eval(modules)
+
+
+@pytest.mark.parametrize("statement", ["import pyhdx", "import pyhdx.cli"])
+def test_import_time(statement):
+    elapsed, modules = import_in_subprocess(statement)
+
+    assert modules == []
+    if IMPORT_TIME_LIMIT > 0:
+        assert (
+            elapsed < IMPORT_TIME_LIMIT
+        ), f"{statement!r} took {elapsed:.2f} s, limit is {IMPORT_TIME_LIMIT} s"
+
+
+def test_worker_imports():
+    # functions which run on dask workers do not import the web app stack or dask itself
+    _, modules = import_in_subprocess("from pyhdx.fitting_torch import dG_fit_tables")
+    assert "panel" not in modules
+    assert "dask" not in modules
+
+
+def test_lazy_imports():
+    import pyhdx
+
+    from pyhdx.models import HDXMeasurement
+
+    assert pyhdx.HDXMeasurement is HDXMeasurement
+    assert pyhdx.fitting_torch.TorchFitResult is pyhdx.TorchFitResult
+    assert "HDXMeasurementSet" in dir(pyhdx)
+    assert "FitReport" not in pyhdx.__all__
+
+    with pytest.raises(AttributeError):
+        pyhdx.not_an_attribute
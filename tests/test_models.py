@@ -1,12 +1,15 @@
-from pyhdx import HDXMeasurement
+from pyhdx import HDXMeasurement, HDXMeasurementSet
 from pyhdx.datasets import read_dynamx
-from pyhdx.models import Coverage
+from pyhdx.models import Coverage, PeptideUptakeModel, KIntCache
 from pyhdx.fileIO import csv_to_hdxm, csv_to_dataframe
+from pyhdx.config import cfg
 import numpy as np
 from pathlib import Path
 import pandas as pd
 from pandas.testing import assert_frame_equal
+import pickle
 import tempfile
+import torch
 
 from pyhdx.process import apply_control, correct_d_uptake, filter_peptides
 
@@ -64,6 +67,66 @@ class TestHDXMeasurement(object):
 
             assert self.hdxm.metadata == hdxm_read.metadata
 
+    def test_pickle(self):
+        pickled = pickle.dumps(self.hdxm)
+        hdxm = pickle.loads(pickled)
+
+        assert_frame_equal(hdxm.data, self.hdxm.data)
+        assert np.array_equal(hdxm.coverage.X, self.hdxm.coverage.X)
+        assert hdxm.metadata == self.hdxm.metadata
+        assert len(pickled) < 0.1 * len(pickle.dumps(self.hdxm.__dict__))
+
+        hdxm_set = pickle.loads(pickle.dumps(HDXMeasurementSet([self.hdxm, hdxm])))
+        assert np.array_equal(hdxm_set.d_exp[0], hdxm_set.d_exp[1])
+
+    def test_to_memmap(self):
+        def is_memmap(obj) -> bool:
+            array = obj.to_numpy() if isinstance(obj, (pd.Series, pd.DataFrame)) else obj
+            while array is not None and not isinstance(array, np.memmap):
+                array = getattr(array, "base", None)
+            return array is not None
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            fpath = Path(tempdir) / "hdxm.csv"
+            self.hdxm.to_file(fpath)
+            hdxm = csv_to_hdxm(fpath)
+            rfu_residues, tensors_ref = hdxm.rfu_residues, hdxm.get_tensors()
+            d_exp, rfu, X, Z = hdxm.d_exp, hdxm.rfu_peptides, hdxm.coverage.X, hdxm.coverage.Z
+
+            directory = hdxm.to_memmap(Path(tempdir) / "cache")
+            assert {p.stem for p in directory.iterdir()} == {
+                "X",
+                "Z",
+                "d_exp",
+                "rfu",
+                "k_int",
+                "timepoints",
+            }
+            assert isinstance(hdxm.coverage.X, np.memmap)
+            assert all(tp.X is hdxm.coverage.X for tp in hdxm)
+            for obj in [hdxm.d_exp, hdxm.rfu_peptides, hdxm.k_int, hdxm.timepoints, hdxm[1].d_exp]:
+                assert is_memmap(obj)
+
+            assert_frame_equal(hdxm.d_exp, d_exp)
+            assert_frame_equal(hdxm.rfu_peptides, rfu)
+            tensors = hdxm.get_tensors()
+            for k, v in tensors_ref.items():
+                assert torch.equal(tensors[k], v)
+            assert_frame_equal(hdxm.rfu_residues, rfu_residues)
+
+            # coverage matrices are written in chunks without creating them in memory
+            hdxm = csv_to_hdxm(fpath)
+            assert not any("X" in vars(coverage) for coverage in [hdxm.coverage, *hdxm])
+            hdxm.to_memmap(Path(tempdir) / "chunked", chunk_size=7)
+            assert all(isinstance(coverage.Z, np.memmap) for coverage in [hdxm.coverage, *hdxm])
+            assert np.array_equal(hdxm.coverage.X, X)
+            assert np.array_equal(hdxm.coverage.Z, Z)
+
+            # measurements with different terminal residues do not share cached coverage matrices
+            data = hdxm.data.drop(columns="peptide_id").set_index("index")
+            hdxm_c_term = HDXMeasurement(data, **{**hdxm.metadata, "c_term": 200})
+            assert hdxm_c_term.to_memmap(Path(tempdir) / "cache") != directory
+
 
 class TestCoverage(object):
     @classmethod
@@ -116,3 +179,57 @@ class TestCoverage(object):
 
         test_Z = np.genfromtxt(output_dir / "attributes" / "Z.txt")
         assert np.allclose(self.hdxm.coverage.Z, test_Z)
+
+
+def test_peptide_uptake_model():
+    model = PeptideUptakeModel(list("KLGPLTAGHH"), 293.15, 7.5)
+    timepoints = np.logspace(-2, 3, num=50)
+
+    k_open = np.logspace(-1, 1, num=len(model))
+    k_close = np.logspace(1, 3, num=len(model))
+    populations = model.eval_populations(timepoints, k_open, k_close)
+    assert populations.shape == (len(timepoints), len(model), 3)
+    assert np.allclose(populations.sum(axis=-1), 1.0)
+
+    for i in range(len(model)):
+        numerical = model.eval_single_numerical(
+            i, timepoints, k_open[i], k_close[i], method="Radau", rtol=1e-8, atol=1e-10
+        )
+        assert np.allclose(populations[:, i], numerical, atol=1e-6)
+
+    # batched over peptides
+    batch = model.eval_populations(timepoints, np.stack([k_open, 2 * k_open]), k_close)
+    assert batch.shape == (len(timepoints), 2, len(model), 3)
+    assert np.allclose(batch[:, 0], populations)
+
+
+def test_k_int_cache():
+    sequence = "MSEQNNTEMTFQIQRIYTKDISFEAPNAPHVFQKDW"
+    with tempfile.TemporaryDirectory() as tempdir:
+        cache = KIntCache(maxsize=2, cache_dir=tempdir)
+        k_int = cache(sequence, 303.15, 8.0)
+        assert cache.misses == 1
+
+        k_int[:] = 0.0  # returned arrays are copies
+        assert np.all(cache(list(sequence), 303.15, 8.0) == cache(sequence, 303.15, 8.0))
+        assert cache.hits == 2
+        assert np.any(cache(sequence, 303.15, 8.0) != 0.0)
+
+        cache(sequence, 293.15, 8.0)
+        cache(sequence, 303.15, 7.0)
+        assert len(cache) == 2
+
+        # new cache instance loads rates from disk
+        assert len(list(Path(tempdir).glob("*.npy"))) == 3
+        disk_cache = KIntCache(cache_dir=tempdir)
+        assert np.allclose(disk_cache(sequence, 303.15, 8.0), cache(sequence, 303.15, 8.0))
+
+    # on-disk cache directory from the config
+    with tempfile.TemporaryDirectory() as tempdir:
+        cache = KIntCache()
+        assert cache.cache_dir is None
+        with cfg.context({"analysis.k_int_cache_dir": tempdir}):
+            assert cache.cache_dir == Path(tempdir)
+            cache(sequence, 303.15, 8.0)
+        assert len(list(Path(tempdir).glob("*.npy"))) == 1
+        assert cache.cache_dir is None
@@ -1,6 +1,20 @@
+from functools import partial, reduce
+from pathlib import Path
+
 import numpy as np
 import matplotlib as mpl
-from pyhdx.support import rgb_to_hex
+import pandas as pd
+import pytest
+from pyhdx.support import (
+    rgb_to_hex,
+    dataframe_intersection,
+    decimate_dataframe,
+    hash_dataframe,
+    hash_object,
+    intersection_indexers,
+    lttb_indices,
+    minmax_indices,
+)
 
 
 class TestSupportFunctions(object):
@@ -12,3 +26,104 @@ class TestSupportFunctions(object):
 
         hex_pyhdx = rgb_to_hex(selected_rgb)
         assert np.all(hex_pyhdx == hex_mpl)
+
+    def test_dataframe_intersection(self):
+        rng = np.random.default_rng(43)
+        df1 = pd.DataFrame(
+            {
+                "start": rng.integers(-5, 20, 200),
+                "stop": rng.integers(20, 40, 200),
+                "value": rng.random(200),
+            }
+        )
+        df2 = df1.sample(frac=0.6, random_state=1)
+        df3 = pd.concat([df1.sample(frac=0.8, random_state=2), df1.iloc[:10]])
+        dataframes = [df1, df2, df3]
+
+        # Reference implementation using pandas MultiIndex intersection
+        set_index = [d.set_index(["start", "stop"]) for d in dataframes]
+        index_intersection = reduce(pd.Index.intersection, (d.index for d in set_index))
+        reference = [df.loc[index_intersection] for df in set_index]
+
+        for ref, result in zip(reference, dataframe_intersection(dataframes, ["start", "stop"])):
+            pd.testing.assert_frame_equal(ref.reset_index(), result)
+
+        intersected = dataframe_intersection(dataframes, ["start", "stop"], reset_index=False)
+        for ref, result in zip(reference, intersected):
+            pd.testing.assert_frame_equal(ref, result)
+
+        indexers = intersection_indexers(dataframes, ["start", "stop"])
+        for df, ref, indexer in zip(dataframes, reference, indexers):
+            assert indexer.dtype.kind == "i"
+            assert len(indexer) == len(ref)
+            np.testing.assert_array_equal(df["value"].to_numpy()[indexer], ref["value"])
+
+        # Non-integer columns
+        df1["sequence"] = df1["start"].astype(str)
+        df2 = df1.sample(frac=0.5, random_state=3)
+        result = dataframe_intersection([df1, df2], ["sequence", "stop"])
+        assert set(result[0]["sequence"]) == set(df2["sequence"])
+
+    def test_decimation(self):
+        x = np.arange(10.0)
+        y = np.array([0.0, 1.0, 0.0, 5.0, 0.0, 1.0, 0.0, -3.0, 0.0, 1.0])
+
+        # peaks are kept, first and last points are always selected
+        np.testing.assert_array_equal(lttb_indices(x, y, 5), [0, 2, 3, 7, 9])
+        np.testing.assert_array_equal(minmax_indices(y, 2), [0, 3, 5, 7, 9])
+        np.testing.assert_array_equal(lttb_indices(x, y, 20), np.arange(10))
+        np.testing.assert_array_equal(minmax_indices(y, 20), np.arange(10))
+
+        rng = np.random.default_rng(43)
+        epochs = pd.Index(np.arange(100_000), name="epoch")
+        loss = pd.DataFrame(
+            {
+                "mse_loss": np.exp(-epochs / 10_000) + 0.01 * rng.random(len(epochs)),
+                "reg_1": np.exp(-epochs / 1_000),
+            },
+            index=epochs,
+        )
+        loss.iloc[80_000:, 1] = np.nan  # early stopped fit
+        loss.iloc[90_000:, :] = np.nan
+
+        for method in ["lttb", "minmax"]:
+            decimated = decimate_dataframe(loss, 500, method=method)
+            assert len(decimated) <= 4 * 500
+            assert decimated.index.is_monotonic_increasing
+            assert decimated.index[[0, -1]].tolist() == [0, 89_999]
+            assert 79_999 in decimated.index
+            pd.testing.assert_frame_equal(decimated, loss.loc[decimated.index])
+
+        decimated = decimate_dataframe(loss, 500, method="minmax")
+        assert decimated["mse_loss"].max() == loss["mse_loss"].max()
+        assert decimated["mse_loss"].min() == loss["mse_loss"].min()
+
+
+def test_hash_object():
+    df = pd.DataFrame({"a": [1.0, 2.0], "b": ["x", "y"]})
+    obj = {"df": df, "array": np.arange(3), "path": Path("data.csv"), "args": (1, "two", None)}
+
+    assert hash_object(obj) == hash_object({**obj, "df": df.copy()})
+    assert hash_object(obj) != hash_object({**obj, "path": Path("other.csv")})
+
+    df_changed = df.copy()
+    df_changed.loc[1, "a"] = 3.0
+    assert hash_dataframe(df, method="md5") != hash_dataframe(df_changed, method="md5")
+    assert hash_object(obj) != hash_object({**obj, "df": df_changed})
+
+    with pytest.raises(TypeError):
+        hash_object({"obj": object()})
+
+    # partials are hashed by their function and arguments
+    assert hash_object(partial(np.round, decimals=2)) == hash_object(partial(np.round, decimals=2))
+    assert hash_object(partial(np.round, decimals=2)) != hash_object(partial(np.round, decimals=3))
+
+    # lambdas and closures cannot be identified by their name
+    offset = 1.0
+
+    def closure(x):
+        return x + offset
+
+    for func in [lambda x: x + 1.0, closure, partial(closure, 2.0)]:
+        with pytest.raises(TypeError):
+            hash_object(func)
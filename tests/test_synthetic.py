@@ -0,0 +1,66 @@
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+import torch
+
+from pyhdx import HDXMeasurement
+from pyhdx.fileIO import read_dynamx
+from pyhdx.fitting_torch import DeltaGFit
+from pyhdx.process import apply_control, correct_d_uptake, filter_peptides
+from pyhdx.synthetic import generate_dynamx, peptide_uptake, random_dG, random_sequence
+
+
+def test_generate_dynamx():
+    temperature, pH = 303.15, 8.0
+    sequence = random_sequence(200, rng=42)
+    dG = random_dG(len(sequence), n_states=3, rng=42)
+    assert dG.shape == (3, len(sequence))
+
+    df = generate_dynamx(
+        sequence, dG, temperature, pH, uptake_noise=0.0, back_exchange_sd=0.0, rng=42
+    )
+    assert set(df["State"]) == {"Full deuteration control", "state_0", "state_1", "state_2"}
+
+    data = read_dynamx(StringIO(df.to_csv(index=False)))
+    fd = filter_peptides(data, state="Full deuteration control")
+    peptides = filter_peptides(data, state="state_1")
+    peptides_corrected = correct_d_uptake(apply_control(peptides, fd))
+
+    hdxm = HDXMeasurement(peptides_corrected, temperature=temperature, pH=pH, sequence=sequence)
+    cov_data = hdxm.coverage.data
+    expected = peptide_uptake(
+        sequence,
+        dG[1],
+        temperature,
+        pH,
+        pd.DataFrame({"start": cov_data["start"], "end": cov_data["stop"] - 1}),
+        hdxm.timepoints,
+    )
+
+    assert np.allclose(hdxm.d_exp.to_numpy(), expected)
+
+
+def test_peptide_uptake_delta_g_fit():
+    temperature, pH = 303.15, 8.0
+    sequence = random_sequence(150, rng=1)
+    dG = random_dG(len(sequence), rng=1)[0]
+
+    df = generate_dynamx(
+        sequence, dG, temperature, pH, uptake_noise=0.0, back_exchange_sd=0.0, rng=1
+    )
+    data = read_dynamx(StringIO(df.to_csv(index=False)))
+    fd = filter_peptides(data, state="Full deuteration control")
+    peptides = correct_d_uptake(apply_control(filter_peptides(data, state="state_0"), fd))
+    hdxm = HDXMeasurement(peptides, temperature=temperature, pH=pH, sequence=sequence)
+
+    tensors = hdxm.get_tensors(dtype=torch.float64)
+    r_number = hdxm.coverage.r_number
+    dG_tensor = torch.tensor(dG[np.asarray(r_number) - 1], dtype=torch.float64).unsqueeze(-1)
+    model = DeltaGFit(dG_tensor)
+    with torch.no_grad():
+        d_calc = model(
+            tensors["temperature"], tensors["X"], tensors["k_int"], tensors["timepoints"]
+        )
+
+    assert np.allclose(d_calc.cpu().numpy(), hdxm.d_exp.to_numpy())